@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+큰 배경 사진의 축소 디코딩(draft/reduce) 벤치마크
+
+24MP(6000x4000) JPEG/PNG를 만들어 load_cover_image의 fast=True/False를 비교한다.
+각 측정은 별도 프로세스에서 실행해 최대 RSS(ru_maxrss)를 따로 잰다.
+
+사용법: python benchmarks/bench_background.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_SIZE = (6000, 4000)
+TARGETS = [(480, 270), (1920, 1080)]
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _make_sources(directory):
+    # 부모 프로세스의 최대 RSS가 자식에 이어지지 않도록 원본 생성도 별도 프로세스에서 한다
+    from PIL import Image
+
+    base = Image.radial_gradient('L').resize(SOURCE_SIZE)
+    img = Image.merge('RGB', (base, base.transpose(Image.Transpose.FLIP_LEFT_RIGHT), base.rotate(90)))
+    paths = {}
+    for fmt, ext in (('JPEG', 'jpg'), ('PNG', 'png')):
+        path = os.path.join(directory, f'photo.{ext}')
+        img.save(path, fmt)
+        paths[fmt] = path
+    return paths
+
+
+def _measure(path, width, height, fast, repeat):
+    """자식 프로세스에서 실행: 평균 시간(ms)과 최대 RSS(MB)를 JSON으로 출력"""
+    import resource
+    from thumbnail_maker.background import load_cover_image
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        load_cover_image(path, width, height, fast=fast)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss //= 1024
+    print(json.dumps({'ms': elapsed, 'rss_mb': rss / 1024}))
+
+
+def _run(path, width, height, fast, repeat):
+    cmd = [sys.executable, __file__, '--child', path, str(width), str(height), str(int(fast)), str(repeat)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True, cwd=ROOT).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='배경 이미지 축소 디코딩 벤치마크')
+    parser.add_argument('--repeat', type=int, default=3, help='측정 반복 횟수')
+    parser.add_argument('--child', nargs=5, help=argparse.SUPPRESS)
+    parser.add_argument('--make-sources', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.make_sources:
+        print(json.dumps(_make_sources(args.make_sources)))
+        return
+
+    if args.child:
+        path, width, height, fast, repeat = args.child
+        _measure(path, int(width), int(height), fast == '1', int(repeat))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [sys.executable, __file__, '--make-sources', tmp]
+        sources = json.loads(subprocess.run(cmd, check=True, capture_output=True, text=True).stdout)
+        print(f'원본: {SOURCE_SIZE[0]}x{SOURCE_SIZE[1]}, 반복 {args.repeat}회')
+        print(f"{'형식':<6}{'출력':>11}{'full ms':>10}{'fast ms':>10}{'full MB':>10}{'fast MB':>10}")
+        for fmt, path in sources.items():
+            for width, height in TARGETS:
+                full = _run(path, width, height, False, args.repeat)
+                fast = _run(path, width, height, True, args.repeat)
+                print(
+                    f"{fmt:<6}{f'{width}x{height}':>11}"
+                    f"{full['ms']:>10.1f}{fast['ms']:>10.1f}"
+                    f"{full['rss_mb']:>10.1f}{fast['rss_mb']:>10.1f}"
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더러 벤치마크 - 대표 DSL들의 실행 시간, 최대 메모리(tracemalloc), 출력 크기 측정
+
+사용법:
+    python benchmarks/run.py -o baseline.json            # 측정 후 JSON 저장
+    python benchmarks/run.py --compare baseline.json     # 측정 후 기준과 비교 (회귀 시 종료 코드 1)
+    python benchmarks/run.py -k outline --repeat 10      # 이름에 'outline'이 들어간 항목만
+
+측정은 임시 작업 폴더에서 하며, 폰트는 그 안의 fonts/ 폴더에 생성한 한글 포함 TTF를 쓴다
+(.thl 패키지와 같은 방식으로 조회되므로 패키지 fonts 디렉토리를 건드리지 않는다).
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import PIL
+from PIL import Image
+
+from thumbnail_maker.background import clear_gradient_cache, image_layer_cache, load_cover_image
+from thumbnail_maker.cli import staged_dsl
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+FONT_NAME = 'BenchSans'
+RESOLUTIONS = [(480, 270), (1280, 720), (1920, 1080)]
+TITLE = '벤치마크 썸네일 제목 Benchmark'
+KOREAN_PARAGRAPH = (
+    '오늘은 썸네일 렌더러의 성능을 측정하기 위해 긴 한국어 문장을 준비했습니다. '
+    '줄바꿈 엔진은 공백 단위와 유니코드 규칙 두 가지 방식을 지원하며, '
+    '긴 제목이나 설명문이 화면 폭에 맞게 자연스럽게 나뉘어야 합니다. '
+) * 4
+
+Case = Callable[[], int]
+
+
+# ---------- 준비물 ----------
+
+def build_font(path: str) -> None:
+    """ASCII + 한글 음절 전체(11,172자)를 담은 사각형 글리프 TTF 생성"""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    chars = [chr(c) for c in range(0x20, 0x7f)] + [chr(c) for c in range(0xAC00, 0xD7A4)]
+    names = ['.notdef'] + [f'uni{ord(c):04X}' for c in chars]
+
+    pen = TTGlyphPen(None)
+    pen.moveTo((50, 0))
+    pen.lineTo((50, 700))
+    pen.lineTo((550, 700))
+    pen.lineTo((550, 0))
+    pen.closePath()
+    box = pen.glyph()
+    empty = TTGlyphPen(None).glyph()
+
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(names)
+    fb.setupCharacterMap({ord(c): n for c, n in zip(chars, names[1:])})
+    fb.setupGlyf({n: (empty if n == 'uni0020' else box) for n in names})
+    metrics = {n: (600, 50) for n in names}
+    metrics['uni0020'] = (250, 0)
+    for c, n in zip(chars, names[1:]):
+        if ord(c) >= 0xAC00:
+            metrics[n] = (1000, 50)
+    fb.setupHorizontalMetrics(metrics)
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({'familyName': FONT_NAME, 'styleName': 'Regular'})
+    fb.setupOS2(sTypoAscender=800, usWinAscent=800, usWinDescent=200)
+    fb.setupPost()
+    fb.save(path)
+
+
+def build_workspace(directory: str) -> Dict[str, str]:
+    """폰트, 배경 사진, .thl 패키지 생성"""
+    fonts = os.path.join(directory, 'fonts')
+    os.makedirs(fonts, exist_ok=True)
+    font_path = os.path.join(fonts, f'{FONT_NAME}-normal-normal.ttf')
+    build_font(font_path)
+
+    base = Image.radial_gradient('L').resize((3000, 2000))
+    photo = Image.merge('RGB', (base, base.transpose(Image.Transpose.FLIP_LEFT_RIGHT), base.rotate(90)))
+    photo_path = os.path.join(directory, 'photo.jpg')
+    photo.save(photo_path, 'JPEG', quality=90)
+    large_path = os.path.join(directory, 'photo_24mp.jpg')
+    photo.resize((6000, 4000)).save(large_path, 'JPEG', quality=90)
+
+    thl_path = os.path.join(directory, 'template.thl')
+    with zipfile.ZipFile(thl_path, 'w') as zf:
+        zf.writestr('thumbnail.json', json.dumps(make_dsl((1280, 720), {'type': 'gradient', 'colors': ['#a3e635', '#000000']},
+                                                          outline=4), ensure_ascii=False))
+        zf.write(font_path, f'fonts/{FONT_NAME}-normal-normal.ttf')
+
+    return {'photo': photo_path, 'large_photo': large_path, 'thl': thl_path}
+
+
+def make_dsl(
+    resolution: Tuple[int, int],
+    background: Dict,
+    outline: int = 0,
+    content: str = TITLE,
+    font_size: int = 64,
+    word_wrap=False
+) -> Dict:
+    text = {
+        'type': 'title',
+        'content': content,
+        'gridPosition': 'mc',
+        'font': {'name': FONT_NAME, 'faces': []},
+        'fontSize': font_size,
+        'color': '#ffffff',
+        'wordWrap': word_wrap,
+        'outline': {'color': '#000000', 'thickness': outline} if outline else None,
+    }
+    return {
+        'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': resolution[0], 'height': resolution[1]},
+            'Background': background,
+            'Texts': [text],
+        }
+    }
+
+
+def build_cases(files: Dict[str, str]) -> Dict[str, Case]:
+    cases: Dict[str, Case] = {}
+
+    def render(dsl: Dict) -> Case:
+        return lambda: len(ThumbnailRenderer.render_bytes(dsl))
+
+    backgrounds = {
+        'solid': {'type': 'solid', 'color': '#202020'},
+        'gradient': {'type': 'gradient', 'colors': ['#a3e635', '#0ea5e9', '#000000'], 'angle': 135},
+        'image': {'type': 'image', 'imagePath': files['photo'], 'imageBlur': 4, 'imageOpacity': 0.8},
+    }
+    for kind, bg in backgrounds.items():
+        for w, h in RESOLUTIONS:
+            cases[f'bg-{kind}-{w}x{h}'] = render(make_dsl((w, h), bg))
+
+    solid = backgrounds['solid']
+    for thickness in (0, 4, 10):
+        cases[f'outline-{thickness}'] = render(make_dsl((1280, 720), solid, outline=thickness, font_size=96))
+
+    for mode, wrap in (('words', True), ('unicode', 'unicode')):
+        cases[f'wrap-korean-{mode}'] = render(
+            make_dsl((1280, 720), solid, content=KOREAN_PARAGRAPH, font_size=36, word_wrap=wrap)
+        )
+
+    def thl() -> int:
+        with staged_dsl(files['thl']) as (dsl, search_path):
+            return len(ThumbnailRenderer.render_bytes(dsl, search_path=search_path))
+    cases['thl-package'] = thl
+
+    # 큰 사진 축소 디코딩 (draft/reduce) 대 전체 디코딩
+    def decode(fast: bool) -> Case:
+        def run() -> int:
+            img = load_cover_image(files['large_photo'], 480, 270, fast=fast)
+            buf = io.BytesIO()
+            img.save(buf, 'PNG')
+            return buf.tell()
+        return run
+    cases['decode-24mp-fast'] = decode(True)
+    cases['decode-24mp-full'] = decode(False)
+
+    # CLI 시작 시간 (셸 스크립트에서 작업마다 새로 실행되는 경우)
+    def cli_startup() -> int:
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        proc = subprocess.run([sys.executable, '-m', 'thumbnail_maker', '--help'],
+                              cwd=ROOT, env=env, capture_output=True, check=True)
+        return len(proc.stdout)
+    cases['cli-startup'] = cli_startup
+
+    return cases
+
+
+# ---------- 측정 ----------
+
+def clear_caches() -> None:
+    clear_gradient_cache()
+    image_layer_cache.clear()
+
+
+def measure(case: Case, repeat: int, cold: bool) -> Dict[str, float]:
+    if cold:
+        clear_caches()
+    output_bytes = case()   # 워밍업 (폰트 로드 등)
+
+    times = []
+    for _ in range(repeat):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        case()
+        times.append(time.perf_counter() - start)
+
+    # tracemalloc은 느리므로 시간 측정과 분리해 한 번만 실행
+    if cold:
+        clear_caches()
+    tracemalloc.start()
+    try:
+        case()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(times) * 1000, 3),
+        'min_ms': round(min(times) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1),
+        'output_bytes': output_bytes,
+    }
+
+
+def run(selected: Optional[str], repeat: int, cold: bool) -> Dict:
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='thumb_bench_') as workspace:
+        files = build_workspace(workspace)
+        # fonts/ 폴더를 작업 디렉토리 기준으로 찾도록 임시 폴더에서 측정
+        os.chdir(workspace)
+        try:
+            for name, case in build_cases(files).items():
+                if selected and selected not in name:
+                    continue
+                results[name] = measure(case, repeat, cold)
+                r = results[name]
+                print(f"{name:<24}{r['median_ms']:>10.2f} ms (min {r['min_ms']:.2f}){r['peak_kib']:>10.1f} KiB"
+                      f"{r['output_bytes']:>10} B", flush=True)
+        finally:
+            os.chdir(cwd)
+            clear_caches()
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'cold': cold,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """중간값 시간 또는 최대 메모리가 threshold(비율) 넘게 늘어난 항목 목록"""
+    regressions = []
+    print(f"\n{'항목':<22}{'기준 ms':>10}{'현재 ms':>10}{'변화':>9}{'메모리 변화':>12}")
+    for name, now in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            print(f"{name:<24}{'-':>10}{now['median_ms']:>10.2f}{'(신규)':>9}")
+            continue
+        time_change = now['median_ms'] / before['median_ms'] - 1 if before['median_ms'] else 0.0
+        mem_change = now['peak_kib'] / before['peak_kib'] - 1 if before['peak_kib'] else 0.0
+        flag = ''
+        if time_change > threshold or mem_change > threshold:
+            flag = '  << 회귀'
+            regressions.append(name)
+        print(f"{name:<24}{before['median_ms']:>10.2f}{now['median_ms']:>10.2f}{time_change:>+9.1%}"
+              f"{mem_change:>+12.1%}{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='썸네일 렌더러 벤치마크')
+    parser.add_argument('-o', '--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', metavar='BASELINE', help='비교할 기준 JSON')
+    parser.add_argument('--current', metavar='RESULT', help='측정 대신 사용할 결과 JSON (--compare와 함께)')
+    parser.add_argument('--threshold', type=float, default=0.15, help='회귀 판정 비율 (기본 0.15 = 15%%)')
+    parser.add_argument('-k', dest='selected', help='이름에 이 문자열이 포함된 항목만 실행')
+    parser.add_argument('--repeat', type=int, default=5, help='항목별 반복 횟수')
+    parser.add_argument('--cold', action='store_true', help='반복마다 배경/그라디언트 캐시를 비운다')
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current, 'r', encoding='utf-8') as f:
+            current = json.load(f)
+    else:
+        current = run(args.selected, args.repeat, args.cold)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n회귀 {len(regressions)}건 (기준 대비 {args.threshold:.0%} 초과): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n회귀 없음")
+
+
+if __name__ == '__main__':
+    main()
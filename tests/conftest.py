@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공용 테스트 픽스처
+"""
+
+import pytest
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+
+# 테스트 폰트에 포함할 문자: ASCII 출력 가능 문자 + 일부 한글
+TEST_FONT_CHARS = ''.join(chr(c) for c in range(0x20, 0x7f)) + '가나다라마바사아자차카타파하한글제목썸네일'
+
+
+def build_test_font(path: str, chars: str = TEST_FONT_CHARS, family: str = 'TestSans') -> str:
+    """문자마다 사각형 글리프를 가진 최소 TrueType 폰트를 생성"""
+    upm = 1000
+    glyph_order = ['.notdef']
+    cmap = {}
+    for ch in chars:
+        name = f'uni{ord(ch):04X}'
+        if name not in glyph_order:
+            glyph_order.append(name)
+        cmap[ord(ch)] = name
+
+    def box(width):
+        pen = TTGlyphPen(None)
+        if width:
+            pen.moveTo((50, 0))
+            pen.lineTo((50, 700))
+            pen.lineTo((width - 50, 700))
+            pen.lineTo((width - 50, 0))
+            pen.closePath()
+        return pen.glyph()
+
+    glyphs = {}
+    metrics = {}
+    for name in glyph_order:
+        code = int(name[3:], 16) if name.startswith('uni') else None
+        if code == 0x20:
+            width = 250
+        elif code is not None and code >= 0x1100:
+            width = 1000
+        else:
+            width = 600
+        glyphs[name] = box(0 if code == 0x20 else width)
+        metrics[name] = (width, 50)
+
+    fb = FontBuilder(upm, isTTF=True)
+    fb.setupGlyphOrder(glyph_order)
+    fb.setupCharacterMap(cmap)
+    fb.setupGlyf(glyphs)
+    fb.setupHorizontalMetrics(metrics)
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({'familyName': family, 'styleName': 'Regular'})
+    fb.setupOS2(sTypoAscender=800, sTypoDescender=-200, usWinAscent=800, usWinDescent=200)
+    fb.setupPost()
+    fb.save(path)
+    return path
+
+
+@pytest.fixture(scope='session')
+def ttf_path(tmp_path_factory):
+    """세션 공용 테스트 TTF 경로"""
+    return build_test_font(str(tmp_path_factory.mktemp('fonts') / 'TestSans-normal-normal.ttf'))
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배경 레이어(그라디언트, 이미지) 테스트
+"""
+
+import base64
+
+import pytest
+from PIL import Image, ImageChops, ImageStat
+
+from thumbnail_maker import background
+from thumbnail_maker.background import (
+    clear_gradient_cache,
+    image_layer_cache,
+    load_cover_image,
+    parse_gradient_stops,
+    render_gradient,
+    render_image_layer,
+)
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+
+def _close(c1, c2, tol=6):
+    return all(abs(a - b) <= tol for a, b in zip(c1, c2))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_gradient_cache()
+    yield
+    clear_gradient_cache()
+
+
+class TestGradientStops:
+    """스톱 파싱 테스트"""
+
+    def test_even_distribution(self):
+        stops = parse_gradient_stops(['#ff0000', '#00ff00', '#0000ff'])
+        assert [p for p, _ in stops] == [0.0, 0.5, 1.0]
+        assert stops[0][1] == (255, 0, 0)
+
+    def test_explicit_positions(self):
+        stops = parse_gradient_stops([{'color': '#000000', 'position': 0.8}, ['#ffffff', 0.2]])
+        assert stops[0] == (0.2, (255, 255, 255))
+        assert stops[1] == (0.8, (0, 0, 0))
+
+
+class TestRenderGradient:
+    """그라디언트 이미지 생성 테스트"""
+
+    def test_horizontal_default(self):
+        img = render_gradient(200, 100, ['#a3e635', '#000000'])
+        assert img.size == (200, 100)
+        assert _close(img.getpixel((0, 50)), (0xa3, 0xe6, 0x35))
+        assert _close(img.getpixel((199, 50)), (0, 0, 0))
+        # 세로 방향으로는 값이 변하지 않는다
+        assert img.getpixel((100, 0)) == img.getpixel((100, 99))
+
+    def test_angle_180_is_top_to_bottom(self):
+        img = render_gradient(100, 200, ['#ffffff', '#000000'], angle=180)
+        assert _close(img.getpixel((50, 0)), (255, 255, 255))
+        assert _close(img.getpixel((50, 199)), (0, 0, 0))
+        assert img.getpixel((0, 100)) == img.getpixel((99, 100))
+
+    def test_multi_stop(self):
+        img = render_gradient(300, 10, ['#ff0000', '#00ff00', '#0000ff'])
+        assert _close(img.getpixel((0, 5)), (255, 0, 0))
+        assert _close(img.getpixel((150, 5)), (0, 255, 0))
+        assert _close(img.getpixel((299, 5)), (0, 0, 255))
+
+    def test_radial(self):
+        img = render_gradient(160, 90, ['#ffffff', '#000000'], kind='radial')
+        assert _close(img.getpixel((80, 45)), (255, 255, 255))
+        assert _close(img.getpixel((0, 0)), (0, 0, 0), tol=12)
+        # 끝 색은 모서리에서만 닿고, 변의 중점은 1/√2 지점이다
+        assert _close(img.getpixel((159, 89)), (0, 0, 0), tol=12)
+        assert _close(img.getpixel((0, 45)), (74, 74, 74), tol=12)
+        assert _close(img.getpixel((80, 0)), (74, 74, 74), tol=12)
+
+    def test_cached_per_parameters(self):
+        a = render_gradient(120, 60, ['#ffffff', '#000000'], angle=45)
+        b = render_gradient(120, 60, ['#ffffff', '#000000'], angle=45)
+        c = render_gradient(120, 60, ['#ffffff', '#000000'], angle=30)
+        assert a is b
+        assert a is not c
+
+
+def test_render_background_gradient_with_hex_letters():
+    """16진수 문자(a-f)가 포함된 색상도 렌더링된다"""
+    img = Image.new('RGB', (64, 32), '#ffffff')
+    ThumbnailRenderer.render_background(img, {'type': 'gradient', 'colors': ['#a3e635', '#000000']}, 64, 32)
+    assert _close(img.getpixel((0, 16)), (0xa3, 0xe6, 0x35))
+
+
+class TestImageLayerCache:
+    """이미지 배경 레이어 캐시 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_layer_cache(self):
+        image_layer_cache.clear()
+        yield
+        image_layer_cache.clear()
+
+    @pytest.fixture
+    def image_file(self, tmp_path):
+        path = tmp_path / 'bg.png'
+        Image.new('RGB', (400, 300), '#ff8800').save(path)
+        return str(path)
+
+    def test_reused_across_renders(self, image_file, monkeypatch):
+        calls = []
+        original = background._build_image_layer
+        monkeypatch.setattr(background, '_build_image_layer', lambda *a: calls.append(a) or original(*a))
+
+        first = render_image_layer(image_file, 160, 90, blur=2, opacity=0.5)
+        second = render_image_layer(image_file, 160, 90, blur=2, opacity=0.5)
+        assert first is second
+        assert len(calls) == 1
+        assert first.size == (160, 90)
+        assert first.mode == 'RGBA'
+
+    def test_parameters_are_part_of_key(self, image_file):
+        a = render_image_layer(image_file, 160, 90, blur=0)
+        b = render_image_layer(image_file, 160, 90, blur=3)
+        assert a is not b
+
+    def test_data_url_keyed_by_content(self, image_file):
+        with open(image_file, 'rb') as f:
+            data_url = 'data:image/png;base64,' + base64.b64encode(f.read()).decode()
+        a = render_image_layer(data_url, 100, 100)
+        b = render_image_layer(str(data_url), 100, 100)
+        assert a is b
+        assert a.getpixel((50, 50)) == (255, 136, 0)
+
+    def test_missing_file(self, tmp_path):
+        assert render_image_layer(str(tmp_path / 'none.png'), 100, 100) is None
+
+    def test_render_background_uses_layer(self, image_file):
+        img = Image.new('RGB', (80, 80), '#ffffff')
+        ThumbnailRenderer.render_background(img, {'type': 'image', 'imagePath': image_file}, 80, 80)
+        assert img.getpixel((40, 40)) == (255, 136, 0)
+        assert image_layer_cache.stats()['entries'] == 1
+
+
+class TestFastDownscale:
+    """축소 디코딩 테스트"""
+
+    @pytest.fixture
+    def jpeg_file(self, tmp_path):
+        path = tmp_path / 'photo.jpg'
+        img = Image.linear_gradient('L').resize((2400, 1600)).convert('RGB')
+        img.save(path, 'JPEG', quality=90)
+        return str(path)
+
+    def test_fast_matches_full_decode(self, jpeg_file):
+        fast = load_cover_image(jpeg_file, 240, 135, fast=True)
+        full = load_cover_image(jpeg_file, 240, 135, fast=False)
+        assert fast.size == full.size == (240, 135)
+        diff = ImageChops.difference(fast, full).convert('L')
+        assert ImageStat.Stat(diff).mean[0] < 2
+
+    def test_jpeg_uses_draft(self, jpeg_file, monkeypatch):
+        sizes = []
+        original = Image.Image.resize
+
+        def spy(self, size, *args, **kwargs):
+            sizes.append(self.size)
+            return original(self, size, *args, **kwargs)
+
+        monkeypatch.setattr(Image.Image, 'resize', spy)
+        load_cover_image(jpeg_file, 240, 135)
+        # 최종 LANCZOS 리사이즈 입력이 원본(2400x1600)보다 훨씬 작다
+        assert sizes[-1][0] <= 600
+
+    @pytest.mark.parametrize('mode', ['P', '1', 'I;16'])
+    def test_modes_without_reduce(self, tmp_path, mode):
+        path = tmp_path / f'big-{mode.replace(";", "")}.png'
+        img = Image.linear_gradient('L').resize((2000, 1200)).convert('RGB')
+        if mode == 'P':
+            img = img.quantize(64)
+        elif mode == 'I;16':
+            img = img.convert('L').convert('I;16')
+        else:
+            img = img.convert(mode)
+        img.save(path)
+        assert Image.open(path).mode == mode
+        layer = load_cover_image(str(path), 240, 135)
+        assert layer.size == (240, 135)
+        dsl = {'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': 240, 'height': 135},
+            'Background': {'type': 'image', 'imagePath': str(path)},
+            'Texts': [],
+        }}
+        assert ThumbnailRenderer.render_image(dsl).size == (240, 135)
+
+    def test_palette_gif_with_transparency(self, tmp_path):
+        path = tmp_path / 'big.gif'
+        img = Image.linear_gradient('L').resize((2000, 1200)).convert('RGB').quantize(32)
+        img.save(path, transparency=0)
+        layer = load_cover_image(str(path), 240, 135)
+        assert layer.mode == 'RGBA' and layer.size == (240, 135)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일괄 렌더링(batch) 테스트
+"""
+
+import json
+import zipfile
+from argparse import Namespace
+
+import pytest
+from PIL import Image
+
+from thumbnail_maker.batch import (
+    expand_inputs,
+    format_output,
+    imap_chunked,
+    plan_outputs,
+    render_batch,
+    render_variants,
+    row_overrides,
+)
+from thumbnail_maker.cli import batch_from_args, variants_from_args
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+
+def _write_dsl(path, color):
+    dsl = {
+        'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': 64, 'height': 36},
+            'Background': {'type': 'solid', 'color': color},
+        }
+    }
+    path.write_text(json.dumps(dsl), encoding='utf-8')
+    return dsl
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    src = tmp_path / 'src'
+    src.mkdir()
+    _write_dsl(src / 'red.json', '#ff0000')
+    _write_dsl(src / 'blue.json', '#0000ff')
+    (src / 'broken.json').write_text('{not json', encoding='utf-8')
+    with zipfile.ZipFile(src / 'green.thl', 'w') as zf:
+        zf.writestr('thumbnail.json', json.dumps(_write_dsl(tmp_path / 'tmp.json', '#00ff00')))
+    return src
+
+
+def test_expand_inputs_glob_and_manifest(inputs, tmp_path):
+    manifest = tmp_path / 'list.txt'
+    manifest.write_text('# 주석\nsrc/red.json\n\nsrc/green.thl\n', encoding='utf-8')
+    sources = expand_inputs([str(inputs / '*.json')], manifest=str(manifest))
+    names = [p.rsplit('/', 1)[-1] for p in sources]
+    assert names == ['blue.json', 'broken.json', 'red.json', 'green.thl']
+
+
+def test_plan_outputs_deduplicates_names(tmp_path):
+    jobs = plan_outputs(['/a/x.json', '/b/x.thl', '/c/y.json'], str(tmp_path))
+    assert [j[1].rsplit('/', 1)[-1] for j in jobs] == ['x.png', 'x-1.png', 'y.png']
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_render_batch_isolates_failures(inputs, tmp_path, jobs):
+    out = tmp_path / 'out'
+    sources = expand_inputs([str(inputs / '*')])
+    results = list(render_batch(sources, str(out), jobs=jobs, chunksize=1))
+
+    assert [r.source for r in results] == sources
+    status = {r.source.rsplit('/', 1)[-1]: r.ok for r in results}
+    assert status == {'blue.json': True, 'broken.json': False, 'green.thl': True, 'red.json': True}
+    assert Image.open(out / 'green.png').getpixel((0, 0)) == (0, 255, 0)
+    assert Image.open(out / 'red.png').getpixel((0, 0)) == (255, 0, 0)
+    assert not (out / 'broken.png').exists()
+
+
+def test_batch_command_streams_json_and_fails(inputs, tmp_path, capsys):
+    args = Namespace(
+        inputs=[str(inputs / '*.json')], manifest=None, output_dir=str(tmp_path / 'out'),
+        jobs=1, chunksize=None, json=True, timings=True,
+    )
+    with pytest.raises(SystemExit) as exc:
+        batch_from_args(args)
+    assert exc.value.code == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line['ok'] for line in lines] == [True, False, True]
+    assert 'JSONDecodeError' in lines[1]['error']
+    assert set(lines[0]['timings']) >= {'resolution', 'background', 'encode'}
+    assert 'timings' not in lines[1]
+
+
+class TestVariants:
+    """템플릿 + 데이터 행 렌더링 테스트"""
+
+    @pytest.fixture
+    def template_path(self, tmp_path):
+        dsl = {
+            'Thumbnail': {
+                'Resolution': {'type': 'custom', 'width': 64, 'height': 36},
+                'Background': {'type': 'solid', 'color': '#000000'},
+                'Texts': [{'type': 'title', 'content': 'T', 'fontSize': 10, 'color': '#ffffff'}],
+            }
+        }
+        path = tmp_path / 'template.json'
+        path.write_text(json.dumps(dsl), encoding='utf-8')
+        return str(path)
+
+    def test_row_overrides(self, template_path):
+        with open(template_path, encoding='utf-8') as f:
+            template = ThumbnailRenderer.compile(json.load(f))
+        row = {'title': 'A\\nB', 'title.color': '#ff0000', '0.fontSize': '12.0',
+               'background': 'bg.png', 'episode': '7', 'subtitle': 'x', 'title.font': 'y', 'title.color ': ''}
+        overrides, background = row_overrides(template, row, '/data')
+        assert overrides == {'title': {'content': 'A\nB', 'color': '#ff0000'}, 0: {'fontSize': 12}}
+        assert background == '/data/bg.png'
+
+    def test_format_output_sanitizes_values(self):
+        assert format_output('out/{episode}_{title}.png', {'episode': '3', 'title': 'a/b:c'}, 1) == 'out/3_a_b_c.png'
+        assert format_output('{n:03d}.png', {}, 7) == '007.png'
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_render_variants_csv(self, template_path, tmp_path, monkeypatch, jobs):
+        Image.new('RGB', (8, 8), '#0000ff').save(tmp_path / 'blue.png')
+        data = tmp_path / 'rows.csv'
+        data.write_text(
+            'id,title,title.color,background\n'
+            '1,첫째,#ff0000,\n'
+            '2,둘째,not-a-color,\n'
+            '3,셋째,,blue.png\n',
+            encoding='utf-8',
+        )
+        monkeypatch.chdir(tmp_path)
+        results = list(render_variants(template_path, str(data), 'out/{id}.png', jobs=jobs, chunksize=1))
+
+        assert [r.source for r in results] == ['rows.csv:1', 'rows.csv:2', 'rows.csv:3']
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[0].output == str(tmp_path / 'out' / '1.png')
+        assert Image.open(tmp_path / 'out' / '3.png').getpixel((0, 0)) == (0, 0, 255)
+        assert not (tmp_path / 'out' / '2.png').exists()
+
+    def test_render_variants_jsonl(self, template_path, tmp_path, monkeypatch):
+        data = tmp_path / 'rows.jsonl'
+        data.write_text('{"title": "a", "slug": "x"}\n\n{"title": "b", "slug": "y"}\n', encoding='utf-8')
+        monkeypatch.chdir(tmp_path)
+        results = list(render_variants(template_path, str(data), '{slug}.png', jobs=1))
+        assert all(r.ok for r in results)
+        assert (tmp_path / 'x.png').exists() and (tmp_path / 'y.png').exists()
+
+    def test_broken_template_reports_cause(self, tmp_path, monkeypatch, capsys):
+        template = tmp_path / 'bad.json'
+        template.write_text(json.dumps({'Thumbnail': {'Background': {'type': 'gradient', 'colors': 'oops'}}}),
+                            encoding='utf-8')
+        data = tmp_path / 'rows.csv'
+        data.write_text('title\nA\nB\n', encoding='utf-8')
+        monkeypatch.chdir(tmp_path)
+        # 워커 풀을 시작하기 전에 부모에서 컴파일하므로 BrokenProcessPool이 아니라 실제 원인이 보인다
+        with pytest.raises(ValueError, match='unknown color'):
+            list(render_variants(str(template), str(data), jobs=2))
+
+        args = Namespace(
+            template=str(template), data=str(data), output_pattern='{n}.png', jobs=2, chunksize=1,
+            json=False, timings=False, cache_dir=None, cache_max_mb=None,
+        )
+        with pytest.raises(SystemExit) as exc:
+            variants_from_args(args)
+        assert exc.value.code == 1
+        assert '템플릿을 컴파일할 수 없습니다' in capsys.readouterr().out
+
+
+def test_imap_chunked_is_ordered_and_bounded():
+    from concurrent.futures import ThreadPoolExecutor
+
+    consumed = []
+
+    def items():
+        for i in range(50):
+            consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(4) as executor:
+        stream = imap_chunked(executor, lambda chunk: [x * 2 for x in chunk], items(), chunksize=3, window=2)
+        assert next(stream) == 0
+        # 첫 결과 시점에는 window * chunksize(+다음 청크)만 읽었다
+        assert len(consumed) <= 9
+        assert [0] + list(stream) == [x * 2 for x in range(50)]
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더링 데몬(serve) 및 클라이언트 테스트
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import pytest
+from PIL import Image
+
+from thumbnail_maker.cli import _render_thumbnail
+from thumbnail_maker.daemon import RenderServer, ping, render_via_daemon, request
+from thumbnail_maker.fonts import font_resolver
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix 소켓 미지원 플랫폼')
+
+
+@pytest.fixture
+def fonts_dir(tmp_path, ttf_path, monkeypatch):
+    directory = tmp_path / 'fonts'
+    directory.mkdir()
+    shutil.copy(ttf_path, directory / 'TestSans-normal-normal.ttf')
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(directory)))
+    font_resolver.invalidate()
+    yield directory
+    font_resolver.invalidate()
+
+
+@pytest.fixture
+def dsl(fonts_dir):
+    return {
+        'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': 96, 'height': 54},
+            'Background': {'type': 'solid', 'color': '#336699'},
+            'Texts': [{'type': 'title', 'content': 'Hi', 'font': {'name': 'TestSans'}, 'fontSize': 20}],
+        }
+    }
+
+
+@pytest.fixture
+def server():
+    # Unix 소켓 경로 길이 제한(약 100자) 때문에 짧은 임시 폴더 사용
+    directory = tempfile.mkdtemp(prefix='thd')
+    srv = RenderServer(os.path.join(directory, 'render.sock'))
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    thread.join(timeout=5)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_ping_and_stale_socket(server):
+    assert ping(server.socket_path)
+    assert not ping(server.socket_path + '.missing')
+    with pytest.raises(RuntimeError):
+        RenderServer(server.socket_path)
+
+
+def test_render_bytes_matches_in_process(server, dsl):
+    reply = render_via_daemon(server.socket_path, dsl, timings=True)
+    assert reply['data'] == ThumbnailRenderer.render_bytes(dsl)
+    assert 'text' in reply['timings']
+
+
+def test_render_to_file_reuses_template(server, dsl, tmp_path, monkeypatch):
+    from thumbnail_maker import render_cache
+
+    # 렌더링 캐시가 없으면 dsl_key(폰트 조회/해시)를 계산하지 않는다
+    monkeypatch.setattr(render_cache, 'dsl_key', lambda *args: pytest.fail('dsl_key called'))
+    output = tmp_path / 'out.png'
+    for content in ('Hi', 'Hi', 'Hello'):
+        dsl['Thumbnail']['Texts'][0]['content'] = content
+        reply = render_via_daemon(server.socket_path, dsl, str(output))
+        assert reply['output'] == str(output) and not reply['cached']
+        assert output.read_bytes() == ThumbnailRenderer.render_bytes(dsl)
+    # 텍스트 내용만 다르면 같은 템플릿을 쓴다
+    assert len(server.service.templates) == 1
+    dsl['Thumbnail']['Texts'][0]['fontSize'] = 24
+    render_via_daemon(server.socket_path, dsl, str(output))
+    assert len(server.service.templates) == 2
+
+
+def test_relative_paths_use_client_cwd(server, dsl, tmp_path, monkeypatch):
+    Image.new('RGB', (32, 32), '#ff0000').save(tmp_path / 'bg.png')
+    dsl['Thumbnail']['Background'] = {'type': 'image', 'imagePath': 'bg.png'}
+    monkeypatch.chdir(tmp_path)
+    reply = render_via_daemon(server.socket_path, dsl, 'out.png')
+    assert reply['output'] == str(tmp_path / 'out.png')
+    assert Image.open(tmp_path / 'out.png').getpixel((0, 0)) == (255, 0, 0)
+
+
+def test_render_error_and_unknown_op(server, dsl):
+    with pytest.raises(RuntimeError):
+        render_via_daemon(server.socket_path, dsl, '/missing/dir/out.png')
+    assert request(server.socket_path, {'op': 'nope'})['ok'] is False
+    # 오류 후에도 계속 동작
+    assert ping(server.socket_path)
+
+
+def test_cli_falls_back_without_daemon(dsl, tmp_path, capsys):
+    output = tmp_path / 'out.png'
+    args = argparse.Namespace(daemon=str(tmp_path / 'none.sock'), cache_dir=None, cache_max_mb=None)
+    _render_thumbnail(json.loads(json.dumps(dsl)), str(output), args, None)
+    assert output.exists()
+    assert '직접 렌더링' in capsys.readouterr().out
+
+
+def test_cli_uses_daemon(server, dsl, tmp_path, capsys):
+    output = tmp_path / 'out.png'
+    args = argparse.Namespace(daemon=server.socket_path, cache_dir=None, cache_max_mb=None)
+    _render_thumbnail(dsl, str(output), args, None)
+    assert output.exists()
+    assert len(server.service.templates) == 1
+    assert '직접 렌더링' not in capsys.readouterr().out
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+폰트 동시 다운로드/재검증 테스트 (로컬 HTTP 서버 사용)
+"""
+
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from thumbnail_maker import font_fetch
+from thumbnail_maker.fonts import font_resolver
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+
+class FontServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, files):
+        super().__init__(('127.0.0.1', 0), FontHandler)
+        self.files = files
+        self.log = []
+        self.ports = set()
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server_address[1]}/{name}"
+
+
+class FontHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.ports.add(self.client_address[1])
+        try:
+            time.sleep(server.delay)
+            name = self.path.lstrip('/')
+            data = server.files.get(name)
+            conditional = self.headers.get('If-None-Match')
+            server.log.append((name, conditional))
+            if data is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            etag = '"%s"' % hashlib.sha256(data).hexdigest()[:16]
+            if conditional == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', 'Mon, 01 Jan 2024 00:00:00 GMT')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+@pytest.fixture
+def font_bytes(ttf_path):
+    with open(ttf_path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def server(font_bytes):
+    srv = FontServer({f'face{i}.ttf': font_bytes for i in range(4)})
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    font_fetch.close_client()
+
+
+@pytest.fixture
+def fonts_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'fonts'
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(directory)))
+    font_resolver.invalidate()
+    yield directory
+    font_resolver.invalidate()
+
+
+def texts_for(server, count):
+    return [{
+        'type': 'title', 'content': 'x',
+        'font': {'name': 'Web', 'faces': [
+            {'name': f'Web{i}', 'url': server.url(f'face{i}.ttf'), 'weight': 'normal', 'style': 'normal'}
+            for i in range(count)
+        ]},
+    }]
+
+
+def test_faces_download_concurrently(server, fonts_dir, font_bytes):
+    server.delay = 0.2
+    ThumbnailRenderer.ensure_fonts(texts_for(server, 4))
+    for i in range(4):
+        assert (fonts_dir / f'Web{i}-normal-normal.ttf').read_bytes() == font_bytes
+    assert server.max_active > 1
+    assert not [name for name in os.listdir(fonts_dir) if name.endswith('.part')]
+
+    # 이미 있으면 요청하지 않는다
+    ThumbnailRenderer.ensure_fonts(texts_for(server, 4))
+    assert len(server.log) == 4
+
+
+def test_refresh_uses_conditional_requests(server, fonts_dir, font_bytes):
+    texts = texts_for(server, 2)
+    ThumbnailRenderer.ensure_fonts(texts)
+    ThumbnailRenderer.ensure_fonts(texts, refresh=True)
+    assert all(conditional for _, conditional in server.log[2:])
+    assert (fonts_dir / 'Web0-normal-normal.ttf').read_bytes() == font_bytes
+
+    server.files['face1.ttf'] = font_bytes + b'\0' * 4
+    ThumbnailRenderer.ensure_fonts(texts, refresh=True)
+    assert (fonts_dir / 'Web0-normal-normal.ttf').read_bytes() == font_bytes
+    assert (fonts_dir / 'Web1-normal-normal.ttf').read_bytes() == font_bytes + b'\0' * 4
+
+
+def test_connections_are_reused(server, tmp_path):
+    results = [font_fetch.fetch(server.url(f'face{i}.ttf'), str(tmp_path / f'{i}.ttf')) for i in range(3)]
+    assert [r.status for r in results] == ['downloaded'] * 3
+    assert len(server.ports) == 1
+
+
+def test_failed_download_leaves_no_file(server, fonts_dir, tmp_path, capsys):
+    [result] = font_fetch.fetch_all([(server.url('missing.ttf'), str(tmp_path / 'missing.ttf'))])
+    assert result.status == 'failed' and '404' in result.error
+    assert os.listdir(tmp_path) == []
+
+    texts = [{'font': {'faces': [{'name': 'Gone', 'url': server.url('missing.ttf')}]}}]
+    ThumbnailRenderer.ensure_fonts(texts)
+    assert '폰트 다운로드 실패' in capsys.readouterr().out
+    assert os.listdir(fonts_dir) == [font_fetch.FAILURES_FILE]
+
+
+def test_failed_url_backs_off_across_processes(server, fonts_dir, capsys):
+    texts = [{'font': {'faces': [{'name': 'Gone', 'url': server.url('missing.ttf')}]}}]
+    ThumbnailRenderer.ensure_fonts(texts)
+    assert len(server.log) == 1
+
+    start = time.perf_counter()
+    for _ in range(20):
+        ThumbnailRenderer.ensure_fonts(texts)
+    assert time.perf_counter() - start < 0.5
+    assert len(server.log) == 1
+    assert '재시도' in capsys.readouterr().out
+
+    # 다른 프로세스(새 인스턴스)도 파일에 저장된 기록을 본다
+    failures = font_fetch.NegativeCache(str(fonts_dir / font_fetch.FAILURES_FILE))
+    assert failures.retry_after(server.url('missing.ttf')) > 0
+    # 연속 실패할수록 대기 시간이 늘어난다
+    assert failures.record_failure(server.url('missing.ttf'), 'x') == font_fetch.BACKOFF_BASE * 2
+
+    # 명시적 새로 고침은 백오프를 무시하고, 성공하면 기록을 지운다
+    server.files['missing.ttf'] = server.files['face0.ttf']
+    ThumbnailRenderer.ensure_fonts(texts, refresh=True)
+    assert (fonts_dir / 'Gone-normal-normal.ttf').exists()
+    assert failures.retry_after(server.url('missing.ttf')) == 0
+
+
+def test_offline_never_touches_network(server, fonts_dir, monkeypatch, capsys):
+    monkeypatch.delenv(font_fetch.OFFLINE_ENV, raising=False)
+    font_fetch.set_offline(True)
+    try:
+        ThumbnailRenderer.ensure_fonts(texts_for(server, 2))
+        [result] = font_fetch.fetch_all([(server.url('face0.ttf'), str(fonts_dir / 'x.ttf'))])
+    finally:
+        font_fetch.set_offline(False)
+    assert server.log == []
+    assert result.status == 'skipped' and not result.ok
+    assert '오프라인' in capsys.readouterr().out
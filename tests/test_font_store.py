@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+내용 주소 기반 폰트 저장소 테스트
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from thumbnail_maker import font_fetch
+from thumbnail_maker.font_store import FONT_STORE_ENV, FontStore
+from thumbnail_maker.fonts import font_resolver
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+from .test_font_fetch import FontServer
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'store'
+    monkeypatch.setenv(FONT_STORE_ENV, str(directory))
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(tmp_path / 'fonts')))
+    font_resolver.invalidate()
+    yield directory
+    font_resolver.invalidate()
+
+
+@pytest.fixture
+def font_bytes(ttf_path):
+    with open(ttf_path, 'rb') as f:
+        return f.read()
+
+
+def _put_many(directory, worker, count):
+    store = FontStore(directory)
+    for i in range(count):
+        store.put(f'https://example.com/{worker}/{i}.ttf', f'{worker}-{i}'.encode())
+    return worker
+
+
+def test_put_is_content_addressed(tmp_path):
+    store = FontStore(str(tmp_path))
+    first = store.put('https://a.example/x.ttf', b'font', validators={'etag': '"1"'})
+    second = store.put('https://b.example/y.ttf', b'font')
+    assert first == second and open(first, 'rb').read() == b'font'
+    assert store.lookup('https://a.example/x.ttf') == first
+    assert store.entry('https://a.example/x.ttf')['etag'] == '"1"'
+    assert store.lookup('https://c.example/z.ttf') is None
+
+    # 다른 인스턴스(다른 프로세스)도 manifest로 같은 결과를 본다
+    assert FontStore(str(tmp_path)).lookup('https://b.example/y.ttf') == first
+    assert store.stats()['fonts'] == 1 and store.stats()['keys'] == 2
+
+
+def test_same_name_faces_do_not_collide(store_dir, tmp_path, ttf_path, font_bytes):
+    other = tmp_path / 'other.ttf'
+    other.write_bytes(font_bytes + b'\0' * 4)
+    texts = [
+        {'font': {'faces': [{'name': 'Same', 'url': ttf_path}]}},
+        {'font': {'faces': [{'name': 'Same', 'url': 'file://' + str(other), 'weight': 'bold'}]}},
+    ]
+    ThumbnailRenderer.ensure_fonts(texts)
+    regular = ThumbnailRenderer.find_font_path('Same', url=ttf_path)
+    bold = ThumbnailRenderer.find_font_path('Same', 'bold', url='file://' + str(other))
+    assert regular != bold
+    assert open(regular, 'rb').read() == font_bytes
+    assert open(bold, 'rb').read() == font_bytes + b'\0' * 4
+    assert ThumbnailRenderer.face_url(texts, 'Same', 'bold') == 'file://' + str(other)
+    assert not (tmp_path / 'fonts').exists()
+
+    # 로컬 원본이 바뀌면 다른 키가 되어 다시 등록된다
+    other.write_bytes(font_bytes + b'\1' * 4)
+    os.utime(other, ns=(os.stat(other).st_atime_ns, os.stat(other).st_mtime_ns + 10 ** 9))
+    font_resolver.invalidate()  # 다른 프로세스가 바꾼 파일은 STAMP_RECHECK초 안에 반영된다
+    ThumbnailRenderer.ensure_fonts(texts)
+    bold = ThumbnailRenderer.find_font_path('Same', 'bold', url='file://' + str(other))
+    assert open(bold, 'rb').read() == font_bytes + b'\1' * 4
+
+
+def test_lookup_and_put_avoid_rescans(tmp_path, monkeypatch):
+    store = FontStore(str(tmp_path))
+    path = store.put('a', b'font-a')
+    assert store.lookup('a') == path
+
+    # 기억한 키는 manifest를 다시 확인하지 않고, 등록은 objects 전체를 다시 훑지 않는다
+    monkeypatch.setattr(store, 'entry', lambda key: pytest.fail('manifest read'))
+    monkeypatch.setattr(store, '_total_size', lambda: pytest.fail('objects scan'))
+    assert store.lookup('a') == path
+    second = store.put('b', b'font-b')
+    monkeypatch.undo()
+    assert store.lookup('b') == second and store.stats()['bytes'] == 12
+
+
+def test_concurrent_processes_keep_all_entries(tmp_path):
+    try:
+        context = multiprocessing.get_context('fork')
+    except ValueError:
+        pytest.skip('fork를 지원하지 않는 플랫폼')
+    with ProcessPoolExecutor(4, mp_context=context) as pool:
+        list(pool.map(_put_many, [str(tmp_path)] * 4, range(4), [10] * 4))
+    with open(tmp_path / 'manifest.json', encoding='utf-8') as f:
+        urls = json.load(f)['urls']
+    assert len(urls) == 40
+    store = FontStore(str(tmp_path))
+    assert all(store.lookup(key) for key in urls)
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    store = FontStore(str(tmp_path), max_bytes=250)
+    old = store.put('old', b'a' * 100)
+    recent = store.put('recent', b'b' * 100)
+    past = time.time() - 10000
+    os.utime(old, (past, past))
+    os.utime(recent, (past + 10, past + 10))
+    store.lookup('recent')  # 오래된 항목을 조회하면 사용 시각이 갱신된다
+
+    newest = store.put('newest', b'c' * 100)
+    assert not os.path.exists(old) and store.lookup('old') is None
+    assert store.lookup('recent') == recent and store.lookup('newest') == newest
+    assert store.stats()['bytes'] <= 250
+
+    store.max_bytes = 0
+    assert store.evict() == 2
+    assert store.stats()['keys'] == 0
+
+
+def test_store_revalidates_remote_fonts(store_dir, font_bytes):
+    server = FontServer({'web.ttf': font_bytes})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = server.url('web.ttf')
+        texts = [{'font': {'faces': [{'name': 'Web', 'url': url}]}}]
+        ThumbnailRenderer.ensure_fonts(texts)
+        path = ThumbnailRenderer.find_font_path('Web', url=url)
+        assert open(path, 'rb').read() == font_bytes
+
+        ThumbnailRenderer.ensure_fonts(texts)
+        assert len(server.log) == 1
+
+        ThumbnailRenderer.ensure_fonts(texts, refresh=True)
+        assert server.log[-1][1] is not None
+        assert ThumbnailRenderer.find_font_path('Web', url=url) == path
+        assert os.listdir(store_dir / 'incoming') == []
+    finally:
+        server.shutdown()
+        server.server_close()
+        font_fetch.close_client()
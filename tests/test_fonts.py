@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+폰트 캐시 및 폰트 인덱스 테스트
+"""
+
+import io
+import os
+import shutil
+import threading
+import time
+import zipfile
+
+import pytest
+
+from thumbnail_maker.cache import LRUCache
+from thumbnail_maker.fonts import FontResolver, font_cache, font_resolver, load_sfnt, load_truetype, sfnt_cache
+from thumbnail_maker.package import open_package
+from thumbnail_maker.renderer import ThumbnailRenderer
+from thumbnail_maker.woff import decode_woff, decode_woff2, font_format, to_sfnt
+
+
+@pytest.fixture(autouse=True)
+def _fresh_font_cache():
+    font_cache.clear()
+    yield
+    font_cache.clear()
+
+
+class TestLRUCache:
+    """LRU 캐시 동작 테스트"""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+
+    def test_byte_limit(self):
+        cache = LRUCache(maxsize=10, max_bytes=10, sizeof=len)
+        cache.put('a', b'12345')
+        cache.put('b', b'12345')
+        cache.put('c', b'1')
+        assert 'a' not in cache
+        assert cache.total_bytes == 6
+        # 한도보다 큰 항목은 저장하지 않는다
+        cache.put('huge', b'x' * 11)
+        assert 'huge' not in cache
+
+    def test_factory_runs_once_under_concurrency(self):
+        cache = LRUCache()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_create('k', factory)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['hits'] == 7
+
+
+class TestFontCache:
+    """폰트 캐시 테스트"""
+
+    def test_same_key_parsed_once(self, ttf_path):
+        a = load_truetype(ttf_path, 32)
+        b = ThumbnailRenderer.load_font(ttf_path, 32)
+        assert a is b
+        assert font_cache.stats()['hits'] == 1
+        assert font_cache.stats()['misses'] == 1
+
+    def test_size_is_part_of_key(self, ttf_path):
+        assert load_truetype(ttf_path, 32) is not load_truetype(ttf_path, 24)
+
+    def test_rewritten_file_is_reloaded(self, tmp_path, ttf_path, monkeypatch):
+        from .conftest import build_test_font
+
+        path = tmp_path / 'Swap-normal-normal.ttf'
+        shutil.copy(ttf_path, path)
+        old = load_truetype(str(path), 20)
+        assert load_truetype(str(path), 20) is old
+
+        # 같은 프로세스에서 기록한 경우: 기록한 쪽의 invalidate로 바로 반영
+        build_test_font(str(path), 'Hi', 'Swapped')
+        font_resolver.invalidate(str(tmp_path))
+        new = load_truetype(str(path), 20)
+        assert new is not old and new.getname()[0] == 'Swapped'
+
+        # 다른 프로세스가 기록한 경우: STAMP_RECHECK 이후 mtime/크기 변경으로 감지
+        monkeypatch.setattr(FontResolver, 'STAMP_RECHECK', 0.0)
+        shutil.copy(ttf_path, path)
+        os.utime(path, ns=(0, 10 ** 18))
+        assert load_truetype(str(path), 20).getname()[0] == 'TestSans'
+
+    def test_failure_not_cached(self, tmp_path):
+        missing = str(tmp_path / 'missing.ttf')
+        with pytest.raises(OSError):
+            load_truetype(missing, 32)
+        assert len(font_cache) == 0
+
+
+def _web_font(ttf_path, flavor):
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(ttf_path, recalcTimestamp=False)
+    font.flavor = flavor
+    buf = io.BytesIO()
+    font.save(buf)
+    return buf.getvalue()
+
+
+def _tables(data):
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(io.BytesIO(data))
+    return {tag: font.reader[tag] for tag in font.reader.keys()}
+
+
+class TestWebFonts:
+    """WOFF/WOFF2 메모리 디코딩 테스트"""
+
+    @pytest.fixture
+    def woff_path(self, tmp_path, ttf_path):
+        path = tmp_path / 'TestSans.woff'
+        path.write_bytes(_web_font(ttf_path, 'woff'))
+        return str(path)
+
+    def test_decode_woff_keeps_tables(self, woff_path, ttf_path):
+        with open(woff_path, 'rb') as f:
+            data = f.read()
+        assert font_format(data) == '.woff'
+        sfnt, ext = to_sfnt(data)
+        assert ext == '.ttf' and font_format(sfnt) == '.ttf'
+        with open(ttf_path, 'rb') as f:
+            assert _tables(sfnt) == _tables(f.read())
+        with pytest.raises(ValueError):
+            decode_woff(data[:-8])
+
+    def test_decode_woff2(self, ttf_path):
+        pytest.importorskip('brotli')
+        sfnt = decode_woff2(_web_font(ttf_path, 'woff2'))
+        assert set(_tables(sfnt)) >= {'glyf', 'loca', 'cmap', 'head'}
+
+    def test_load_woff_in_memory(self, woff_path, tmp_path):
+        sfnt_cache.clear()
+        font = load_truetype(woff_path, 20)
+        assert font.getbbox('Hi')[2] > 0
+        assert load_truetype(woff_path, 30).getbbox('Hi')[2] > font.getbbox('Hi')[2]
+        # 크기가 달라도 디코딩은 한 번, 변환 파일은 만들지 않는다
+        assert sfnt_cache.stats()['misses'] == 1
+        assert sorted(os.listdir(tmp_path)) == ['TestSans.woff']
+        assert load_sfnt(woff_path) is load_sfnt(woff_path)
+
+    def test_load_woff_from_package(self, woff_path, tmp_path):
+        thl = tmp_path / 'web.thl'
+        with zipfile.ZipFile(thl, 'w') as zf:
+            zf.writestr('thumbnail.json', '{}')
+            zf.write(woff_path, 'fonts/TestSans-normal-normal.woff')
+        uri = open_package(str(thl)).uri('fonts/TestSans-normal-normal.woff')
+        assert load_truetype(uri, 20).getbbox('Hi')[2] > 0
+
+    def test_invalid_web_font_raises_oserror(self, tmp_path):
+        path = tmp_path / 'broken.woff2'
+        path.write_bytes(b'not a font')
+        with pytest.raises(OSError):
+            load_truetype(str(path), 20)
+
+    def test_ensure_fonts_keeps_woff(self, woff_path, tmp_path, monkeypatch):
+        fonts_dir = tmp_path / 'fonts'
+        monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(fonts_dir)))
+        font_resolver.invalidate()
+        try:
+            texts = [{'font': {'faces': [{'name': 'Web', 'url': woff_path}]}}]
+            ThumbnailRenderer.ensure_fonts(texts)
+            assert os.listdir(fonts_dir) == ['Web-normal-normal.woff']
+            font_path = ThumbnailRenderer.find_font_path('Web')
+            assert font_path == str(fonts_dir / 'Web-normal-normal.woff')
+            assert ThumbnailRenderer.resolve_font('Web', 'normal', 'normal', 20) is load_truetype(font_path, 20)
+        finally:
+            font_resolver.invalidate()
+
+
+class TestFontResolver:
+    """폰트 파일 인덱스 테스트"""
+
+    def test_lookup_prefers_first_name(self, tmp_path):
+        (tmp_path / 'A-normal-normal.ttf').write_bytes(b'')
+        (tmp_path / 'A-normal-normal.otf').write_bytes(b'')
+        resolver = FontResolver()
+        found = resolver.lookup(str(tmp_path), ('A-normal-normal.ttf', 'A-normal-normal.otf'))
+        assert found == os.path.join(str(tmp_path), 'A-normal-normal.ttf')
+        assert resolver.lookup(str(tmp_path), ('B.ttf',)) is None
+
+    def test_invalidate_picks_up_new_file(self, tmp_path):
+        resolver = FontResolver()
+        assert resolver.lookup(str(tmp_path), ('new.ttf',)) is None
+        (tmp_path / 'new.ttf').write_bytes(b'')
+        resolver.invalidate(str(tmp_path))
+        assert resolver.lookup(str(tmp_path), ('new.ttf',)) is not None
+
+    def test_miss_rechecks_directory_mtime(self, tmp_path, monkeypatch):
+        resolver = FontResolver()
+        monkeypatch.setattr(FontResolver, 'MISS_RECHECK', 0.0)
+        assert resolver.lookup(str(tmp_path), ('late.ttf',)) is None
+        (tmp_path / 'late.ttf').write_bytes(b'')
+        os.utime(tmp_path, ns=(0, 10 ** 18))
+        assert resolver.lookup(str(tmp_path), ('late.ttf',)) is not None
+
+    def test_hits_do_not_touch_filesystem(self, tmp_path, monkeypatch):
+        (tmp_path / 'hit.ttf').write_bytes(b'')
+        resolver = FontResolver()
+        assert resolver.lookup(str(tmp_path), ('hit.ttf',))
+
+        def fail(*args, **kwargs):
+            raise AssertionError('파일시스템 조회가 발생함')
+
+        monkeypatch.setattr(os, 'stat', fail)
+        monkeypatch.setattr(os, 'scandir', fail)
+        assert resolver.lookup(str(tmp_path), ('hit.ttf',))
+
+
+def test_render_resolves_fonts_without_probes(tmp_path, ttf_path, monkeypatch):
+    """정상 상태 렌더링에서는 폰트 디렉토리를 조회하지 않는다"""
+    fonts_dir = tmp_path / 'fonts'
+    fonts_dir.mkdir()
+    shutil.copy(ttf_path, fonts_dir / 'TestSans-bold-normal.ttf')
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(fonts_dir)))
+    font_resolver.invalidate()
+
+    face = {'name': 'TestSans', 'url': 'https://example.invalid/TestSans.woff', 'weight': 'bold', 'style': 'normal'}
+    text = {'type': 'title', 'content': 'Hello', 'font': {'name': 'TestSans', 'faces': [face]}, 'fontWeight': 'bold'}
+    dsl = {'Thumbnail': {'Texts': [text, dict(text, type='subtitle', gridPosition='bl')]}}
+    output = str(tmp_path / 'out.png')
+    ThumbnailRenderer.render_thumbnail(dsl, output)
+
+    probes = []
+    real_stat, real_exists = os.stat, os.path.exists
+
+    def counting_stat(path, *args, **kwargs):
+        if str(fonts_dir) in str(path):
+            probes.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    def counting_exists(path):
+        if str(fonts_dir) in str(path):
+            probes.append(path)
+        return real_exists(path)
+
+    monkeypatch.setattr(os, 'stat', counting_stat)
+    monkeypatch.setattr(os.path, 'exists', counting_exists)
+    ThumbnailRenderer.render_thumbnail(dsl, output)
+    assert probes == []
+    font_resolver.invalidate()
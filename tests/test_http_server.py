@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 렌더링 서비스 테스트
+"""
+
+import asyncio
+import http.client
+import io
+import json
+import shutil
+import threading
+import zipfile
+
+import pytest
+from PIL import Image
+
+from thumbnail_maker import http_server
+from thumbnail_maker.font_fetch import OFFLINE_ENV
+from thumbnail_maker.fonts import font_resolver
+from thumbnail_maker.http_server import RenderHTTPServer, check_request_dsl, find_template
+from thumbnail_maker.render_cache import RenderCache
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+
+@pytest.fixture
+def fonts_dir(tmp_path, ttf_path, monkeypatch):
+    directory = tmp_path / 'fonts'
+    directory.mkdir()
+    shutil.copy(ttf_path, directory / 'TestSans-normal-normal.ttf')
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(directory)))
+    font_resolver.invalidate()
+    yield directory
+    font_resolver.invalidate()
+
+
+@pytest.fixture
+def dsl(fonts_dir):
+    return {
+        'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': 96, 'height': 54},
+            'Background': {'type': 'solid', 'color': '#336699'},
+            'Texts': [{'type': 'title', 'content': 'Hi', 'font': {'name': 'TestSans'}, 'fontSize': 20}],
+        }
+    }
+
+
+@pytest.fixture
+def template_dir(tmp_path, dsl):
+    directory = tmp_path / 'templates'
+    directory.mkdir()
+    (directory / 'plain.json').write_text(json.dumps(dsl), encoding='utf-8')
+    with zipfile.ZipFile(directory / 'packed.thl', 'w') as zf:
+        zf.writestr('thumbnail.json', json.dumps(dsl))
+    return directory
+
+
+def start_server(**kwargs):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = RenderHTTPServer(port=0, jobs=1, **kwargs)
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(timeout=10)
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(timeout=30)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+    return server, stop
+
+
+@pytest.fixture
+def server(template_dir, tmp_path):
+    srv, stop = start_server(template_dir=str(template_dir), cache=RenderCache(str(tmp_path / 'cache')))
+    yield srv
+    stop()
+
+
+def call(server, method, path, payload=None, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=30)
+    try:
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        conn.request(method, path, body=body, headers={'Content-Type': 'application/json', **(headers or {})})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def test_render_dsl_matches_in_process(server, dsl):
+    status, headers, body = call(server, 'POST', '/render', {'dsl': dsl})
+    assert status == 200
+    assert headers['Content-Type'] == 'image/png'
+    assert headers['X-Cache'] == 'miss'
+    assert body == ThumbnailRenderer.render_bytes(dsl)
+
+    status, headers, again = call(server, 'POST', '/render', {'dsl': dsl})
+    assert headers['X-Cache'] == 'hit' and again == body
+
+
+def test_render_template_with_overrides(server, dsl):
+    for template_id in ('plain', 'packed'):
+        status, _, body = call(server, 'POST', '/render', {
+            'template': template_id,
+            'overrides': {'title': {'content': 'Hello', 'color': '#ff0000'}},
+            'format': 'jpeg', 'quality': 80, 'timings': True,
+        })
+        assert status == 200
+        img = Image.open(io.BytesIO(body))
+        assert img.format == 'JPEG' and img.size == (96, 54)
+
+    status, headers, _ = call(server, 'POST', '/render', {'template': 'plain', 'timings': True})
+    assert status == 200 and 'Server-Timing' in headers
+
+
+@pytest.mark.parametrize('payload, expected', [
+    ({'template': 'missing'}, 404),
+    ({'template': '../plain'}, 404),
+    ({'template': 'plain', 'overrides': {'nope': 'x'}}, 400),
+    ({'template': 'plain', 'format': 'bmp'}, 400),
+    ({'nothing': 1}, 400),
+])
+def test_render_errors(server, payload, expected):
+    status, headers, body = call(server, 'POST', '/render', payload)
+    assert status == expected
+    assert 'error' in json.loads(body)
+
+
+def test_templates_and_metrics(server, dsl):
+    status, _, body = call(server, 'GET', '/templates')
+    assert json.loads(body) == {'templates': ['packed', 'plain']}
+
+    call(server, 'POST', '/render', {'template': 'plain', 'overrides': {'title': 'A'}})
+    call(server, 'POST', '/render', {'template': 'plain', 'overrides': {'title': 'A'}})
+    call(server, 'POST', '/render', {'template': 'missing'})
+
+    status, _, body = call(server, 'GET', '/metrics')
+    metrics = json.loads(body)
+    assert metrics['requests']['total'] == 3 and metrics['requests']['errors'] == 1
+    assert metrics['latency_ms']['count'] == 3 and metrics['latency_ms']['max'] > 0
+    assert metrics['template_cache'] == {'hits': 1, 'lookups': 2, 'hit_rate': 0.5}
+    assert metrics['render_cache']['hits'] == 1
+    assert metrics['queue_depth'] == 0
+
+
+def test_unknown_path_and_method(server):
+    assert call(server, 'GET', '/nope')[0] == 404
+    assert call(server, 'GET', '/render')[0] == 405
+    status, headers, _ = call(server, 'OPTIONS', '/render')
+    assert status == 204 and 'Access-Control-Allow-Origin' not in headers
+
+
+def test_cors_only_for_allowed_origins(template_dir, dsl):
+    srv, stop = start_server(template_dir=str(template_dir), allow_origins=['http://localhost:3000'])
+    try:
+        evil = {'Origin': 'https://evil.example'}
+        assert call(srv, 'OPTIONS', '/render', headers=evil)[0] == 403
+        status, headers, _ = call(srv, 'POST', '/render', {'dsl': dsl}, headers=evil)
+        assert status == 403 and 'Access-Control-Allow-Origin' not in headers
+
+        good = {'Origin': 'http://localhost:3000'}
+        status, headers, _ = call(srv, 'OPTIONS', '/render', headers=good)
+        assert status == 204 and headers['Access-Control-Allow-Origin'] == 'http://localhost:3000'
+        status, headers, _ = call(srv, 'POST', '/render', {'dsl': dsl}, headers=good)
+        assert status == 200 and headers['Vary'] == 'Origin'
+    finally:
+        stop()
+
+
+def _data_url(path):
+    import base64
+    return 'data:image/png;base64,' + base64.b64encode(path.read_bytes()).decode('ascii')
+
+
+def test_local_files_need_image_root(template_dir, dsl, tmp_path):
+    image_dir = tmp_path / 'images'
+    image_dir.mkdir()
+    Image.new('RGB', (8, 8), '#ff0000').save(image_dir / 'red.png')
+    secret = tmp_path / 'secret.png'
+    Image.new('RGB', (8, 8), '#00ff00').save(secret)
+    image_dsl = json.loads(json.dumps(dsl))
+    image_dsl['Thumbnail']['Background'] = {'type': 'image', 'imagePath': str(secret)}
+    font_dsl = json.loads(json.dumps(dsl))
+    font_dsl['Thumbnail']['Texts'][0]['font']['faces'] = [{'name': 'X', 'url': 'file:///etc/passwd'}]
+
+    srv, stop = start_server(template_dir=str(template_dir))
+    try:
+        assert call(srv, 'POST', '/render', {'template': 'plain', 'background': str(secret)})[0] == 403
+        assert call(srv, 'POST', '/render', {'dsl': image_dsl})[0] == 403
+        assert call(srv, 'POST', '/render', {'dsl': font_dsl})[0] == 403
+        assert call(srv, 'POST', '/render', {'template': 'plain', 'background': _data_url(secret)})[0] == 200
+    finally:
+        stop()
+
+    srv, stop = start_server(template_dir=str(template_dir), image_root=str(image_dir))
+    try:
+        status, _, body = call(srv, 'POST', '/render', {'template': 'plain', 'background': 'red.png'})
+        assert status == 200 and Image.open(io.BytesIO(body)).convert('RGB').getpixel((0, 0)) == (255, 0, 0)
+        assert call(srv, 'POST', '/render', {'template': 'plain', 'background': '../secret.png'})[0] == 403
+        assert call(srv, 'POST', '/render', {'dsl': image_dsl})[0] == 403
+        image_dsl['Thumbnail']['Background']['imagePath'] = 'red.png'
+        assert call(srv, 'POST', '/render', {'dsl': image_dsl})[0] == 200
+    finally:
+        stop()
+
+
+def test_inline_dsl_shares_template_across_content(dsl, monkeypatch):
+    # 워커 처리 함수를 이 프로세스에서 직접 호출 (렌더링 캐시 없음)
+    monkeypatch.setattr(http_server, '_state', None)
+    http_server._init_worker(None, None)
+    monkeypatch.setattr(http_server, 'dsl_key', lambda *args: pytest.fail('dsl_key called'))
+    for content in ('Hi', 'Hello', 'Hi'):
+        dsl['Thumbnail']['Texts'][0]['content'] = content
+        reply = http_server.render_request({'dsl': dsl})
+        assert reply.status == 200 and reply.body == ThumbnailRenderer.render_bytes(dsl)
+    reply = http_server.render_request({'dsl': dsl, 'overrides': {'title': 'Override'}})
+    dsl['Thumbnail']['Texts'][0]['content'] = 'Override'
+    assert reply.body == ThumbnailRenderer.render_bytes(dsl)
+    assert reply.template_cached and len(http_server._state.templates) == 1
+
+
+def test_request_font_hosts(dsl, monkeypatch):
+    monkeypatch.delenv(OFFLINE_ENV, raising=False)
+    dsl['Thumbnail']['Texts'][0]['font']['faces'] = [{'name': 'TestSans', 'url': 'https://Fonts.example/a.woff2'}]
+    with pytest.raises(PermissionError):
+        check_request_dsl(dsl, None)
+    with pytest.raises(PermissionError):
+        check_request_dsl(dsl, None, frozenset({'other.example'}))
+    assert check_request_dsl(dsl, None, frozenset({'fonts.example'})) is dsl
+    assert check_request_dsl(dsl, None, frozenset({'*'})) is dsl
+    # 오프라인이면 받지 않으므로 허용
+    monkeypatch.setenv(OFFLINE_ENV, '1')
+    assert check_request_dsl(dsl, None) is dsl
+
+
+def test_find_template_rejects_traversal(template_dir):
+    assert find_template(str(template_dir), 'plain').endswith('plain.json')
+    assert find_template(str(template_dir), '..') is None
+    assert find_template(str(template_dir), 'a/b') is None
+    assert find_template(None, 'plain') is None
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLI 시작 시 불필요한 모듈을 import하지 않는지 확인 (python -X importtime)
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 렌더링 CLI 시작 시 로드되면 안 되는 무거운 모듈
+HEAVY_MODULES = ('PySide6', 'httpx', 'loguru', 'requests', 'fontTools')
+
+
+def importtime(code: str) -> dict:
+    """새 인터프리터에서 code를 실행하고 {모듈: 누적 import 시간(us)} 반환"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        try:
+            modules[name.strip()] = int(cumulative)
+        except ValueError:
+            continue   # 헤더 줄
+    return modules
+
+
+@pytest.mark.parametrize('module', ['thumbnail_maker.__main__', 'thumbnail_maker.cli'])
+def test_cli_import_skips_heavy_modules(module):
+    modules = importtime(f'import {module}')
+    assert module in modules
+    loaded = sorted(m for m in modules if m.split('.')[0] in HEAVY_MODULES)
+    assert loaded == []
+
+
+def test_cli_help_runs_without_gui():
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, '-m', 'thumbnail_maker', '--help'],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert 'generate-thumbnail' in proc.stdout
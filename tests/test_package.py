@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.thl 패키지 메모리 리더 테스트
+"""
+
+import json
+import os
+import pickle
+import tempfile
+import zipfile
+
+import pytest
+
+from thumbnail_maker.cli import staged_dsl
+from thumbnail_maker.fonts import load_truetype
+from thumbnail_maker.package import is_package_uri, open_package, read_source, source_digest
+from thumbnail_maker.render_cache import normalize_dsl
+from thumbnail_maker.search_path import SearchPath
+
+
+DSL = {
+    'Thumbnail': {
+        'Resolution': {'type': 'custom', 'width': 64, 'height': 36},
+        'Background': {'type': 'solid', 'color': '#000000'},
+        'Texts': [{'type': 'title', 'content': 'Hi', 'font': {'name': 'PackSans'}, 'fontSize': 12}],
+    }
+}
+
+
+@pytest.fixture
+def thl_path(tmp_path, ttf_path):
+    path = tmp_path / 'template.thl'
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('thumbnail.json', json.dumps(DSL))
+        zf.write(ttf_path, 'fonts/PackSans-normal-normal.ttf')
+    return str(path)
+
+
+def test_open_package_reads_once_until_modified(thl_path):
+    package = open_package(thl_path)
+    assert open_package(thl_path) is package
+    assert package.dsl() == DSL
+    package.dsl()['Thumbnail'].clear()
+    assert package.dsl() == DSL
+
+    changed = dict(DSL, Extra=1)
+    with zipfile.ZipFile(thl_path, 'w') as zf:
+        zf.writestr('thumbnail.json', json.dumps(changed))
+    os.utime(thl_path, ns=(os.stat(thl_path).st_atime_ns, os.stat(thl_path).st_mtime_ns + 10 ** 9))
+    reopened = open_package(thl_path)
+    assert reopened is not package and reopened.dsl() == changed
+
+
+def test_missing_dsl_member(tmp_path):
+    path = tmp_path / 'empty.thl'
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('fonts/a.ttf', b'x')
+    with pytest.raises(FileNotFoundError):
+        open_package(str(path))
+
+
+def test_fonts_load_from_memory(thl_path, ttf_path):
+    search_path = SearchPath.of_package(open_package(thl_path))
+    uri = search_path.find_font(('PackSans-normal-normal.ttf',))
+    assert is_package_uri(uri)
+    with open(ttf_path, 'rb') as f:
+        assert read_source(uri) == f.read()
+    font = load_truetype(uri, 20)
+    assert load_truetype(uri, 20) is font
+    assert font.getbbox('Hi')[2] > 0
+    assert source_digest(uri) is not None
+    assert source_digest(search_path.resolve('fonts/missing.ttf')) is None
+    assert normalize_dsl(DSL, search_path)['texts'][0]['font'] == source_digest(uri)
+
+
+def test_staged_dsl_does_not_extract(thl_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('임시 폴더를 만들면 안 됨')
+    monkeypatch.setattr(tempfile, 'mkdtemp', fail)
+    with staged_dsl(thl_path) as (dsl, search_path):
+        assert dsl == DSL
+        assert search_path.roots == () and search_path.font_dirs() == ()
+
+
+def test_package_pickles_by_path(thl_path):
+    package = open_package(thl_path)
+    search_path = SearchPath.of_package(package)
+    assert pickle.loads(pickle.dumps(search_path)) == search_path
+    assert len(pickle.dumps(package)) < 1024
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더링 결과 캐시 테스트
+"""
+
+import json
+import os
+import shutil
+import time
+
+import pytest
+from PIL import Image
+
+from thumbnail_maker.batch import render_batch, render_variants
+from thumbnail_maker.fonts import font_resolver
+from thumbnail_maker.render_cache import RenderCache, dsl_key
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+
+@pytest.fixture
+def fonts_dir(tmp_path, ttf_path, monkeypatch):
+    directory = tmp_path / 'fonts'
+    directory.mkdir()
+    shutil.copy(ttf_path, directory / 'TestSans-normal-normal.ttf')
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(directory)))
+    font_resolver.invalidate()
+    yield directory
+    font_resolver.invalidate()
+
+
+@pytest.fixture
+def dsl(tmp_path, fonts_dir):
+    image = tmp_path / 'bg.png'
+    Image.new('RGB', (32, 32), '#336699').save(image)
+    return {
+        'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': 96, 'height': 54},
+            'Background': {'type': 'image', 'imagePath': str(image)},
+            'Texts': [
+                {'type': 'title', 'content': 'Hi', 'font': {'name': 'TestSans'}, 'fontSize': 20},
+                {'type': 'subtitle', 'content': 'off', 'enabled': False},
+            ],
+        }
+    }
+
+
+class TestCacheKey:
+    """캐시 키 계산 테스트"""
+
+    def test_stable_and_order_independent(self, dsl):
+        reordered = json.loads(json.dumps(dsl))
+        reordered['Thumbnail'] = dict(reversed(list(reordered['Thumbnail'].items())))
+        assert dsl_key(dsl) == dsl_key(reordered)
+
+    def test_image_keyed_by_content(self, dsl, tmp_path):
+        copy_path = tmp_path / 'copy.png'
+        shutil.copy(dsl['Thumbnail']['Background']['imagePath'], copy_path)
+        moved = json.loads(json.dumps(dsl))
+        moved['Thumbnail']['Background']['imagePath'] = str(copy_path)
+        assert dsl_key(dsl) == dsl_key(moved)
+
+        Image.new('RGB', (32, 32), '#000000').save(copy_path)
+        assert dsl_key(dsl) != dsl_key(moved)
+
+    def test_disabled_text_ignored(self, dsl):
+        changed = json.loads(json.dumps(dsl))
+        changed['Thumbnail']['Texts'][1]['content'] = 'still off'
+        assert dsl_key(dsl) == dsl_key(changed)
+        changed['Thumbnail']['Texts'][0]['content'] = 'Ho'
+        assert dsl_key(dsl) != dsl_key(changed)
+
+    def test_font_content_is_part_of_key(self, dsl, fonts_dir, ttf_path):
+        before = dsl_key(dsl)
+        font_file = fonts_dir / 'TestSans-normal-normal.ttf'
+        font_file.write_bytes(font_file.read_bytes() + b'\0')
+        assert dsl_key(dsl) != before
+
+
+class TestRenderCache:
+    """캐시 저장/적중/삭제 테스트"""
+
+    def test_hit_skips_rendering(self, dsl, tmp_path, monkeypatch):
+        cache = RenderCache(str(tmp_path / 'cache'))
+        first, second = tmp_path / 'a.png', tmp_path / 'b.png'
+        ThumbnailRenderer.render_thumbnail(dsl, str(first), cache=cache)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('캐시 적중인데 렌더링함')
+
+        monkeypatch.setattr(ThumbnailRenderer, 'render_bytes', staticmethod(fail))
+        ThumbnailRenderer.render_thumbnail(dsl, str(second), cache=cache)
+        assert second.read_bytes() == first.read_bytes()
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+    def test_uncached_write_does_not_corrupt_cache(self, dsl, tmp_path):
+        cache = RenderCache(str(tmp_path / 'cache'))
+        output = tmp_path / 'out.png'
+        ThumbnailRenderer.render_thumbnail(dsl, str(output), cache=cache)
+        cached_path = cache.path_for(dsl_key(dsl))
+        original = open(cached_path, 'rb').read()
+
+        changed = json.loads(json.dumps(dsl))
+        changed['Thumbnail']['Texts'][0]['content'] = 'Other'
+        ThumbnailRenderer.render_thumbnail(changed, str(output))
+        assert open(cached_path, 'rb').read() == original
+        assert output.read_bytes() != original
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = RenderCache(str(tmp_path / 'cache'), max_bytes=350)
+        for i, key in enumerate(['a' * 64, 'b' * 64, 'c' * 64]):
+            path = cache.store(key, b'x' * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+        # 'a'를 최근에 사용
+        assert cache.fetch('a' * 64, str(tmp_path / 'used.png'))
+        cache.store('d' * 64, b'x' * 100)
+        remaining = sorted(name[0] for _, _, names in os.walk(cache.directory) for name in names)
+        assert remaining == ['a', 'c', 'd']
+
+    def test_store_keeps_new_entry(self, tmp_path):
+        cache = RenderCache(str(tmp_path / 'cache'), max_bytes=100)
+        old = cache.store('a' * 64, b'x' * 50)
+        # 기존 항목의 mtime이 더 늦어도(시각 해상도가 낮은 파일 시스템 등) 방금 저장한 결과는 지우지 않는다
+        future = time.time() + 10000
+        os.utime(old, (future, future))
+        output = tmp_path / 'out.png'
+        cache.save('b' * 64, str(output), b'y' * 60)
+        assert output.read_bytes() == b'y' * 60
+        assert os.path.exists(cache.path_for('b' * 64)) and not os.path.exists(old)
+
+        # 한도보다 큰 결과는 캐시에 넣지 않고 출력 파일에 바로 쓴다
+        output = tmp_path / 'big.png'
+        cache.save('d' * 64, str(output), b'w' * 150)
+        assert output.read_bytes() == b'w' * 150
+        assert not os.path.exists(cache.path_for('d' * 64))
+
+    def test_evicts_below_limit(self, tmp_path, monkeypatch):
+        cache = RenderCache(str(tmp_path / 'cache'), max_bytes=1000)
+        for i in range(11):
+            os.utime(cache.store(f'{i:02d}' * 32, b'x' * 100), (1000 + i, 1000 + i))
+        # 한도를 넘으면 90%까지 비운다
+        assert sum(len(names) for _, _, names in os.walk(cache.directory)) == 9
+
+        # 여유가 생겼으므로 다음 저장은 디렉토리를 다시 훑지 않는다
+        monkeypatch.setattr(cache, 'evict', lambda: pytest.fail('evict called'))
+        cache.store('f' * 64, b'x' * 100)
+
+
+def test_batch_and_variants_use_cache(dsl, tmp_path, monkeypatch):
+    template = tmp_path / 'template.json'
+    template.write_text(json.dumps(dsl), encoding='utf-8')
+    data = tmp_path / 'rows.csv'
+    data.write_text('title\nA\nLonger\n', encoding='utf-8')
+    cache = RenderCache(str(tmp_path / 'cache'))
+    monkeypatch.chdir(tmp_path)
+
+    for expected in (False, True):
+        results = list(render_batch([str(template)], str(tmp_path / 'out'), jobs=1, cache=cache))
+        assert [(r.ok, r.cached) for r in results] == [(True, expected)]
+        results = list(render_variants(str(template), str(data), 'v/{n}.png', jobs=1, cache=cache))
+        assert [(r.ok, r.cached) for r in results] == [(True, expected), (True, expected)]
+
+    assert (tmp_path / 'v' / '1.png').read_bytes() != (tmp_path / 'v' / '2.png').read_bytes()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더러 텍스트 그리기 및 렌더링 API 테스트
+"""
+
+import io
+
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from thumbnail_maker.renderer import ThumbnailRenderer
+
+
+@pytest.fixture
+def font():
+    """테스트용 기본 FreeType 폰트"""
+    return ImageFont.load_default(size=32)
+
+
+def _draw(font, outline, size=(300, 100)):
+    img = Image.new('L', size, 0)
+    draw = ImageDraw.Draw(img)
+    ThumbnailRenderer.draw_text_with_outline(draw, 'Hi', (20, 20), font, 255, outline)
+    return img
+
+
+class TestOutline:
+    """외곽선 렌더링 테스트"""
+
+    def test_square_join_matches_offset_footprint(self, font):
+        """square 외곽선은 기존 (dx, dy) 오프셋 방식과 같은 영역을 덮는다"""
+        thickness = 4
+        img = _draw(font, {'thickness': thickness, 'color': 255, 'join': 'square'})
+
+        expected = Image.new('L', img.size, 0)
+        draw = ImageDraw.Draw(expected)
+        for dx in range(-thickness, thickness + 1):
+            for dy in range(-thickness, thickness + 1):
+                draw.text((20 + dx, 20 + dy), 'Hi', font=font, fill=255)
+
+        assert img.getbbox() == expected.getbbox()
+
+    def test_default_join_is_square(self, font):
+        a = _draw(font, {'thickness': 3, 'color': 255})
+        b = _draw(font, {'thickness': 3, 'color': 255, 'join': 'square'})
+        assert a.tobytes() == b.tobytes()
+
+    def test_round_join_uses_stroke(self, font):
+        img = _draw(font, {'thickness': 3, 'color': 255, 'join': 'round'})
+        plain = _draw(font, None)
+        left, top, right, bottom = plain.getbbox()
+        assert img.getbbox() == (left - 3, top - 3, right + 3, bottom + 3)
+
+    def test_no_outline_when_thickness_zero(self, font):
+        assert _draw(font, {'thickness': 0, 'color': 255}).tobytes() == _draw(font, None).tobytes()
+
+
+class TestInMemoryRender:
+    """메모리 렌더링 API 테스트"""
+
+    @pytest.fixture
+    def dsl(self):
+        return {
+            'Thumbnail': {
+                'Resolution': {'type': 'custom', 'width': 320, 'height': 180},
+                'Background': {'type': 'solid', 'color': '#123456'},
+                'Texts': [],
+            }
+        }
+
+    def test_render_image(self, dsl):
+        img = ThumbnailRenderer.render_image(dsl)
+        assert img.size == (320, 180)
+        assert img.mode == 'RGB'
+        assert img.getpixel((0, 0)) == (0x12, 0x34, 0x56)
+
+    def test_render_bytes_formats(self, dsl):
+        png = ThumbnailRenderer.render_bytes(dsl)
+        assert png[:8] == b'\x89PNG\r\n\x1a\n'
+        jpeg = ThumbnailRenderer.render_bytes(dsl, 'JPEG', quality=80)
+        assert jpeg[:2] == b'\xff\xd8'
+        assert Image.open(io.BytesIO(jpeg)).size == (320, 180)
+
+    def test_render_thumbnail_writes_same_image(self, dsl, tmp_path):
+        output = tmp_path / 'out.png'
+        ThumbnailRenderer.render_thumbnail(dsl, str(output))
+        assert output.read_bytes() == ThumbnailRenderer.render_bytes(dsl)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상대 경로 해석 기준(SearchPath) 테스트 - os.chdir 없이 .thl 패키지 렌더링
+"""
+
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from thumbnail_maker.cli import staged_dsl
+from thumbnail_maker.fonts import font_resolver
+from thumbnail_maker.renderer import ThumbnailRenderer
+from thumbnail_maker.search_path import CWD, SearchPath
+
+
+class TestSearchPath:
+    """경로 해석 규칙"""
+
+    def test_cwd_keeps_paths(self):
+        assert CWD.resolve('bg.png') == 'bg.png'
+        assert CWD.font_dirs() == ('fonts',)
+
+    def test_resolve_prefers_existing_root(self, tmp_path):
+        first, second = tmp_path / 'a', tmp_path / 'b'
+        first.mkdir()
+        second.mkdir()
+        (second / 'bg.png').write_bytes(b'x')
+        search_path = SearchPath.of(str(first), str(second))
+        assert search_path.resolve('bg.png') == str(second / 'bg.png')
+        assert search_path.resolve('missing.png') == str(first / 'missing.png')
+        assert search_path.font_dirs() == (str(first / 'fonts'), str(second / 'fonts'))
+
+    def test_absolute_and_data_url_unchanged(self, tmp_path):
+        search_path = SearchPath.of(str(tmp_path))
+        assert search_path.resolve('/abs/bg.png') == '/abs/bg.png'
+        assert search_path.resolve('data:image/png;base64,AAAA') == 'data:image/png;base64,AAAA'
+        assert search_path.resolve('') == ''
+
+
+@pytest.fixture
+def empty_fonts_dir(tmp_path, monkeypatch):
+    # 패키지 fonts/ 폴더에서만 폰트를 찾도록 공용 폰트 디렉토리는 비워 둔다
+    directory = tmp_path / 'shared_fonts'
+    directory.mkdir()
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(directory)))
+    font_resolver.invalidate()
+    yield directory
+    font_resolver.invalidate()
+
+
+def make_package(path, ttf_path, color):
+    dsl = {
+        'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': 64, 'height': 36},
+            'Background': {'type': 'image', 'imagePath': 'images/bg.png'},
+            'Texts': [{'type': 'title', 'content': 'Hi', 'font': {'name': 'PackSans'}, 'fontSize': 12,
+                       'gridPosition': 'br'}],
+        }
+    }
+    buf = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buf, 'PNG')
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('thumbnail.json', json.dumps(dsl))
+        zf.writestr('images/bg.png', buf.getvalue())
+        zf.write(ttf_path, 'fonts/PackSans-normal-normal.ttf')
+
+
+def test_packages_render_concurrently_without_chdir(tmp_path, ttf_path, empty_fonts_dir):
+    colors = {'red': (255, 0, 0), 'blue': (0, 0, 255)}
+    for name, color in colors.items():
+        make_package(str(tmp_path / f'{name}.thl'), ttf_path, color)
+    cwd = os.getcwd()
+
+    def render(name):
+        with staged_dsl(str(tmp_path / f'{name}.thl')) as (dsl, search_path):
+            assert ThumbnailRenderer.find_font_path('PackSans', search_path=search_path)
+            img = ThumbnailRenderer.render_image(dsl, search_path=search_path)
+        return name, img.getpixel((0, 0))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(render, ['red', 'blue'] * 8))
+
+    assert all(pixel == colors[name] for name, pixel in results)
+    assert os.getcwd() == cwd
+    # 패키지 폴더가 기준일 뿐, 작업 디렉토리의 fonts/에서 찾지는 않는다
+    assert ThumbnailRenderer.find_font_path('PackSans') is None
+
+
+def test_staged_dsl_json_uses_cwd(tmp_path, monkeypatch):
+    (tmp_path / 'thumbnail.json').write_text('{"Thumbnail": {}}', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    with staged_dsl('thumbnail.json') as (dsl, search_path):
+        assert dsl == {'Thumbnail': {}}
+        assert search_path == SearchPath.of(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        with staged_dsl('missing.json'):
+            pass
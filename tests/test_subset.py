@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.thl 패키지용 폰트 서브셋 테스트
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+from fontTools.ttLib import TTFont
+from PIL import ImageFont
+
+from thumbnail_maker.fonts import font_resolver, install_package_fonts
+from thumbnail_maker.package import is_package_uri, open_package
+from thumbnail_maker.renderer import ThumbnailRenderer
+from thumbnail_maker.search_path import SearchPath
+from thumbnail_maker.subset import CHARSETS, SUBSET_INFIX, charset_text, dsl_text, subset_font, subset_font_name
+
+
+@pytest.fixture
+def font_bytes(ttf_path):
+    with open(ttf_path, 'rb') as f:
+        return f.read()
+
+
+def _codepoints(data):
+    return set(TTFont(io.BytesIO(data)).getBestCmap())
+
+
+def test_charset_text():
+    assert charset_text('') == ''
+    assert charset_text('ascii') == CHARSETS['ascii']
+    assert len(charset_text('ascii, Hangul')) == 95 + 11172
+    with pytest.raises(ValueError):
+        charset_text('ascii,klingon')
+
+
+def test_dsl_text():
+    dsl = {'Thumbnail': {'Texts': [{'content': '제목'}, {'content': 'Sub\ntitle'}, {}]}}
+    assert dsl_text(dsl) == '제목Sub\ntitle'
+    assert dsl_text({}) == ''
+
+
+def test_subset_keeps_only_needed_glyphs(font_bytes):
+    data, ext = subset_font(font_bytes, '썸네일' + charset_text('ascii'))
+    assert ext == '.ttf'
+    kept = _codepoints(data)
+    assert {ord(c) for c in '썸네일AZ '} <= kept
+    assert ord('가') not in kept and ord('한') not in kept
+    assert len(data) < len(font_bytes)
+
+    font = ImageFont.truetype(io.BytesIO(data), 20)
+    assert font.getbbox('썸네일')[2] > 0
+
+
+def test_subset_accepts_woff(font_bytes):
+    font = TTFont(io.BytesIO(font_bytes), recalcTimestamp=False)
+    font.flavor = 'woff'
+    woff = io.BytesIO()
+    font.save(woff)
+    data, ext = subset_font(woff.getvalue(), '제목')
+    assert ext == '.ttf' and data[:4] == b'\x00\x01\x00\x00'
+    assert _codepoints(data) == {ord('제'), ord('목')}
+
+
+def test_subset_package_does_not_replace_full_font(tmp_path, font_bytes, monkeypatch):
+    fonts_dir = tmp_path / 'fonts'
+    fonts_dir.mkdir()
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(fonts_dir)))
+    full_path = fonts_dir / 'TestSans-normal-normal.ttf'
+    full_path.write_bytes(font_bytes)
+
+    data, ext = subset_font(font_bytes, '제목')
+    subset_name = subset_font_name('TestSans-normal-normal', data, ext)
+    assert SUBSET_INFIX in subset_name
+    thl = tmp_path / 'subset.thl'
+    with zipfile.ZipFile(thl, 'w') as zf:
+        zf.writestr('thumbnail.json', json.dumps({'Thumbnail': {'Texts': [{'content': '제목'}]}}))
+        zf.writestr('fonts/' + subset_name, data)
+    package = open_package(str(thl))
+
+    font_resolver.invalidate()
+    try:
+        assert install_package_fonts(package, str(fonts_dir)) == [subset_name]
+        assert install_package_fonts(package, str(fonts_dir)) == []
+        assert full_path.read_bytes() == font_bytes
+        # 전체 폰트가 있으면 전체 폰트를 쓴다
+        assert ThumbnailRenderer.find_font_path('TestSans') == str(full_path)
+
+        # 전체 폰트가 없을 때만 서브셋 폰트로 대신한다
+        full_path.unlink()
+        font_resolver.invalidate()
+        assert ThumbnailRenderer.find_font_path('TestSans') == str(fonts_dir / subset_name)
+        (fonts_dir / subset_name).unlink()
+        font_resolver.invalidate()
+        uri = ThumbnailRenderer.find_font_path('TestSans', search_path=SearchPath.of_package(package))
+        assert is_package_uri(uri) and uri.endswith(subset_name)
+    finally:
+        font_resolver.invalidate()
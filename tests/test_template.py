@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컴파일된 템플릿(Template) 테스트
+"""
+
+import copy
+import shutil
+
+import pytest
+from PIL import Image
+
+from thumbnail_maker.fonts import font_resolver
+from thumbnail_maker.renderer import ThumbnailRenderer
+from thumbnail_maker.template import Template
+
+
+@pytest.fixture
+def dsl(tmp_path, ttf_path, monkeypatch):
+    fonts_dir = tmp_path / 'fonts'
+    fonts_dir.mkdir()
+    shutil.copy(ttf_path, fonts_dir / 'TestSans-normal-normal.ttf')
+    monkeypatch.setattr(ThumbnailRenderer, '_fonts_dir', staticmethod(lambda: str(fonts_dir)))
+    font_resolver.invalidate()
+    yield {
+        'Thumbnail': {
+            'Resolution': {'type': 'custom', 'width': 480, 'height': 270},
+            'Background': {'type': 'solid', 'color': '#202020'},
+            'Texts': [
+                {
+                    'type': 'title', 'content': 'Hello', 'font': {'name': 'TestSans'},
+                    'gridPosition': 'mc', 'fontSize': 60, 'color': '#ffffff',
+                    'outline': {'color': '#000000', 'thickness': 0},
+                },
+                {
+                    'type': 'subtitle', 'content': 'World', 'font': {'name': 'TestSans'},
+                    'gridPosition': 'bl', 'fontSize': 30, 'color': 'red',
+                },
+            ],
+        }
+    }
+    font_resolver.invalidate()
+
+
+def test_render_matches_render_image(dsl):
+    template = ThumbnailRenderer.compile(dsl)
+    assert template.render().tobytes() == ThumbnailRenderer.render_image(dsl).tobytes()
+
+
+def test_overrides_by_type_and_index(dsl):
+    template = ThumbnailRenderer.compile(dsl)
+    changed = copy.deepcopy(dsl)
+    changed['Thumbnail']['Texts'][0]['content'] = 'Other'
+    changed['Thumbnail']['Texts'][1]['content'] = 'Line'
+    expected = ThumbnailRenderer.render_image(changed).tobytes()
+
+    assert template.render({'title': 'Other', 1: 'Line'}).tobytes() == expected
+    # 원본 템플릿 내용은 그대로
+    assert template.render().tobytes() != expected
+
+
+def test_unknown_override_key(dsl):
+    with pytest.raises(KeyError):
+        ThumbnailRenderer.compile(dsl).render({'caption': 'x'})
+
+
+def test_immutable_and_slotted(dsl):
+    template = ThumbnailRenderer.compile(dsl)
+    assert isinstance(template, Template)
+    assert not hasattr(template, '__dict__')
+    with pytest.raises(AttributeError):
+        template.width = 10
+    with pytest.raises(AttributeError):
+        template.texts[0].content = 'x'
+
+
+def test_compile_does_not_mutate_dsl(dsl):
+    before = copy.deepcopy(dsl)
+    template = ThumbnailRenderer.compile(dsl)
+    assert dsl == before
+    assert template.texts[0].outline['thickness'] == ThumbnailRenderer.DEFAULT_OUTLINE_THICKNESS
+    assert template.texts[1].fill == (255, 0, 0)
+
+
+def test_render_does_no_setup(dsl, monkeypatch):
+    template = ThumbnailRenderer.compile(dsl)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('render 중 DSL 해석이 일어남')
+
+    for name in ('ensure_fonts', 'resolve_font', 'render_background', 'get_resolution'):
+        monkeypatch.setattr(ThumbnailRenderer, name, staticmethod(fail))
+    img = template.render({'title': 'Fast'})
+    assert img.size == (480, 270)
+
+
+def test_style_overrides_match_dsl(dsl):
+    template = ThumbnailRenderer.compile(dsl)
+    changed = copy.deepcopy(dsl)
+    changed['Thumbnail']['Texts'][0].update(content='Big', color='#00ff00', fontSize=90)
+    expected = ThumbnailRenderer.render_image(changed).tobytes()
+    assert template.render({'title': {'content': 'Big', 'color': '#00ff00', 'fontSize': 90}}).tobytes() == expected
+
+
+def test_background_override(dsl, tmp_path):
+    image = tmp_path / 'bg.png'
+    Image.new('RGB', (40, 40), '#3366cc').save(image)
+    template = ThumbnailRenderer.compile(dsl)
+    img = template.render(background=str(image))
+    assert img.getpixel((2, 2)) == (0x33, 0x66, 0xcc)
+    # 템플릿 기본 배경은 그대로
+    assert template.render().getpixel((2, 2)) == (0x20, 0x20, 0x20)
+    with pytest.raises(FileNotFoundError):
+        template.render(background=str(tmp_path / 'none.png'))
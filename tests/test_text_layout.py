@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+텍스트 줄바꿈 엔진 테스트
+"""
+
+import pytest
+from PIL import ImageFont
+
+from thumbnail_maker.text_layout import line_break_opportunities, text_length, wrap_unicode, wrap_words
+
+
+@pytest.fixture
+def font(ttf_path):
+    # 테스트 폰트: ASCII 글자 폭 600/1000em, 공백 250/1000em -> 크기 100에서 60px / 25px
+    return ImageFont.truetype(ttf_path, 100)
+
+
+class TestWrapWords:
+    """단어 단위 줄바꿈 테스트"""
+
+    def test_empty(self, font):
+        assert wrap_words('', font, 100) == ['']
+
+    def test_fits_on_one_line(self, font):
+        assert wrap_words('ab cd', font, 1000) == ['ab cd']
+
+    def test_breaks_at_width(self, font):
+        # 'abc def' = 180 + 25 + 180 = 385px
+        assert wrap_words('abc def ghi', font, 400) == ['abc def', 'ghi']
+        assert wrap_words('abc def ghi', font, 380) == ['abc', 'def', 'ghi']
+
+    def test_long_word_is_not_split(self, font):
+        assert wrap_words('abcdefghij xy', font, 300) == ['abcdefghij', 'xy']
+
+    def test_consecutive_spaces(self, font):
+        # 기존 wrap_line_by_words와 같은 결과: 줄바꿈 뒤 빈 단어로 줄을 시작하지 않는다
+        assert wrap_words('hello  world', font, 310) == ['hello', 'world']
+        assert wrap_words('a b  c d', font, 160) == ['a b', 'c d']
+        assert wrap_words(' a', font, 1000) == ['a']
+        assert wrap_words('a  b', font, 1000) == ['a  b']
+
+    def test_measurements_are_memoized(self, font):
+        text_length.cache_clear()
+        wrap_words('aa bb aa bb aa bb', font, 10000)
+        info = text_length.cache_info()
+        # 'aa', 'bb', ' '만 측정된다
+        assert info.misses == 3
+        assert info.hits == 4
+
+
+class TestWrapUnicode:
+    """유니코드 줄바꿈 테스트"""
+
+    def test_hangul_without_spaces_breaks_per_character(self, font):
+        # 한글 글자 폭 1000/1000em -> 크기 100에서 100px
+        lines = wrap_unicode('가나다라마바', font, 250)
+        assert lines == ['가나', '다라', '마바']
+
+    def test_latin_words_are_kept_together(self, font):
+        assert wrap_unicode('abc def ghi', font, 400) == ['abc def', 'ghi']
+
+    def test_trailing_space_hangs(self, font):
+        # 'abc def' 뒤 공백은 폭 계산에서 제외된다
+        assert wrap_unicode('abc def ghi', font, 385) == ['abc def', 'ghi']
+
+    def test_closing_punctuation_not_at_line_start(self, font):
+        lines = wrap_unicode('가나다.', font, 300)
+        assert lines == ['가나', '다.']
+
+    def test_overlong_word_is_force_split(self, font):
+        # 나눌 지점이 없는 긴 단어: 60px 글자 4개씩
+        assert wrap_unicode('abcdefgh', font, 250) == ['abcd', 'efgh']
+
+    def test_break_opportunities(self):
+        assert line_break_opportunities('ab cd') == [3]
+        assert line_break_opportunities('가나') == [1]
+        assert line_break_opportunities('(가)') == []
+        assert line_break_opportunities('well-known') == [5]
+        assert line_break_opportunities('2024-01') == []
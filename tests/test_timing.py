@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+단계별 시간 측정 테스트
+"""
+
+import json
+import sys
+
+from thumbnail_maker.cli import main_cli
+from thumbnail_maker.renderer import ThumbnailRenderer
+from thumbnail_maker.timing import Timings
+
+
+DSL = {
+    'Thumbnail': {
+        'Resolution': {'type': 'custom', 'width': 160, 'height': 90},
+        'Background': {'type': 'gradient', 'colors': ['#ffffff', '#000000']},
+        'Texts': [
+            {'type': 'title', 'content': 'Hello world', 'wordWrap': True, 'fontSize': 20,
+             'outline': {'color': '#000000', 'thickness': 2}},
+            {'type': 'subtitle', 'content': 'sub', 'gridPosition': 'br', 'fontSize': 12},
+        ],
+    }
+}
+
+
+def test_stage_accumulates():
+    timings = Timings()
+    with timings.stage('layout'):
+        pass
+    with timings.stage('layout'):
+        pass
+    with timings.stage('encode'):
+        pass
+    assert list(timings.as_dict()) == ['layout', 'encode']
+    assert timings.total() == sum(timings.stages.values())
+    assert 'total' in timings.format()
+
+
+def test_render_records_each_stage(tmp_path):
+    timings = Timings()
+    ThumbnailRenderer.render_thumbnail(DSL, str(tmp_path / 'out.png'), timings=timings)
+    assert set(timings.stages) >= {
+        'resolution', 'background', 'ensure_fonts', 'font_load', 'canvas', 'layout', 'outline', 'text', 'encode'
+    }
+    assert all(seconds >= 0 for seconds in timings.stages.values())
+
+
+def test_genthumb_timings_flag(tmp_path, monkeypatch, capsys):
+    dsl_path = tmp_path / 'dsl.json'
+    dsl_path.write_text(json.dumps(DSL), encoding='utf-8')
+    monkeypatch.setattr(sys, 'argv', ['genthumb', str(dsl_path), '-o', str(tmp_path / 'out.png'), '--timings'])
+    main_cli()
+    out = capsys.readouterr().out
+    assert '단계별 소요 시간' in out
+    assert 'encode' in out and 'total' in out
@@ -1,16 +1,47 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-thumbnail_maker: 단일 엔트리포인트 (subcommands: gui, generate-thumbnail, genthumb, upload)
+thumbnail_maker: 단일 엔트리포인트 (subcommands: gui, generate-thumbnail, genthumb, batch, variants, serve, serve-http, upload)
 """
 
 import sys
 import argparse
 import os
 
-from .gui import main as gui_main
-from .cli import main as generate_main, main_cli as genthumb_main, generate_thumbnail_from_args
-from .upload import upload_file
+# gui(PySide6)와 upload(httpx, loguru)는 해당 명령을 실행할 때만 import한다
+# (셸 스크립트에서 작업마다 호출되는 CLI의 시작 시간 단축)
+from .cli import (
+    main as generate_main,
+    main_cli as genthumb_main,
+    generate_thumbnail_from_args,
+    batch_from_args,
+    variants_from_args,
+    add_cache_arguments,
+    add_timings_argument,
+    add_daemon_argument,
+    add_font_arguments,
+    apply_font_arguments,
+)
+
+
+def upload_output(output_path: str) -> None:
+    """파일 업로드 - upload 명령과 생성 후 --upload에서 사용 (실패 시 종료 코드 1)"""
+    from .upload import upload_file
+
+    if not os.path.isabs(output_path):
+        output_path = os.path.abspath(output_path)
+
+    if not os.path.exists(output_path):
+        print(f"오류: 파일을 찾을 수 없습니다: {output_path}")
+        sys.exit(1)
+
+    print(f"업로드 중: {output_path}")
+    url = upload_file(output_path)
+    if url:
+        print(f"✅ 업로드 완료: {url}")
+    else:
+        print("❌ 업로드 실패")
+        sys.exit(1)
 
 
 def main() -> None:
@@ -65,6 +96,10 @@ def main() -> None:
     gen.add_argument('-sfsz', '--subtitle-font-size', type=int, help='부제목 폰트 크기')
     gen.add_argument('-sc', '--subtitle-color', help='부제목 색상 (hex)')
     gen.add_argument('-sww', '--subtitle-word-wrap', action='store_true', help='부제목 단어 단위 줄바꿈')
+    add_cache_arguments(gen)
+    add_timings_argument(gen)
+    add_daemon_argument(gen)
+    add_font_arguments(gen)
 
     # genthumb (간편 CLI: 제목/부제목 덮어쓰기 등)
     gt = subparsers.add_parser('genthumb', help='간편 CLI로 썸네일 생성')
@@ -75,14 +110,68 @@ def main() -> None:
     gt.add_argument('--subtitle', help='부제목 덮어쓰기 (\\n 또는 실제 줄바꿈 지원)')
     gt.add_argument('-b', '--background-image', dest='bgImg', help='배경 이미지 경로')
     gt.add_argument('-u', '--upload', action='store_true', help='생성 후 자동 업로드')
+    add_cache_arguments(gt)
+    add_timings_argument(gt)
+    add_daemon_argument(gt)
+    add_font_arguments(gt)
     
+    # batch (여러 DSL/.thl 일괄 생성)
+    batch = subparsers.add_parser('batch', help='여러 DSL/.thl 파일을 병렬로 일괄 생성')
+    batch.add_argument('inputs', nargs='*', help='DSL/.thl 파일 경로 또는 glob 패턴 (예: "templates/**/*.thl")')
+    batch.add_argument('-m', '--manifest', help='입력 파일 목록 (한 줄에 경로 하나)')
+    batch.add_argument('-d', '--output-dir', default='.', help='출력 폴더 (파일명: <입력 이름>.png)')
+    batch.add_argument('-j', '--jobs', type=int, help='워커 프로세스 수 (기본: CPU 수)')
+    batch.add_argument('--chunksize', type=int, help='워커에 한 번에 넘길 항목 수 (기본: 자동)')
+    batch.add_argument('--json', action='store_true', help='항목별 결과를 JSON lines로 출력')
+    add_cache_arguments(batch)
+    add_timings_argument(batch)
+    add_font_arguments(batch)
+
+    # variants (템플릿 하나 + 데이터 행별 생성)
+    variants = subparsers.add_parser('variants', help='템플릿 하나에 CSV/JSONL 행을 적용해 여러 장 생성')
+    variants.add_argument('template', help='템플릿 파일 경로 (.json 또는 .thl)')
+    variants.add_argument('data', help='데이터 파일 경로 (.csv 또는 .jsonl)')
+    variants.add_argument('-o', '--output-pattern', default='{n:05d}.png',
+                          help='출력 경로 패턴 (행의 열 이름과 {n}=행 번호 사용, 예: "out/{episode}_{n}.png")')
+    variants.add_argument('-j', '--jobs', type=int, help='워커 프로세스 수 (기본: CPU 수)')
+    variants.add_argument('--chunksize', type=int, default=16, help='워커에 한 번에 넘길 행 수')
+    variants.add_argument('--json', action='store_true', help='행별 결과를 JSON lines로 출력')
+    add_cache_arguments(variants)
+    add_timings_argument(variants)
+    add_font_arguments(variants)
+
+    # serve (렌더링 데몬)
+    serve = subparsers.add_parser('serve', help='폰트/템플릿 캐시를 유지하는 렌더링 데몬 실행 (Unix 소켓)')
+    serve.add_argument('--socket', default=os.environ.get('THUMBNAIL_MAKER_DAEMON'),
+                       help='소켓 경로 (기본: 환경 변수 THUMBNAIL_MAKER_DAEMON)')
+    add_font_arguments(serve)
+
+    # serve-http (HTTP 렌더링 서비스)
+    http = subparsers.add_parser('serve-http', help='HTTP 렌더링 서비스 실행 (POST /render, GET /metrics)')
+    http.add_argument('--host', default='127.0.0.1', help='바인딩 주소 (기본: 127.0.0.1, 로컬 전용)')
+    http.add_argument('--port', type=int, default=8765, help='포트 (기본: 8765)')
+    http.add_argument('-j', '--jobs', type=int, help='워커 프로세스 수 (기본: CPU 수)')
+    http.add_argument('--templates', help='템플릿 폴더 (.thl/.json, 요청에서 {"template": "<파일 이름>"}으로 사용)')
+    http.add_argument('--allow-origin', action='append', default=[], metavar='ORIGIN',
+                      help='CORS를 허용할 브라우저 Origin (반복 가능, 예: http://localhost:3000, 파일로 연 페이지는 null). '
+                           '지정하지 않으면 다른 Origin의 브라우저 요청은 거절')
+    http.add_argument('--image-root', metavar='DIR',
+                      help='요청의 배경 이미지 경로를 허용할 폴더 (지정하지 않으면 data URL만 허용)')
+    http.add_argument('--allow-font-host', action='append', default=[], metavar='HOST',
+                      help='요청 DSL의 웹 폰트를 받을 호스트 (반복 가능, 예: fonts.gstatic.com, *는 모두 허용). '
+                           '지정하지 않으면 폰트 URL이 있는 요청은 거절 (--offline이면 이미 있는 폰트만 사용)')
+    add_cache_arguments(http)
+    add_font_arguments(http)
+
     # upload
     upload_parser = subparsers.add_parser('upload', help='이미지 파일 업로드')
     upload_parser.add_argument('file', help='업로드할 파일 경로')
 
     args, unknown = parser.parse_known_args()
+    apply_font_arguments(args)
 
     if args.command == 'gui':
+        from .gui import main as gui_main
         gui_main()
         return
 
@@ -92,21 +181,7 @@ def main() -> None:
         
         # 업로드 옵션이 있으면 업로드 수행
         if args.upload:
-            output_path = args.output
-            if not os.path.isabs(output_path):
-                output_path = os.path.abspath(output_path)
-            
-            if not os.path.exists(output_path):
-                print(f"오류: 출력 파일을 찾을 수 없습니다: {output_path}")
-                sys.exit(1)
-            
-            print(f"업로드 중: {output_path}")
-            url = upload_file(output_path)
-            if url:
-                print(f"✅ 업로드 완료: {url}")
-            else:
-                print("❌ 업로드 실패")
-                sys.exit(1)
+            upload_output(args.output)
         return
 
     if args.command == 'genthumb':
@@ -127,43 +202,66 @@ def main() -> None:
             new_argv += ['--subtitle', args.subtitle]
         if args.bgImg:
             new_argv += ['-b', args.bgImg]
+        if args.cache_dir:
+            new_argv += ['--cache-dir', args.cache_dir]
+        if args.cache_max_mb:
+            new_argv += ['--cache-max-mb', str(args.cache_max_mb)]
+        if args.timings:
+            new_argv.append('--timings')
+        if args.daemon:
+            new_argv += ['--daemon', args.daemon]
+        if args.offline:
+            new_argv.append('--offline')
+        if args.font_store:
+            new_argv += ['--font-store', args.font_store]
+        if args.font_store_max_mb:
+            new_argv += ['--font-store-max-mb', str(args.font_store_max_mb)]
         sys.argv = new_argv
         genthumb_main()
         
         # 업로드 옵션이 있으면 업로드 수행
         if args.upload:
-            output_path = args.output
-            if not os.path.isabs(output_path):
-                output_path = os.path.abspath(output_path)
-            
-            if not os.path.exists(output_path):
-                print(f"오류: 출력 파일을 찾을 수 없습니다: {output_path}")
-                sys.exit(1)
-            
-            print(f"업로드 중: {output_path}")
-            url = upload_file(output_path)
-            if url:
-                print(f"✅ 업로드 완료: {url}")
-            else:
-                print("❌ 업로드 실패")
-                sys.exit(1)
+            upload_output(args.output)
         return
     
-    if args.command == 'upload':
-        file_path = args.file
-        if not os.path.exists(file_path):
-            print(f"오류: 파일을 찾을 수 없습니다: {file_path}")
+    if args.command == 'batch':
+        batch_from_args(args)
+        return
+
+    if args.command == 'variants':
+        variants_from_args(args)
+        return
+
+    if args.command == 'serve':
+        if not args.socket:
+            print("오류: --socket 또는 환경 변수 THUMBNAIL_MAKER_DAEMON으로 소켓 경로를 지정하세요")
             sys.exit(1)
-        
-        print(f"업로드 중: {file_path}")
-        url = upload_file(file_path)
-        if url:
-            print(f"✅ 업로드 완료: {url}")
-        else:
-            print("❌ 업로드 실패")
+        from .daemon import serve as serve_daemon
+        try:
+            serve_daemon(args.socket)
+        except RuntimeError as e:
+            print(f"오류: {e}")
             sys.exit(1)
         return
 
+    if args.command == 'serve-http':
+        from .http_server import serve_http
+        from .render_cache import render_cache_from_args
+        if args.templates and not os.path.isdir(args.templates):
+            print(f"오류: 템플릿 폴더를 찾을 수 없습니다: {args.templates}")
+            sys.exit(1)
+        if args.image_root and not os.path.isdir(args.image_root):
+            print(f"오류: 이미지 폴더를 찾을 수 없습니다: {args.image_root}")
+            sys.exit(1)
+        serve_http(args.host, args.port, jobs=args.jobs, template_dir=args.templates,
+                   cache=render_cache_from_args(args), allow_origins=args.allow_origin,
+                   image_root=args.image_root, font_hosts=args.allow_font_host)
+        return
+
+    if args.command == 'upload':
+        upload_output(args.file)
+        return
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+배경 레이어 생성 - 그라디언트 엔진, 이미지 배경 레이어 캐시
+"""
+
+import base64
+import hashlib
+import io
+import math
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+from PIL import Image, ImageColor, ImageFilter
+
+from .cache import LRUCache
+from .package import is_package_uri, read_source, source_digest
+
+
+# 각도 기반 선형 그라디언트용 램프 이미지의 위/아래 여유 (경계 밖 샘플링 방지)
+_RAMP_PAD = 16
+
+Stop = Tuple[float, Tuple[int, int, int]]
+
+
+def parse_gradient_stops(colors: Sequence[Union[str, dict, list, tuple]]) -> Tuple[Stop, ...]:
+    """DSL colors 목록을 (위치, RGB) 스톱 튜플로 정규화
+
+    - 문자열: 색상만 지정, 위치는 균등 분배
+    - dict: {'color': '#ff0000', 'position': 0.3}
+    - list/tuple: ['#ff0000', 0.3]
+    """
+    if not colors:
+        colors = ['#ffffff', '#000000']
+    if len(colors) == 1:
+        colors = [colors[0], colors[0]]
+
+    count = len(colors)
+    stops: List[Stop] = []
+    for idx, entry in enumerate(colors):
+        position = None
+        if isinstance(entry, dict):
+            color = entry.get('color', '#000000')
+            position = entry.get('position')
+        elif isinstance(entry, (list, tuple)):
+            color = entry[0]
+            position = entry[1] if len(entry) > 1 else None
+        else:
+            color = entry
+        if position is None:
+            position = idx / (count - 1)
+        rgb = ImageColor.getrgb(color)[:3]
+        stops.append((min(max(float(position), 0.0), 1.0), rgb))
+
+    stops.sort(key=lambda s: s[0])
+    return tuple(stops)
+
+
+def _stops_lut(stops: Tuple[Stop, ...]) -> List[int]:
+    """0-255 위치 값을 RGB로 변환하는 point() 룩업 테이블 (R, G, B 순 768개)"""
+    channels: List[List[int]] = [[], [], []]
+    seg = 0
+    for i in range(256):
+        p = i / 255
+        while seg < len(stops) - 2 and p > stops[seg + 1][0]:
+            seg += 1
+        (p0, c0), (p1, c1) = stops[seg], stops[seg + 1]
+        if p <= p0:
+            ratio = 0.0
+        elif p >= p1:
+            ratio = 1.0
+        else:
+            ratio = (p - p0) / (p1 - p0)
+        for ch in range(3):
+            channels[ch].append(int(round(c0[ch] + (c1[ch] - c0[ch]) * ratio)))
+    return channels[0] + channels[1] + channels[2]
+
+
+def _linear_field(width: int, height: int, angle: float) -> Image.Image:
+    """CSS linear-gradient 각도 규칙(0deg=아래→위, 90deg=왼쪽→오른쪽)의 위치 맵(L)"""
+    ramp = Image.new('L', (4, 256 + 2 * _RAMP_PAD), 0)
+    ramp.paste(Image.linear_gradient('L').crop((0, 0, 4, 256)), (0, _RAMP_PAD))
+    ramp.paste(255, (0, 256 + _RAMP_PAD, 4, 256 + 2 * _RAMP_PAD))
+
+    theta = math.radians(angle)
+    sin_t, cos_t = math.sin(theta), math.cos(theta)
+    length = abs(width * sin_t) + abs(height * cos_t) or 1.0
+
+    # 출력 (x, y) -> 램프 (2, PAD + 255 * t) 로 매핑하는 아핀 변환
+    d = 255 * sin_t / length
+    e = -255 * cos_t / length
+    f = _RAMP_PAD + 255 * (0.5 - (width / 2 * sin_t - height / 2 * cos_t) / length)
+    return ramp.transform(
+        (width, height), Image.Transform.AFFINE, (0, 0, 2, d, e, f), Image.Resampling.BILINEAR
+    )
+
+
+def _radial_field(width: int, height: int) -> Image.Image:
+    """중심(0)에서 네 모서리(255)까지 퍼지는 타원형 위치 맵(L), 변의 중점은 약 181(1/√2)"""
+    # radial_gradient(256x256)는 중심 거리를 모서리 거리(128√2)로 나눈 값이라 모서리에서만 255가 된다.
+    # 캔버스 크기로 늘려도 비율이 유지되므로 CSS의 farthest-corner 타원과 같다
+    return Image.radial_gradient('L').resize((width, height), Image.Resampling.BILINEAR)
+
+
+@lru_cache(maxsize=32)
+def _gradient_image(
+    width: int,
+    height: int,
+    stops: Tuple[Stop, ...],
+    angle: float,
+    kind: str
+) -> Image.Image:
+    if kind == 'radial':
+        field = _radial_field(width, height)
+    else:
+        field = _linear_field(width, height, angle)
+    return field.convert('RGB').point(_stops_lut(stops))
+
+
+def render_gradient(
+    width: int,
+    height: int,
+    colors: Sequence[Union[str, dict, list, tuple]],
+    angle: float = 90,
+    kind: str = 'linear'
+) -> Image.Image:
+    """그라디언트 배경 이미지 생성
+
+    이미지 전체를 Pillow 내부 연산(transform/point)으로 한 번에 계산하며,
+    (크기, 스톱, 각도, 종류)별로 결과를 캐시한다. 반환 이미지는 캐시와 공유되므로
+    호출자는 수정하지 말고 paste 등으로 복사해서 사용해야 한다.
+    """
+    stops = parse_gradient_stops(colors)
+    return _gradient_image(int(width), int(height), stops, float(angle) % 360, kind)
+
+
+def clear_gradient_cache() -> None:
+    """그라디언트 캐시 비우기"""
+    _gradient_image.cache_clear()
+
+
+# ---------- 이미지 배경 ----------
+
+# 선축소 후 최종 LANCZOS 리사이즈에 남겨 둘 최소 배율 (Pillow reducing_gap과 같은 의미)
+REDUCING_GAP = 2.0
+
+# Image.reduce가 지원하는 모드 (P, 1, I;16 등은 ValueError)
+REDUCE_MODES = frozenset(('L', 'LA', 'La', 'RGB', 'RGBA', 'RGBa', 'RGBX', 'I', 'F', 'CMYK', 'PA'))
+
+
+def _image_nbytes(img: Image.Image) -> int:
+    return img.width * img.height * len(img.getbands())
+
+
+# (원본 해시, 너비, 높이, 블러, 투명도) -> 처리 완료된 배경 레이어
+image_layer_cache = LRUCache(maxsize=32, max_bytes=256 * 1024 * 1024, sizeof=_image_nbytes)
+
+
+def image_source_digest(image_path: str) -> Optional[str]:
+    """배경 이미지 원본의 내용 해시 (파일이 없으면 None)
+
+    data URL은 디코딩 없이 base64 문자열 자체를 해시한다.
+    """
+    if image_path.startswith('data:image'):
+        return hashlib.sha256(image_path.encode('ascii', 'ignore')).hexdigest()
+    return source_digest(image_path)
+
+
+def _open_image_source(image_path: str) -> Image.Image:
+    # base64 데이터 URL 처리
+    if image_path.startswith('data:image'):
+        header, encoded = image_path.split(',', 1)
+        return Image.open(io.BytesIO(base64.b64decode(encoded)))
+    # .thl 패키지 안 이미지
+    if is_package_uri(image_path):
+        return Image.open(io.BytesIO(read_source(image_path)))
+    return Image.open(image_path)
+
+
+def load_cover_image(image_path: str, width: int, height: int, fast: bool = True) -> Image.Image:
+    """원본 이미지를 (width, height) 캔버스를 덮도록(cover) 리사이즈 후 가운데를 잘라 반환
+
+    fast=True이면 최종 크기에 비례하는 메모리만 쓰도록 축소 디코딩을 먼저 한다.
+    - JPEG: Image.draft로 DCT 단계에서 1/2~1/8 축소 디코딩
+    - 그 외: Image.reduce로 정수배 선축소 (팔레트 이미지는 RGB(A)로 변환, '1'/'I;16' 등은 건너뜀)
+    이후 남은 배율(최소 REDUCING_GAP배 여유)을 LANCZOS로 마무리해 품질을 유지한다.
+    """
+    bg_img = _open_image_source(image_path)
+
+    # cover 크기 계산 (원본 비율 기준)
+    img_ratio = bg_img.width / bg_img.height
+    canvas_ratio = width / height
+    if img_ratio > canvas_ratio:
+        # 이미지가 더 넓음: 높이 기준으로 맞춤
+        new_width, new_height = int(height * img_ratio), height
+    else:
+        # 이미지가 더 높음: 너비 기준으로 맞춤
+        new_width, new_height = width, int(width / img_ratio)
+    new_width, new_height = max(new_width, 1), max(new_height, 1)
+
+    if fast:
+        min_size = (int(new_width * REDUCING_GAP), int(new_height * REDUCING_GAP))
+        if bg_img.format == 'JPEG':
+            bg_img.draft('RGB' if bg_img.mode not in ('L', 'CMYK') else bg_img.mode, min_size)
+        factor = min(bg_img.width // min_size[0], bg_img.height // min_size[1])
+        if factor >= 2 and bg_img.mode == 'P':
+            # 팔레트 이미지는 reduce를 지원하지 않으므로 RGB(A)로 풀어서 축소
+            bg_img = bg_img.convert('RGBA' if 'transparency' in bg_img.info else 'RGB')
+        if factor >= 2 and bg_img.mode in REDUCE_MODES:
+            bg_img = bg_img.reduce(factor)
+
+    bg_img = bg_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    left = (new_width - width) // 2
+    top = (new_height - height) // 2
+    return bg_img.crop((left, top, left + width, top + height))
+
+
+def _build_image_layer(
+    image_path: str,
+    width: int,
+    height: int,
+    blur: float,
+    opacity: float
+) -> Image.Image:
+    bg_img = load_cover_image(image_path, width, height)
+
+    # 블러 효과 적용
+    if blur > 0:
+        bg_img = bg_img.filter(ImageFilter.GaussianBlur(radius=blur))
+
+    # 투명도 적용
+    if opacity < 1.0:
+        if bg_img.mode not in ('RGBA', 'LA'):
+            bg_img = bg_img.convert('RGBA')
+        alpha = bg_img.split()[-1]
+        alpha = alpha.point(lambda p: int(p * opacity))
+        bg_img.putalpha(alpha)
+
+    return bg_img
+
+
+def render_image_layer(
+    image_path: str,
+    width: int,
+    height: int,
+    blur: float = 0,
+    opacity: float = 1.0
+) -> Optional[Image.Image]:
+    """이미지 배경 레이어 (cover 리사이즈 + 블러 + 투명도 적용 완료본)
+
+    원본 내용 해시와 (크기, 블러, 투명도)로 캐시하므로 같은 배경을 쓰는 반복 렌더링은
+    디코딩/리사이즈/블러를 다시 하지 않는다. 반환 이미지는 캐시와 공유되므로 수정하지 말 것.
+    원본 파일이 없으면 None.
+    """
+    digest = image_source_digest(image_path)
+    if digest is None:
+        return None
+    key = (digest, int(width), int(height), blur, opacity)
+    return image_layer_cache.get_or_create(
+        key, lambda: _build_image_layer(image_path, int(width), int(height), blur, opacity)
+    )
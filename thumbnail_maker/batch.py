@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일괄 렌더링 - 여러 DSL/.thl 파일, 또는 템플릿 하나 + 데이터 행들을 프로세스 풀에서 생성
+"""
+
+import csv
+import glob
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .cache import detach_hardlink
+from .cli import staged_dsl
+from .render_cache import RenderCache, dsl_key, open_render_cache, variant_key
+from .renderer import ThumbnailRenderer
+from .search_path import SearchPath
+from .template import Template
+from .timing import NULL_TIMINGS, Timings
+
+
+class BatchResult(NamedTuple):
+    """항목별 렌더링 결과"""
+    source: str
+    output: str
+    ok: bool
+    error: Optional[str]
+    elapsed: float
+    cached: bool = False
+    timings: Optional[Dict[str, float]] = None   # 단계별 밀리초 (timings 요청 시)
+
+
+# 워커에 넘기는 렌더링 캐시 설정 (디렉토리, 최대 바이트) - 워커에서 open_render_cache로 연다
+CacheSpec = Optional[Tuple[str, int]]
+# (입력 경로, 출력 경로, 캐시 설정, 단계별 시간 측정 여부)
+Job = Tuple[str, str, CacheSpec, bool]
+
+
+def _cache_spec(cache: Optional[RenderCache]) -> CacheSpec:
+    return (cache.directory, cache.max_bytes) if cache is not None else None
+
+
+def _open_cache(spec: CacheSpec) -> Optional[RenderCache]:
+    return open_render_cache(*spec) if spec else None
+
+
+def expand_inputs(patterns: Sequence[str], manifest: Optional[str] = None) -> List[str]:
+    """glob 패턴과 목록 파일(한 줄에 경로 하나, '#' 주석)을 입력 파일 목록으로 펼친다
+
+    목록 파일의 상대 경로는 목록 파일 위치 기준이며, 중복은 처음 한 번만 남긴다.
+    """
+    entries: List[str] = []
+    for pattern in patterns or []:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        # 패턴이 아닌 경로는 없는 파일이어도 그대로 넘겨 실패 결과로 보고한다
+        entries.extend(matches if matches or glob.has_magic(pattern) else [pattern])
+
+    if manifest:
+        base = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    entries.append(line if os.path.isabs(line) else os.path.join(base, line))
+
+    seen = set()
+    sources = []
+    for entry in entries:
+        path = os.path.abspath(entry)
+        if path not in seen:
+            seen.add(path)
+            sources.append(path)
+    return sources
+
+
+def plan_outputs(sources: Sequence[str], output_dir: str) -> List[Tuple[str, str]]:
+    """입력마다 '<파일명>.png' 출력 경로를 정한다 (같은 이름은 '-1', '-2' 접미사)"""
+    output_dir = os.path.abspath(output_dir)
+    used = set()
+    jobs = []
+    for source in sources:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        name, n = stem, 0
+        while name in used:
+            n += 1
+            name = f"{stem}-{n}"
+        used.add(name)
+        jobs.append((source, os.path.join(output_dir, name + '.png')))
+    return jobs
+
+
+def render_job(job: Job) -> BatchResult:
+    """한 항목 렌더링 (예외는 결과로 바꿔 다른 항목에 영향을 주지 않는다)"""
+    source, output, cache_spec, with_timings = job
+    timings = Timings() if with_timings else None
+    start = time.perf_counter()
+    try:
+        with staged_dsl(source) as (dsl, search_path):
+            cached = ThumbnailRenderer.render_to_file(
+                dsl, output, cache=_open_cache(cache_spec), timings=timings, search_path=search_path
+            )
+    except Exception as e:
+        return BatchResult(source, output, False, f"{type(e).__name__}: {e}", time.perf_counter() - start)
+    stages = timings.as_dict() if timings else None
+    return BatchResult(source, output, True, None, time.perf_counter() - start, cached, stages)
+
+
+def _warm_worker(source: Optional[str]) -> None:
+    """워커 초기화: 첫 입력을 컴파일해 폰트 파일 인덱스와 폰트 핸들 캐시를 미리 채운다"""
+    if not source:
+        return
+    try:
+        with staged_dsl(source) as (dsl, search_path):
+            ThumbnailRenderer.compile(dsl, search_path=search_path)
+    except Exception:
+        pass
+
+
+def _auto_chunksize(count: int, jobs: int) -> int:
+    # 워커당 4청크 정도로 나눠 부하 분산과 IPC 비용을 절충
+    return max(1, min(64, count // (jobs * 4)))
+
+
+def render_batch(
+    sources: Sequence[str],
+    output_dir: str,
+    jobs: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    cache: Optional[RenderCache] = None,
+    timings: bool = False
+) -> Iterator[BatchResult]:
+    """입력 파일들을 렌더링하며 결과를 입력 순서대로 하나씩 내보낸다
+
+    jobs: 워커 프로세스 수 (기본: CPU 수, 1이면 현재 프로세스에서 순차 실행)
+    chunksize: 워커에 한 번에 넘길 항목 수 (기본: 자동)
+    cache: 렌더링 캐시 (입력이 같은 항목은 이전 결과를 링크/복사)
+    timings: True면 항목별 단계 시간을 결과에 담는다
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    spec = _cache_spec(cache)
+    planned = [(source, output, spec, timings) for source, output in plan_outputs(sources, output_dir)]
+    if not planned:
+        return
+
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    jobs = min(jobs, len(planned))
+    warm = planned[0][0]
+
+    # 폰트 다운로드/변환은 공유 fonts 디렉토리에 쓰므로 워커 시작 전에 부모에서 한 번 처리
+    _warm_worker(warm)
+
+    if jobs == 1:
+        for job in planned:
+            yield render_job(job)
+        return
+
+    chunksize = chunksize or _auto_chunksize(len(planned), jobs)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker, initargs=(warm,)) as executor:
+        yield from imap_chunked(executor, _render_chunk, planned, chunksize, window=jobs * 2)
+
+
+def _render_chunk(chunk: List[Job]) -> List[BatchResult]:
+    return [render_job(job) for job in chunk]
+
+
+def imap_chunked(
+    executor: Executor,
+    fn: Callable[[List[Any]], List[Any]],
+    items: Iterable[Any],
+    chunksize: int,
+    window: int
+) -> Iterator[Any]:
+    """items를 chunksize개씩 묶어 fn(chunk)로 넘기고 결과를 입력 순서대로 하나씩 내보낸다
+
+    실행 중인 청크를 window개로 제한하므로 입력이 아무리 많아도(스트리밍 입력 포함)
+    메모리에 올라가는 항목은 window * chunksize개를 넘지 않는다.
+    """
+    iterator = iter(items)
+    pending = deque()
+
+    def submit() -> bool:
+        chunk = list(islice(iterator, chunksize))
+        if chunk:
+            pending.append(executor.submit(fn, chunk))
+        return bool(chunk)
+
+    while len(pending) < window and submit():
+        pass
+    while pending:
+        results = pending.popleft().result()
+        submit()
+        yield from results
+
+
+# ---------- 템플릿 + 데이터 행 (variants) ----------
+
+# 행 열 이름: '<텍스트 키>' 또는 '<텍스트 키>.<속성>' (텍스트 키는 type 또는 Texts 인덱스)
+TEXT_FIELDS = ('content', 'color', 'fontSize')
+BACKGROUND_COLUMNS = ('background', 'background.image')
+
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+def read_rows(data_path: str) -> Iterator[Dict[str, Any]]:
+    """CSV(헤더 포함) 또는 JSONL 파일의 행을 하나씩 읽는다 (확장자로 구분)"""
+    with open(data_path, 'r', encoding='utf-8-sig', newline='') as f:
+        if data_path.lower().endswith(('.jsonl', '.ndjson')):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def row_overrides(
+    template: Template,
+    row: Dict[str, Any],
+    base_dir: str = '.'
+) -> Tuple[Dict[Any, Dict[str, Any]], Optional[str]]:
+    """행을 (Template.render overrides, 배경 이미지 경로)로 변환
+
+    빈 값(None, '')은 템플릿 값을 유지하며, 템플릿 텍스트에 해당하지 않는 열은
+    출력 파일명 패턴에만 쓰인다. 배경 이미지의 상대 경로는 base_dir 기준.
+    """
+    overrides: Dict[Any, Dict[str, Any]] = {}
+    background = None
+    for column, value in row.items():
+        if column is None or value is None or value == '':
+            continue
+        if column in BACKGROUND_COLUMNS:
+            background = str(value)
+            if not background.startswith('data:') and not os.path.isabs(background):
+                background = os.path.join(base_dir, background)
+            continue
+
+        key, _, field = column.partition('.')
+        field = field or 'content'
+        if key.isdigit():
+            key = int(key)
+        if field not in TEXT_FIELDS or not template.has_text(key):
+            continue
+        if field == 'fontSize':
+            value = int(float(value))
+        elif field == 'content':
+            value = str(value).replace('\\n', '\n')
+        overrides.setdefault(key, {})[field] = value
+    return overrides, background
+
+
+def format_output(pattern: str, row: Dict[str, Any], n: int) -> str:
+    """출력 경로 패턴에 행 값을 채운다 ({n}: 1부터 시작하는 행 번호)
+
+    문자열 값의 경로 구분자 등 파일명에 쓸 수 없는 문자는 '_'로 바꾼다.
+    """
+    values = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        values[key] = _UNSAFE_FILENAME.sub('_', value) if isinstance(value, str) else value
+    values['n'] = n
+    return pattern.format_map(values)
+
+
+class VariantSettings(NamedTuple):
+    """variants 렌더링에 공통으로 쓰는 값"""
+    label: str           # 결과 source 표기용 데이터 파일 이름
+    output_pattern: str
+    output_dir: str      # 패턴의 상대 경로 기준 (실행 시 작업 디렉토리)
+    base_dir: str        # 행 안 상대 경로(배경 이미지) 기준 (데이터 파일 위치)
+    cache: CacheSpec = None
+    timings: bool = False
+
+
+class CompiledVariant(NamedTuple):
+    """프로세스별로 한 번 준비하는 템플릿 상태"""
+    template: Template
+    settings: VariantSettings
+    cache: Optional[RenderCache]
+    base_key: Optional[str]   # 렌더링 캐시용 템플릿 키
+
+
+# 워커 프로세스별 상태 (초기화 시 템플릿을 한 번 컴파일)
+_worker_variant: Optional[CompiledVariant] = None
+
+
+def compile_variant(dsl: Dict, settings: VariantSettings, search_path: Optional[SearchPath] = None) -> CompiledVariant:
+    cache = _open_cache(settings.cache)
+    return CompiledVariant(
+        ThumbnailRenderer.compile(dsl, search_path=search_path),
+        settings,
+        cache,
+        dsl_key(dsl, search_path) if cache is not None else None,
+    )
+
+
+def render_variant(compiled: CompiledVariant, n: int, row: Dict[str, Any]) -> BatchResult:
+    """한 행 렌더링 (예외는 결과로 바꿔 다른 행에 영향을 주지 않는다)"""
+    template, settings, cache, base_key = compiled
+    source = f"{settings.label}:{n}"
+    output = ''
+    cached = False
+    timings = Timings() if settings.timings else None
+    stage = (timings or NULL_TIMINGS).stage
+    start = time.perf_counter()
+    try:
+        output = os.path.join(settings.output_dir, format_output(settings.output_pattern, row, n))
+        overrides, background = row_overrides(template, row, settings.base_dir)
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        if cache is not None:
+            with stage('cache'):
+                key = variant_key(base_key, overrides, background)
+                cached = cache.fetch(key, output)
+            if not cached:
+                data = template.render_bytes(overrides, background=background, timings=timings)
+                with stage('cache'):
+                    cache.save(key, output, data)
+        else:
+            img = template.render(overrides, background=background, timings=timings)
+            with stage('encode'):
+                detach_hardlink(output)
+                img.save(output, 'PNG')
+    except Exception as e:
+        return BatchResult(source, output, False, f"{type(e).__name__}: {e}", time.perf_counter() - start)
+    stages = timings.as_dict() if timings else None
+    return BatchResult(source, output, True, None, time.perf_counter() - start, cached, stages)
+
+
+def _init_variant_worker(dsl: Dict, settings: VariantSettings, search_path: SearchPath) -> None:
+    global _worker_variant
+    _worker_variant = compile_variant(dsl, settings, search_path)
+
+
+def _render_variant_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[BatchResult]:
+    return [render_variant(_worker_variant, n, row) for n, row in chunk]
+
+
+def render_variants(
+    template_path: str,
+    data_path: str,
+    output_pattern: str = '{n:05d}.png',
+    jobs: Optional[int] = None,
+    chunksize: int = 16,
+    cache: Optional[RenderCache] = None,
+    timings: bool = False
+) -> Iterator[BatchResult]:
+    """템플릿(.json/.thl) 하나에 데이터 파일(CSV/JSONL)의 행들을 적용해 렌더링
+
+    템플릿은 프로세스(워커)마다 한 번만 컴파일하고, 행은 파일에서 읽는 대로 청크 단위로
+    워커에 넘긴다. 결과는 행 순서대로 내보낸다.
+    템플릿을 컴파일할 수 없으면 첫 결과를 내보내기 전에 ValueError.
+    """
+    settings = VariantSettings(
+        label=os.path.basename(data_path),
+        output_pattern=output_pattern,
+        output_dir=os.getcwd(),
+        base_dir=os.path.dirname(os.path.abspath(data_path)),
+        cache=_cache_spec(cache),
+        timings=timings,
+    )
+    rows = enumerate(read_rows(os.path.abspath(data_path)), start=1)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+
+    # .thl은 패키지 폴더에서 폰트를 찾으므로 (워커 컴파일이 끝날 때까지) 렌더링 동안 유지
+    with staged_dsl(template_path) as (dsl, search_path):
+        # 워커 시작 전에 부모에서 한 번 컴파일: 폰트 다운로드/변환을 한 번만 하고,
+        # 컴파일 오류를 워커 초기화 실패(BrokenProcessPool) 대신 실제 원인으로 알린다
+        try:
+            compiled = compile_variant(dsl, settings, search_path)
+        except Exception as e:
+            raise ValueError(f"템플릿을 컴파일할 수 없습니다: {template_path} ({type(e).__name__}: {e})") from e
+
+        if jobs == 1:
+            for n, row in rows:
+                yield render_variant(compiled, n, row)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_variant_worker, initargs=(dsl, settings, search_path)
+        ) as executor:
+            yield from imap_chunked(executor, _render_variant_chunk, rows, chunksize, window=jobs * 2)
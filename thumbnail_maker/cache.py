@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스레드 안전한 LRU 캐시, 파일 내용 해시
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """항목 수(및 선택적으로 총 바이트)로 제한되는 스레드 안전 LRU 캐시
+
+    get_or_create()는 같은 키를 동시에 요청한 스레드들 중 하나만 factory를 실행하고
+    나머지는 그 결과를 기다리므로, 값 생성은 키마다 정확히 한 번만 일어난다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda value: 0)
+        self._data: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._pending: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """값 조회 (적중 시 최근 사용으로 갱신)"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """값 저장 후 한도를 넘으면 오래된 항목부터 제거"""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """캐시에 있으면 반환하고, 없으면 factory()로 생성해 저장 후 반환"""
+        while True:
+            with self._lock:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return self._data[key]
+                event = self._pending.get(key)
+                if event is None:
+                    self.misses += 1
+                    event = threading.Event()
+                    self._pending[key] = event
+                    break
+            # 다른 스레드가 생성 중: 끝날 때까지 기다린 뒤 다시 조회
+            event.wait()
+
+        try:
+            value = factory()
+            with self._lock:
+                self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            event.set()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self.total_bytes -= self._sizes.pop(key, 0)
+            return self._data.pop(key)
+
+    def clear(self) -> None:
+        """모든 항목과 통계 초기화"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/실패 횟수 등 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'entries': len(self._data),
+                'bytes': self.total_bytes,
+                'maxsize': self.maxsize,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        # 호출자가 self._lock을 잡고 있어야 한다
+        if key in self._data:
+            self.total_bytes -= self._sizes.pop(key, 0)
+        size = self._sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # 한 항목이 전체 한도보다 크면 캐시하지 않는다
+            self._data.pop(key, None)
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._sizes[key] = size
+        self.total_bytes += size
+        while len(self._data) > self.maxsize or (
+            self.max_bytes is not None and self.total_bytes > self.max_bytes
+        ):
+            old_key, _ = self._data.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(old_key, 0)
+
+
+@lru_cache(maxsize=512)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    # (경로, mtime, 크기)가 같으면 내용을 다시 읽지 않는다
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_digest(path: str) -> Optional[str]:
+    """파일 내용의 SHA-256 (파일이 없으면 None, 같은 파일은 stat만으로 재사용)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _file_digest(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def detach_hardlink(path: str) -> None:
+    """path가 다른 파일(렌더링 캐시 등)과 하드 링크로 공유 중이면 지워서 덮어쓰기가 전파되지 않게 한다"""
+    try:
+        if os.stat(path).st_nlink > 1:
+            os.remove(path)
+    except OSError:
+        pass
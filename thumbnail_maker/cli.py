@@ -10,12 +10,112 @@ import json
 import argparse
 import base64
 from .renderer import ThumbnailRenderer
-import tempfile
-import zipfile
-import shutil
-from typing import Dict, Optional
+from .render_cache import render_cache_from_args
+from .package import open_package
+from .search_path import SearchPath
+from .timing import Timings
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
 
 
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """렌더링 캐시 옵션 (--cache-dir, --cache-max-mb)"""
+    parser.add_argument('--cache-dir', help='렌더링 결과 캐시 폴더 (입력이 같으면 다시 그리지 않음, '
+                                            '환경 변수 THUMBNAIL_MAKER_CACHE_DIR로도 지정 가능)')
+    parser.add_argument('--cache-max-mb', type=float, help='렌더링 캐시 최대 크기 (MB, 기본: 1024)')
+
+
+def add_timings_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--timings', action='store_true', help='렌더링 단계별 소요 시간 출력')
+
+
+def add_daemon_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--daemon', metavar='SOCKET',
+                        help='렌더링 데몬(serve) 소켓 경로 - 실행 중이 아니면 직접 렌더링 '
+                             '(환경 변수 THUMBNAIL_MAKER_DAEMON으로도 지정 가능)')
+
+
+def add_font_arguments(parser: argparse.ArgumentParser) -> None:
+    """웹 폰트 확보 옵션 (--offline, --font-store, --font-store-max-mb)"""
+    parser.add_argument('--offline', action='store_true',
+                        help='네트워크를 사용하지 않음 - 받지 않은 웹 폰트는 폴백 폰트로 렌더링 '
+                             '(환경 변수 THUMBNAIL_MAKER_OFFLINE=1로도 지정 가능)')
+    parser.add_argument('--font-store', metavar='DIR',
+                        help='웹 폰트를 URL/내용 해시 기준으로 보관할 폴더 (여러 프로세스가 함께 사용 가능, '
+                             '환경 변수 THUMBNAIL_MAKER_FONT_STORE로도 지정 가능)')
+    parser.add_argument('--font-store-max-mb', type=float, help='폰트 저장소 최대 크기 (MB, 기본: 2048)')
+
+
+def apply_font_arguments(args: argparse.Namespace) -> None:
+    """폰트 옵션을 환경 변수로 설정 (이후 만드는 워커 프로세스에도 적용)"""
+    if getattr(args, 'offline', False) is True:
+        from .font_fetch import set_offline
+        set_offline(True)
+    font_store = getattr(args, 'font_store', None)
+    if isinstance(font_store, str) and font_store:
+        from .font_store import FONT_STORE_ENV
+        os.environ[FONT_STORE_ENV] = os.path.abspath(font_store)
+    max_mb = getattr(args, 'font_store_max_mb', None)
+    if isinstance(max_mb, (int, float)) and max_mb > 0:
+        from .font_store import FONT_STORE_MAX_MB_ENV
+        os.environ[FONT_STORE_MAX_MB_ENV] = str(max_mb)
+
+
+def _timings_from_args(args: argparse.Namespace) -> Optional[Timings]:
+    return Timings() if getattr(args, 'timings', False) is True else None
+
+
+def _render_thumbnail(
+    dsl: Dict,
+    output_path: str,
+    args: argparse.Namespace,
+    timings: Optional[Timings],
+    search_path: Optional[SearchPath] = None
+) -> None:
+    """데몬이 지정되어 있고 실행 중이면 데몬에 맡기고, 아니면 이 프로세스에서 렌더링"""
+    from .daemon import daemon_path_from_args, render_via_daemon
+
+    cache = render_cache_from_args(args)
+    socket_path = daemon_path_from_args(args)
+    if socket_path:
+        reply = render_via_daemon(socket_path, dsl, output_path, cache=cache, timings=timings is not None,
+                                  search_path=search_path)
+        if reply is not None:
+            if timings is not None:
+                for name, ms in reply.get('timings', {}).items():
+                    timings.stages[name] = ms / 1000
+            print(f"[OK] 썸네일 생성 완료{' (캐시)' if reply['cached'] else ''}: {output_path}")
+            return
+        print(f"데몬에 연결할 수 없어 직접 렌더링합니다: {socket_path}")
+    ThumbnailRenderer.render_thumbnail(dsl, output_path, cache=cache, timings=timings, search_path=search_path)
+
+
+def _print_timings(timings: Optional[Timings]) -> None:
+    if timings is not None:
+        print("단계별 소요 시간:")
+        print(timings.format())
+
+
+@contextmanager
+def staged_dsl(dsl_path: str) -> Iterator[Tuple[Dict, SearchPath]]:
+    """DSL 파일(.json) 또는 .thl 패키지를 읽어 (DSL dict, SearchPath)를 넘겨준다
+
+    .thl은 압축을 풀지 않고 open_package로 메모리에 읽어(같은 파일은 한 번만) 패키지 안
+    파일을 상대 경로(배경 이미지, fonts/)의 기준으로 삼는다. .json은 현재 작업 디렉토리가 기준이다.
+    작업 디렉토리를 바꾸지 않으므로 여러 스레드에서 동시에 사용할 수 있다.
+    DSL 파일이 없으면 FileNotFoundError.
+    """
+    if dsl_path.lower().endswith('.thl') and os.path.exists(dsl_path):
+        package = open_package(dsl_path)
+        yield package.dsl(), SearchPath.of_package(package)
+        return
+
+    if not os.path.exists(dsl_path):
+        raise FileNotFoundError(f"DSL 파일을 찾을 수 없습니다: {dsl_path}")
+    with open(dsl_path, 'r', encoding='utf-8') as f:
+        dsl = json.load(f)
+    yield dsl, SearchPath.of(os.getcwd())
+
 def main():
     """메인 CLI 진입점"""
     parser = argparse.ArgumentParser(description='썸네일 생성')
@@ -23,43 +123,17 @@ def main():
     parser.add_argument('-o', '--output', default='thumbnail.png', help='출력 파일 경로')
     
     args = parser.parse_args()
-    staging = None
-    cwd_backup = os.getcwd()
-    # 출력 경로를 절대경로로 확보 (staging 디렉토리 변경 전)
-    output_path = args.output
-    if not os.path.isabs(output_path):
-        output_path = os.path.abspath(output_path)
-    try:
-        # .thl 패키지 지원: 임시 폴더에 풀어서 작업
-        if args.dsl.lower().endswith('.thl') and os.path.exists(args.dsl):
-            staging = tempfile.mkdtemp(prefix='thl_run_')
-            with zipfile.ZipFile(args.dsl, 'r') as zf:
-                zf.extractall(staging)
-            # 작업 디렉토리를 패키지 루트로 변경 (renderer의 'fonts/' 탐색을 위함)
-            os.chdir(staging)
-            dsl_path = os.path.join(staging, 'thumbnail.json')
-        else:
-            dsl_path = args.dsl
+    output_path = os.path.abspath(args.output)
 
-        # DSL 파일 확인
-        if not os.path.exists(dsl_path):
-            print(f"오류: DSL 파일을 찾을 수 없습니다: {dsl_path}")
-            sys.exit(1)
-        
-        # DSL 읽기
-        with open(dsl_path, 'r', encoding='utf-8') as f:
-            dsl = json.load(f)
-        
-        # 썸네일 생성
-        ThumbnailRenderer.render_thumbnail(dsl, output_path)
-    finally:
-        try:
-            os.chdir(cwd_backup)
-        except Exception:
-            pass
-        if staging:
-            shutil.rmtree(staging, ignore_errors=True)
+    # DSL 파일 확인
+    if not os.path.exists(args.dsl):
+        print(f"오류: DSL 파일을 찾을 수 없습니다: {args.dsl}")
+        sys.exit(1)
 
+    # .thl 패키지는 메모리에 읽어 패키지 안 fonts/ 등을 상대 경로의 기준으로 사용
+    with staged_dsl(args.dsl) as (dsl, search_path):
+        # 썸네일 생성
+        ThumbnailRenderer.render_thumbnail(dsl, output_path, search_path=search_path)
 
 def main_cli():
     """간편 CLI 진입점"""
@@ -69,8 +143,13 @@ def main_cli():
     parser.add_argument('-t', '--title', help='제목 덮어쓰기 (\\n 또는 실제 줄바꿈 지원)')
     parser.add_argument('--subtitle', help='부제목 덮어쓰기 (\\n 또는 실제 줄바꿈 지원)')
     parser.add_argument('-b', '--background-image', dest='bgImg', help='배경 이미지 경로')
+    add_cache_arguments(parser)
+    add_timings_argument(parser)
+    add_daemon_argument(parser)
+    add_font_arguments(parser)
     
     args = parser.parse_args()
+    apply_font_arguments(args)
 
     def normalize_text(s: str) -> str:
         """CLI에서 전달된 텍스트의 줄바꿈 시퀀스를 실제 줄바꿈으로 변환"""
@@ -82,32 +161,15 @@ def main_cli():
         s = s.replace('\\n', '\n')
         return s
     
-    staging = None
-    cwd_backup = os.getcwd()
-    # 출력 경로를 절대경로로 확보 (staging 디렉토리 변경 전)
-    output_path = args.output
-    if not os.path.isabs(output_path):
-        output_path = os.path.abspath(output_path)
-    try:
-        # .thl 패키지 지원
-        if args.dsl and args.dsl.lower().endswith('.thl') and os.path.exists(args.dsl):
-            staging = tempfile.mkdtemp(prefix='thl_run_')
-            with zipfile.ZipFile(args.dsl, 'r') as zf:
-                zf.extractall(staging)
-            os.chdir(staging)
-            dsl_path = os.path.join(staging, 'thumbnail.json')
-        else:
-            dsl_path = args.dsl
+    output_path = os.path.abspath(args.output)
 
-        # DSL 파일 확인
-        if not os.path.exists(dsl_path):
-            print(f"오류: DSL 파일을 찾을 수 없습니다: {dsl_path}")
-            sys.exit(1)
+    # DSL 파일 확인
+    if not os.path.exists(args.dsl):
+        print(f"오류: DSL 파일을 찾을 수 없습니다: {args.dsl}")
+        sys.exit(1)
 
-        # DSL 읽기
-        with open(dsl_path, 'r', encoding='utf-8') as f:
-            dsl = json.load(f)
-        
+    # .thl 패키지 지원 (작업 디렉토리는 바꾸지 않으므로 -b 등 상대 경로는 실행 위치 기준)
+    with staged_dsl(args.dsl) as (dsl, search_path):
         # 배경 이미지 처리
         if args.bgImg and os.path.exists(args.bgImg):
             with open(args.bgImg, 'rb') as f:
@@ -127,15 +189,9 @@ def main_cli():
                     txt['content'] = normalize_text(args.subtitle)
         
         # 썸네일 생성
-        ThumbnailRenderer.render_thumbnail(dsl, output_path)
-    finally:
-        try:
-            os.chdir(cwd_backup)
-        except Exception:
-            pass
-        if staging:
-            shutil.rmtree(staging, ignore_errors=True)
-
+        timings = _timings_from_args(args)
+        _render_thumbnail(dsl, output_path, args, timings, search_path)
+        _print_timings(timings)
 
 def override_dsl_with_args(dsl: Dict, args: argparse.Namespace) -> Dict:
     """CLI 파라미터로 DSL 덮어쓰기"""
@@ -413,43 +469,108 @@ def override_dsl_with_args(dsl: Dict, args: argparse.Namespace) -> Dict:
 
 def generate_thumbnail_from_args(args: argparse.Namespace):
     """generate-thumbnail 명령어 처리"""
-    staging = None
-    cwd_backup = os.getcwd()
-    output_path = args.output
-    if not os.path.isabs(output_path):
-        output_path = os.path.abspath(output_path)
-    
-    try:
-        # .thl 패키지 지원
-        dsl_path = args.dsl or 'thumbnail.json'
-        if dsl_path.lower().endswith('.thl') and os.path.exists(dsl_path):
-            staging = tempfile.mkdtemp(prefix='thl_run_')
-            with zipfile.ZipFile(args.dsl, 'r') as zf:
-                zf.extractall(staging)
-            os.chdir(staging)
-            dsl_path = os.path.join(staging, 'thumbnail.json')
-        
-        # DSL 파일 확인
-        if not os.path.exists(dsl_path):
-            print(f"오류: DSL 파일을 찾을 수 없습니다: {dsl_path}")
-            sys.exit(1)
-        
-        # DSL 읽기
-        with open(dsl_path, 'r', encoding='utf-8') as f:
-            dsl = json.load(f)
-        
+    output_path = os.path.abspath(args.output)
+
+    # DSL 파일 확인
+    dsl_path = args.dsl or 'thumbnail.json'
+    if not os.path.exists(dsl_path):
+        print(f"오류: DSL 파일을 찾을 수 없습니다: {dsl_path}")
+        sys.exit(1)
+
+    # .thl 패키지 지원 (작업 디렉토리는 바꾸지 않으므로 -bi 등 상대 경로는 실행 위치 기준)
+    with staged_dsl(dsl_path) as (dsl, search_path):
         # CLI 파라미터로 DSL 덮어쓰기
         dsl = override_dsl_with_args(dsl, args)
         
         # 썸네일 생성
-        ThumbnailRenderer.render_thumbnail(dsl, output_path)
-    finally:
-        try:
-            os.chdir(cwd_backup)
-        except Exception:
-            pass
-        if staging:
-            shutil.rmtree(staging, ignore_errors=True)
+        timings = _timings_from_args(args)
+        _render_thumbnail(dsl, output_path, args, timings, search_path)
+        _print_timings(timings)
+
+def _report_results(results, as_json: bool, cache=None) -> int:
+    """일괄 렌더링 결과를 항목별로 바로 출력하고 실패 개수를 반환
+
+    as_json이면 결과마다 JSON 한 줄 (timings 요청 시 단계별 밀리초 포함).
+    """
+    ok = failed = hits = 0
+    totals = Timings()
+    for result in results:
+        if result.ok:
+            ok += 1
+            hits += result.cached
+        else:
+            failed += 1
+        for name, ms in (result.timings or {}).items():
+            totals.stages[name] = totals.stages.get(name, 0.0) + ms / 1000
+        if as_json:
+            record = result._asdict()
+            if record['timings'] is None:
+                del record['timings']
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+        elif result.ok:
+            tag = ', 캐시' if result.cached else ''
+            print(f"[OK] {result.source} -> {result.output} ({result.elapsed * 1000:.1f}ms{tag})", flush=True)
+        else:
+            print(f"[FAIL] {result.source}: {result.error}", flush=True)
+
+    if not as_json:
+        print(f"완료: 성공 {ok}개, 실패 {failed}개")
+        if cache is not None and ok:
+            print(f"렌더링 캐시 적중: {hits}/{ok} ({hits / ok:.1%})")
+        if totals.stages:
+            print("단계별 소요 시간 (전체 합계):")
+            print(totals.format())
+    return failed
+
+
+def batch_from_args(args: argparse.Namespace):
+    """batch 명령어 처리: 결과를 항목별로 바로 출력하고, 실패가 있으면 종료 코드 1"""
+    from .batch import expand_inputs, render_batch
+
+    sources = expand_inputs(args.inputs, manifest=args.manifest)
+    if not sources:
+        print("오류: 입력 파일이 없습니다")
+        sys.exit(1)
+
+    cache = render_cache_from_args(args)
+    results = render_batch(
+        sources,
+        args.output_dir,
+        jobs=args.jobs,
+        chunksize=args.chunksize,
+        cache=cache,
+        timings=args.timings,
+    )
+    if _report_results(results, args.json, cache):
+        sys.exit(1)
+
+
+def variants_from_args(args: argparse.Namespace):
+    """variants 명령어 처리: 템플릿 + CSV/JSONL 행별 렌더링, 실패가 있으면 종료 코드 1"""
+    from .batch import render_variants
+
+    for path in (args.template, args.data):
+        if not os.path.exists(path):
+            print(f"오류: 파일을 찾을 수 없습니다: {path}")
+            sys.exit(1)
+
+    cache = render_cache_from_args(args)
+    results = render_variants(
+        args.template,
+        args.data,
+        output_pattern=args.output_pattern,
+        jobs=args.jobs,
+        chunksize=args.chunksize,
+        cache=cache,
+        timings=args.timings,
+    )
+    try:
+        failed = _report_results(results, args.json, cache)
+    except ValueError as e:
+        print(f"오류: {e}")
+        sys.exit(1)
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더링 데몬 - 폰트/컴파일된 템플릿/배경 캐시를 유지하는 상주 프로세스와 Unix 소켓 클라이언트
+
+프로토콜: 메시지마다 4바이트 빅엔디언 길이 + UTF-8 JSON. 한 연결에서 요청/응답을 여러 번 주고받을 수 있다.
+
+    요청: {"op": "render", "dsl": {...}, "output": "/abs/out.png" 또는 null, "search_path": ["/abs/dir", ...],
+           "packages": ["/abs/template.thl", ...], "cache_dir": null, "cache_max_bytes": null, "timings": false}
+    응답: {"ok": true, "output": "/abs/out.png", "cached": false, "timings": {...}, "data": "<base64, output이 null일 때>"}
+          {"ok": false, "error": "..."}
+    {"op": "ping"} -> {"ok": true, "pid": 1234}
+"""
+
+import base64
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .render_cache import RenderCache
+    from .search_path import SearchPath
+
+# --daemon을 지정하지 않았을 때 사용할 데몬 소켓 경로
+DAEMON_ENV = 'THUMBNAIL_MAKER_DAEMON'
+
+_HEADER = struct.Struct('>I')
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+
+
+# ---------- 프로토콜 ----------
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    body = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """메시지 하나 수신 (연결이 닫혔으면 None)"""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_MESSAGE_BYTES:
+        raise ValueError(f"메시지가 너무 큽니다: {size} bytes")
+    body = _recv_exact(sock, size)
+    if body is None:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+
+# ---------- 서버 ----------
+
+def template_key(dsl: Dict, search_path: 'SearchPath') -> Tuple[Tuple, Dict[int, Dict[str, Any]]]:
+    """(텍스트 내용을 뺀 템플릿 키, 내용 overrides)
+
+    텍스트 내용만 다른 요청은 같은 컴파일된 템플릿을 쓰고 내용은 Template.render의 overrides로 넣는다.
+    폰트 조회/해시는 하지 않으며, 배경 이미지는 파일이 바뀌면 다시 컴파일하도록 내용 해시를 넣는다.
+    """
+    from .background import image_source_digest
+
+    thumbnail_config = dsl.get('Thumbnail', {})
+    texts = thumbnail_config.get('Texts') or []
+    overrides = {
+        index: {'content': txt.get('content', '')}
+        for index, txt in enumerate(texts) if txt.get('enabled', True)
+    }
+    layout = dict(thumbnail_config, Texts=[{k: v for k, v in txt.items() if k != 'content'} for txt in texts])
+    background = thumbnail_config.get('Background') or {}
+    image = None
+    if background.get('type') == 'image':
+        image = image_source_digest(search_path.resolve(background.get('imagePath', '')))
+    key = (
+        json.dumps({**dsl, 'Thumbnail': layout}, sort_keys=True, ensure_ascii=False, default=str),
+        search_path.roots,
+        tuple(package.path for package in search_path.packages),
+        image,
+    )
+    return key, overrides
+
+
+class RenderService:
+    """요청 처리기 - 컴파일된 템플릿을 텍스트 내용을 뺀 키(template_key)별로 유지한다"""
+
+    def __init__(self, max_templates: int = 64):
+        from .cache import LRUCache
+
+        self.templates = LRUCache(maxsize=max_templates)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if op != 'render':
+            return {'ok': False, 'error': f"알 수 없는 요청: {op}"}
+        try:
+            return self.render(request)
+        except Exception as e:
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+    def render(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        from .cache import detach_hardlink
+        from .package import open_package
+        from .render_cache import DEFAULT_MAX_BYTES, dsl_key, open_render_cache
+        from .search_path import SearchPath
+        from .template import compile_template
+        from .timing import NULL_TIMINGS, Timings
+
+        dsl = request['dsl']
+        output = request.get('output')
+        timings = Timings() if request.get('timings') else None
+        stages = timings or NULL_TIMINGS
+        # 상대 경로(배경 이미지, fonts/)는 클라이언트가 보낸 .thl 패키지와 기준 디렉토리에서 찾는다
+        # (패키지는 데몬 쪽 캐시에서 열리므로 같은 템플릿은 한 번만 읽는다)
+        search_path = SearchPath(
+            tuple(request.get('search_path') or ()),
+            tuple(open_package(path) for path in request.get('packages') or ()),
+        )
+
+        cache = None
+        if request.get('cache_dir') and output:
+            cache = open_render_cache(request['cache_dir'], request.get('cache_max_bytes') or DEFAULT_MAX_BYTES)
+
+        key = None
+        if cache is not None:
+            with stages.stage('cache'):
+                key = dsl_key(dsl, search_path)
+                if cache.fetch(key, output):
+                    return self._reply(output, True, timings)
+
+        compiled_key, overrides = template_key(dsl, search_path)
+        template = self.templates.get_or_create(compiled_key, lambda: compile_template(dsl, timings, search_path))
+        data = template.render_bytes(overrides, timings=timings)
+
+        if output is None:
+            reply = self._reply(None, False, timings)
+            reply['data'] = base64.b64encode(data).decode('ascii')
+            return reply
+        if cache is not None:
+            with stages.stage('cache'):
+                cache.save(key, output, data)
+        else:
+            with stages.stage('encode'):
+                detach_hardlink(output)
+                with open(output, 'wb') as f:
+                    f.write(data)
+        return self._reply(output, False, timings)
+
+    @staticmethod
+    def _reply(output: Optional[str], cached: bool, timings) -> Dict[str, Any]:
+        reply = {'ok': True, 'output': output, 'cached': cached}
+        if timings is not None:
+            reply['timings'] = timings.as_dict()
+        return reply
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (OSError, ValueError):
+                return
+            if request is None:
+                return
+            send_message(self.request, self.server.service.handle(request))
+
+
+class RenderServer(socketserver.UnixStreamServer):
+    """요청을 순서대로 처리하는 Unix 소켓 서버 (렌더링은 CPU 작업이므로 한 번에 한 요청)"""
+
+    def __init__(self, socket_path: str, service: Optional[RenderService] = None):
+        self.socket_path = os.path.abspath(socket_path)
+        self.service = service or RenderService()
+        _remove_stale_socket(self.socket_path)
+        super().__init__(self.socket_path, _Handler)
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.remove(self.socket_path)
+        except OSError:
+            pass
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """이전 실행이 남긴 소켓 파일 정리 (다른 데몬이 살아 있으면 오류)"""
+    if not os.path.exists(socket_path):
+        return
+    if ping(socket_path):
+        raise RuntimeError(f"이미 데몬이 실행 중입니다: {socket_path}")
+    os.remove(socket_path)
+
+
+def _stop(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def serve(socket_path: str) -> None:
+    """데몬 실행 (Ctrl+C 또는 SIGTERM으로 종료, 소켓 파일은 종료 시 삭제)"""
+    if not hasattr(socket, 'AF_UNIX'):
+        raise RuntimeError("이 플랫폼은 Unix 소켓을 지원하지 않습니다")
+    signal.signal(signal.SIGTERM, _stop)
+    with RenderServer(socket_path) as server:
+        print(f"렌더링 데몬 시작: {server.socket_path} (pid {os.getpid()})", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    print("렌더링 데몬 종료")
+
+
+# ---------- 클라이언트 ----------
+
+def daemon_path_from_args(args) -> Optional[str]:
+    """CLI 인자(--daemon) 또는 환경 변수로 지정된 데몬 소켓 경로 (미지정 시 None)"""
+    path = getattr(args, 'daemon', None)
+    if not isinstance(path, str) or not path:
+        path = os.environ.get(DAEMON_ENV) or None
+    return path
+
+
+def _connect(socket_path: str, timeout: Optional[float]) -> Optional[socket.socket]:
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(socket_path: str, message: Dict[str, Any], timeout: Optional[float] = 300) -> Optional[Dict[str, Any]]:
+    """데몬에 요청 하나를 보내고 응답 반환 (데몬에 연결할 수 없으면 None)"""
+    sock = _connect(socket_path, timeout)
+    if sock is None:
+        return None
+    with sock:
+        try:
+            send_message(sock, message)
+            return recv_message(sock)
+        except OSError:
+            return None
+
+
+def ping(socket_path: str) -> bool:
+    reply = request(socket_path, {'op': 'ping'}, timeout=2)
+    return bool(reply and reply.get('ok'))
+
+
+def render_via_daemon(
+    socket_path: str,
+    dsl: Dict,
+    output_path: Optional[str] = None,
+    cache: Optional['RenderCache'] = None,
+    timings: bool = False,
+    search_path: Optional['SearchPath'] = None
+) -> Optional[Dict[str, Any]]:
+    """데몬으로 렌더링 요청 (연결할 수 없으면 None → 호출자가 직접 렌더링)
+
+    output_path가 None이면 응답의 'data'에 PNG 바이트가 들어 있다.
+    cache(RenderCache)를 주면 데몬도 같은 캐시 디렉토리를 사용한다.
+    상대 경로는 search_path(기본: 현재 작업 디렉토리) 기준으로 데몬에서 해석된다.
+    데몬이 렌더링에 실패하면 RuntimeError.
+    """
+    from .search_path import SearchPath
+
+    if not search_path or not (search_path.roots or search_path.packages):
+        search_path = SearchPath.of(os.getcwd())
+    reply = request(socket_path, {
+        'op': 'render',
+        'dsl': dsl,
+        'output': os.path.abspath(output_path) if output_path else None,
+        'search_path': list(search_path.roots),
+        'packages': [package.path for package in search_path.packages],
+        'cache_dir': cache.directory if cache is not None else None,
+        'cache_max_bytes': cache.max_bytes if cache is not None else None,
+        'timings': timings,
+    })
+    if reply is None:
+        return None
+    if not reply.get('ok'):
+        raise RuntimeError(reply.get('error', '데몬 렌더링 실패'))
+    if 'data' in reply:
+        reply['data'] = base64.b64decode(reply['data'])
+    return reply
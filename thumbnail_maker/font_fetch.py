@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+폰트 다운로드 - 프로세스 공용 연결 풀(httpx.Client)로 여러 폰트를 동시에 받아 디스크에 스트리밍 저장
+
+실패한 URL은 NegativeCache에 기록해 지수 백오프 동안 다시 요청하지 않으며,
+오프라인 모드(--offline, 환경 변수 THUMBNAIL_MAKER_OFFLINE=1)에서는 네트워크를 전혀 쓰지 않는다.
+httpx는 실제로 내려받을 때만 import한다 (CLI 시작 시간 단축).
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    import httpx
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# 동시에 받을 최대 폰트 수 (같은 호스트는 연결 풀에서 keep-alive 연결을 재사용)
+MAX_CONCURRENCY = 6
+CONNECT_TIMEOUT = 10.0
+READ_TIMEOUT = 30.0
+CHUNK_SIZE = 64 * 1024
+
+# 재검증용 응답 헤더(ETag, Last-Modified)를 저장하는 파일: '<저장 경로>.meta.json'
+META_SUFFIX = '.meta.json'
+
+# 저장 폴더에 두는 실패 기록 파일 이름 (NegativeCache)
+FAILURES_FILE = '.fetch_failures.json'
+
+# 설정되어 있으면(1/true/yes) 네트워크를 사용하지 않는다 (프로세스 풀 워커에도 상속)
+OFFLINE_ENV = 'THUMBNAIL_MAKER_OFFLINE'
+
+# 실패한 URL 재시도 대기: BACKOFF_BASE * 2^(연속 실패 횟수 - 1), 최대 BACKOFF_MAX초
+BACKOFF_BASE = 60.0
+BACKOFF_MAX = 24 * 60 * 60.0
+
+
+def is_offline() -> bool:
+    return os.environ.get(OFFLINE_ENV, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def set_offline(offline: bool = True) -> None:
+    """오프라인 모드 설정 (환경 변수로 저장하므로 이후 만드는 워커 프로세스에도 적용된다)"""
+    if offline:
+        os.environ[OFFLINE_ENV] = '1'
+    else:
+        os.environ.pop(OFFLINE_ENV, None)
+
+
+class FetchResult(NamedTuple):
+    """폰트 하나의 다운로드 결과
+
+    status: 'downloaded'(새로 받음), 'not_modified'(304, 기존 파일 유지),
+            'cached'(파일이 있어 요청하지 않음), 'skipped'(오프라인 또는 백오프 중), 'failed'
+    """
+    url: str
+    path: str
+    status: str
+    error: Optional[str] = None
+    validators: Optional[Dict[str, Optional[str]]] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status not in ('failed', 'skipped')
+
+
+class NegativeCache:
+    """최근 실패한 URL과 다시 시도할 수 있는 시각 (JSON 파일에 저장해 프로세스 간 공유)
+
+    조회는 메모리에서 하고, 다른 프로세스가 기록했는지는 파일 mtime으로만 확인하므로
+    백오프 중인 URL은 렌더링마다 stat 한 번의 비용만 든다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        self._mtime: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        # 호출자가 self._lock을 잡고 있어야 한다
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self._entries, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        self._entries = entries if isinstance(entries, dict) else {}
+        self._mtime = mtime
+
+    def _save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            pass
+
+    def retry_after(self, url: str) -> float:
+        """다시 시도할 수 있을 때까지 남은 초 (0이면 바로 시도 가능)"""
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(url)
+        if not entry:
+            return 0.0
+        return max(0.0, float(entry.get('retry_at', 0)) - time.time())
+
+    def record_failure(self, url: str, error: str) -> float:
+        """실패 기록, 다음 시도까지의 대기 초 반환"""
+        with self._lock:
+            self._refresh()
+            failures = int(self._entries.get(url, {}).get('failures', 0)) + 1
+            delay = min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+            self._entries[url] = {'failures': failures, 'retry_at': time.time() + delay, 'error': error}
+            self._save()
+        return delay
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            self._refresh()
+            if self._entries.pop(url, None) is not None:
+                self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self._mtime = None
+
+
+@lru_cache(maxsize=None)
+def negative_cache(path: str) -> NegativeCache:
+    """경로별로 프로세스당 하나의 NegativeCache"""
+    return NegativeCache(os.path.abspath(path))
+
+
+_client: Optional['httpx.Client'] = None
+_client_pid: Optional[int] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> 'httpx.Client':
+    """프로세스 공용 httpx.Client (fork된 워커는 부모의 연결을 공유하지 않도록 새로 만든다)"""
+    import httpx
+
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = httpx.Client(
+                timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=MAX_CONCURRENCY * 2, max_keepalive_connections=MAX_CONCURRENCY),
+            )
+            _client_pid = os.getpid()
+        return _client
+
+
+def close_client() -> None:
+    """공용 클라이언트의 연결을 닫는다 (다음 요청 때 새로 만든다)"""
+    global _client
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+
+
+def read_validators(path: str, url: str) -> Dict[str, str]:
+    """path를 받았을 때 저장한 ETag/Last-Modified (같은 URL에서 받은 경우만)"""
+    try:
+        with open(path + META_SUFFIX, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(meta, dict) or meta.get('url') != url:
+        return {}
+    return {k: meta[k] for k in ('etag', 'last_modified') if isinstance(meta.get(k), str)}
+
+
+def _write_validators(path: str, url: str, validators: Mapping[str, Optional[str]]) -> None:
+    meta = {'url': url, 'etag': validators.get('etag'), 'last_modified': validators.get('last_modified')}
+    try:
+        with open(path + META_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except OSError:
+        pass
+
+
+def _stream_to_file(response: 'httpx.Response', dest_path: str) -> None:
+    # 같은 폴더의 임시 파일에 받은 뒤 rename하므로 중간에 실패해도 반쯤 쓴 폰트가 남지 않는다
+    directory = os.path.dirname(os.path.abspath(dest_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(dest_path), suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in response.iter_bytes(CHUNK_SIZE):
+                f.write(chunk)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def download(
+    url: str,
+    dest_path: str,
+    validators: Optional[Mapping[str, str]] = None,
+    revalidate: bool = False,
+    client: Optional['httpx.Client'] = None,
+    failures: Optional[NegativeCache] = None
+) -> FetchResult:
+    """url을 dest_path로 받는다 (예외 대신 FetchResult로 실패를 알린다)
+
+    validators({'etag', 'last_modified'})를 주면 조건부 요청을 보내고, 바뀌지 않았으면(304)
+    아무것도 쓰지 않고 'not_modified'를 반환한다. 새로 받은 경우 result.validators에 응답의 값이 들어 있다.
+    failures(NegativeCache)를 주면 백오프 중인 URL은 요청하지 않고 실패/성공을 기록한다.
+    revalidate=True(사용자가 명시적으로 새로 고침)이면 백오프를 무시한다.
+    """
+    if is_offline():
+        return FetchResult(url, dest_path, 'skipped', '오프라인 모드')
+    if failures is not None and not revalidate:
+        wait = failures.retry_after(url)
+        if wait > 0:
+            return FetchResult(url, dest_path, 'skipped', f"최근 실패로 {wait:.0f}초 후 재시도")
+
+    import httpx
+
+    headers = {}
+    if validators and validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators and validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    try:
+        with (client or get_client()).stream('GET', url, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                result = FetchResult(url, dest_path, 'not_modified')
+            else:
+                response.raise_for_status()
+                _stream_to_file(response, dest_path)
+                result = FetchResult(url, dest_path, 'downloaded', validators={
+                    'etag': response.headers.get('etag'),
+                    'last_modified': response.headers.get('last-modified'),
+                })
+    except (httpx.HTTPError, OSError) as e:
+        error = f"{type(e).__name__}: {e}"
+        if failures is not None:
+            failures.record_failure(url, error)
+        return FetchResult(url, dest_path, 'failed', error)
+    if failures is not None:
+        failures.record_success(url)
+    return result
+
+
+def fetch(
+    url: str,
+    dest_path: str,
+    revalidate: bool = False,
+    client: Optional['httpx.Client'] = None,
+    failures: Optional[NegativeCache] = None
+) -> FetchResult:
+    """url을 dest_path로 받는다 (파일이 이미 있으면 revalidate=True일 때만 요청)
+
+    재검증은 '<dest_path>.meta.json'에 저장해 둔 ETag/Last-Modified로 조건부 요청을 보내며,
+    바뀌지 않았으면(304) 본문 없이 기존 파일을 유지한다.
+    """
+    exists = os.path.exists(dest_path)
+    if exists and not revalidate:
+        return FetchResult(url, dest_path, 'cached')
+    validators = read_validators(dest_path, url) if exists else None
+    result = download(url, dest_path, validators, revalidate, client, failures)
+    if result.status == 'downloaded':
+        _write_validators(dest_path, url, result.validators)
+    return result
+
+
+def map_concurrently(func: Callable[[T], R], items: Sequence[T], max_workers: int = MAX_CONCURRENCY) -> List[R]:
+    """items에 func를 스레드 풀에서 동시에 적용 (입력 순서대로 결과, 하나면 바로 실행)"""
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def fetch_all(
+    jobs: Sequence[Tuple[str, str]],
+    revalidate: bool = False,
+    max_workers: int = MAX_CONCURRENCY,
+    failures: Optional[NegativeCache] = None
+) -> List[FetchResult]:
+    """(url, 저장 경로) 목록을 공용 연결 풀에서 동시에 받아 입력 순서대로 결과 반환
+
+    같은 저장 경로가 여러 번 나오면 한 번만 받는다. 오프라인이거나 모두 백오프 중이면
+    httpx를 import하거나 연결을 만들지 않는다.
+    """
+    unique: Dict[str, str] = {}
+    for url, path in jobs:
+        unique.setdefault(path, url)
+    if not unique:
+        return []
+
+    done = map_concurrently(
+        lambda item: fetch(item[1], item[0], revalidate, None, failures), list(unique.items()), max_workers
+    )
+    by_path = {result.path: result for result in done}
+    return [by_path[path]._replace(url=url) for url, path in jobs]
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+내용 주소 기반 폰트 저장소 - 여러 렌더링 프로세스가 함께 써도 안전한 폰트 캐시 디렉토리
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .font_fetch import FAILURES_FILE, NegativeCache, negative_cache
+
+
+# 설정되어 있으면 웹 폰트를 이 폴더의 FontStore에 받는다 (--font-store, 워커 프로세스에도 상속)
+FONT_STORE_ENV = 'THUMBNAIL_MAKER_FONT_STORE'
+FONT_STORE_MAX_MB_ENV = 'THUMBNAIL_MAKER_FONT_STORE_MAX_MB'
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+MANIFEST_VERSION = 1
+
+# 조회할 때마다 mtime을 갱신하지 않고, 이보다 오래됐을 때만 갱신 (LRU 기준)
+TOUCH_INTERVAL = 60 * 60.0
+# 메모리에 기억한 키 → 경로를 이 시간(초) 동안은 manifest/파일 확인 없이 쓴다
+LOOKUP_RECHECK = 2.0
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """프로세스 간 배타 잠금 (잠금 파일은 지우지 않는다)"""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class FontStore:
+    """내용 주소 기반 폰트 저장소
+
+    - 폰트 파일: '<dir>/objects/<해시 앞 2자리>/<SHA-256><확장자>' (같은 내용은 한 번만 저장)
+    - manifest.json: 원본 키(URL) -> {sha256, ext, etag, last_modified}
+      이름이 같은 다른 폰트도 URL이 다르면 충돌하지 않는다.
+    - 등록/정리는 '<dir>/.lock' 파일 잠금 안에서 하고, 모든 파일은 임시 파일 + rename으로 기록하므로
+      여러 프로세스가 동시에 써도 반쯤 쓴 폰트나 깨진 manifest가 남지 않는다.
+    - 총 크기가 max_bytes를 넘으면 마지막 사용 시각(mtime)이 오래된 폰트부터 max_bytes의 90%까지 지운다.
+    """
+
+    # 정리 시 max_bytes의 이 비율까지 비운다
+    EVICT_RATIO = 0.9
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.lock_path = os.path.join(self.directory, '.lock')
+        self.incoming_dir = os.path.join(self.directory, 'incoming')
+        self._urls: Dict[str, Dict[str, Any]] = {}
+        self._manifest_mtime: Optional[int] = None
+        # 키 → (폰트 경로, 확인 시각) - manifest가 바뀌면 비운다
+        self._paths: Dict[str, Tuple[str, float]] = {}
+        # 이 프로세스가 아는 objects 총 크기 (첫 등록 시 한 번 스캔)
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def failures(self) -> NegativeCache:
+        """이 저장소로 받는 URL의 실패 기록"""
+        return negative_cache(os.path.join(self.directory, FAILURES_FILE))
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """원본 키 (로컬 파일은 내용이 바뀌면 다른 키가 되도록 mtime/크기를 붙인다)
+
+        로컬 파일의 mtime/크기는 font_resolver.stamp로 얻으므로 렌더링마다 stat하지 않는다.
+        """
+        from urllib.parse import urlparse
+
+        from .fonts import font_resolver
+
+        parsed = urlparse(url)
+        local_path = None
+        if parsed.scheme == 'file':
+            local_path = os.path.abspath(parsed.path)
+        elif os.path.isabs(url):
+            local_path = os.path.abspath(url)
+        if local_path is None:
+            return url
+        stamp = font_resolver.stamp(local_path)
+        if stamp is None:
+            return 'file://' + local_path
+        return f"file://{local_path}#{stamp[0]}-{stamp[1]}"
+
+    def object_path(self, sha256: str, ext: str) -> str:
+        return os.path.join(self.directory, 'objects', sha256[:2], sha256 + ext)
+
+    # ---------- manifest ----------
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        urls = manifest.get('urls') if isinstance(manifest, dict) else None
+        return urls if isinstance(urls, dict) else {}
+
+    def _write_manifest(self, urls: Mapping[str, Dict[str, Any]]) -> None:
+        # 호출자가 file_lock을 잡고 있어야 한다
+        data = json.dumps({'version': MANIFEST_VERSION, 'urls': urls}, ensure_ascii=False, sort_keys=True)
+        _write_atomic(self.manifest_path, data.encode('utf-8'))
+        with self._lock:
+            self._urls = dict(urls)
+            self._manifest_mtime = os.stat(self.manifest_path).st_mtime_ns
+            self._paths.clear()
+
+    def _manifest(self) -> Dict[str, Dict[str, Any]]:
+        """메모리의 manifest (다른 프로세스가 바꿨으면 mtime으로 감지해 다시 읽는다)"""
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                self._urls = self._read_manifest() if mtime is not None else {}
+                self._manifest_mtime = mtime
+                self._paths.clear()
+            return self._urls
+
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._manifest().get(key)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """키로 등록된 폰트 파일 경로 (없거나 정리되어 지워졌으면 None)
+
+        찾은 경로는 메모리에 기억해 LOOKUP_RECHECK초 동안은 stat 없이 돌려준다.
+        기억하지 않은 키만 manifest를 다시 확인한다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._paths.get(key)
+        if cached is not None and now - cached[1] < LOOKUP_RECHECK:
+            return cached[0]
+
+        entry = self.entry(key)
+        if not entry:
+            return None
+        path = self.object_path(entry['sha256'], entry.get('ext', '.ttf'))
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        if time.time() - mtime > TOUCH_INTERVAL:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._paths[key] = (path, now)
+        return path
+
+    def touch(self, key: str) -> None:
+        """사용 시각 갱신 (재검증 결과 바뀌지 않은 경우 등)"""
+        path = self.lookup(key)
+        if path:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    # ---------- 등록/정리 ----------
+    def incoming_path(self, ext: str = '') -> str:
+        """다운로드용 임시 경로 (받은 뒤 put으로 등록하고 지운다)"""
+        os.makedirs(self.incoming_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self.incoming_dir, suffix=ext)
+        os.close(fd)
+        return path
+
+    def put(self, key: str, data: bytes, ext: str = '.ttf', validators: Optional[Mapping[str, Optional[str]]] = None) -> str:
+        """폰트 내용을 저장하고 key에 연결, 저장된 파일 경로 반환"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.object_path(sha256, ext)
+        added = 0
+        if not os.path.exists(path):
+            # 같은 내용이면 같은 경로이므로 동시에 써도 결과가 같다
+            _write_atomic(path, data)
+            added = len(data)
+        else:
+            os.utime(path)
+
+        os.makedirs(self.directory, exist_ok=True)
+        with file_lock(self.lock_path):
+            urls = self._read_manifest()
+            urls[key] = {
+                'sha256': sha256,
+                'ext': ext,
+                'size': len(data),
+                'etag': (validators or {}).get('etag'),
+                'last_modified': (validators or {}).get('last_modified'),
+            }
+            self._write_manifest(urls)
+            with self._lock:
+                if self._size is None:
+                    self._size = self._total_size()
+                else:
+                    self._size += added
+                over = self._size > self.max_bytes
+            if over:
+                self._evict(urls, keep=(path,))
+        return path
+
+    def _objects(self) -> List[os.DirEntry]:
+        root = os.path.join(self.directory, 'objects')
+        entries = []
+        if not os.path.isdir(root):
+            return entries
+        for shard in os.scandir(root):
+            if shard.is_dir():
+                entries.extend(e for e in os.scandir(shard.path) if e.is_file() and not e.name.endswith('.tmp'))
+        return entries
+
+    def _total_size(self) -> int:
+        total = 0
+        for entry in self._objects():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self, urls: Dict[str, Dict[str, Any]], keep: Iterable[str] = ()) -> int:
+        # 호출자가 file_lock을 잡고 있어야 한다
+        keep = set(keep)
+        items = []
+        for entry in self._objects():
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            items.append((st.st_mtime, st.st_size, entry.path))
+        items.sort()
+        total = sum(size for _, size, _ in items)
+        target = int(self.max_bytes * self.EVICT_RATIO)
+        removed = set()
+        for _, size, path in items:
+            if total <= target:
+                break
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed.add(os.path.basename(path))
+        with self._lock:
+            self._size = total
+        if removed:
+            for key in [k for k, v in urls.items() if v.get('sha256', '') + v.get('ext', '.ttf') in removed]:
+                del urls[key]
+            self._write_manifest(urls)
+        return len(removed)
+
+    def evict(self) -> int:
+        """max_bytes의 EVICT_RATIO 이하가 될 때까지 오래 사용하지 않은 폰트부터 삭제, 삭제한 개수 반환"""
+        if not os.path.isdir(self.directory):
+            return 0
+        with file_lock(self.lock_path):
+            return self._evict(self._read_manifest())
+
+    def stats(self) -> Dict[str, Any]:
+        return {'fonts': len(self._objects()), 'keys': len(self._manifest()), 'bytes': self._total_size(),
+                'max_bytes': self.max_bytes}
+
+
+@lru_cache(maxsize=None)
+def open_font_store(directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> FontStore:
+    """디렉토리별로 프로세스당 하나의 FontStore"""
+    return FontStore(directory, max_bytes)
+
+
+def configured_font_store() -> Optional[FontStore]:
+    """환경 변수(--font-store)로 지정된 폰트 저장소 (미지정 시 None → 기존 fonts 디렉토리 사용)"""
+    directory = os.environ.get(FONT_STORE_ENV)
+    if not directory:
+        return None
+    try:
+        max_mb = float(os.environ.get(FONT_STORE_MAX_MB_ENV) or 0)
+    except ValueError:
+        max_mb = 0
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb > 0 else DEFAULT_MAX_BYTES
+    return open_font_store(os.path.abspath(directory), max_bytes)
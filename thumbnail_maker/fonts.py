@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+폰트 핸들 캐시 및 폰트 파일 인덱스
+"""
+
+import io
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from PIL import ImageFont
+
+from .cache import LRUCache, file_digest
+from .package import ThlPackage, is_package_uri, read_source
+from .woff import WEB_FONT_EXTS, font_format, to_sfnt
+
+
+# (경로, (mtime_ns, 크기), 크기, 인덱스, 레이아웃 엔진) -> FreeTypeFont
+font_cache = LRUCache(maxsize=64)
+
+# WOFF/WOFF2 원본 (경로, mtime_ns, 크기) -> 디코딩한 sfnt 바이트 (크기가 달라도 한 번만 디코딩)
+sfnt_cache = LRUCache(maxsize=32, max_bytes=256 * 1024 * 1024, sizeof=len)
+
+
+def load_sfnt(path: str) -> bytes:
+    """WOFF/WOFF2 폰트를 메모리에서 sfnt(TTF/OTF) 바이트로 디코딩 (캐시, 변환 파일을 쓰지 않음)
+
+    .thl 패키지 가상 경로는 패키지 버전이 경로에 들어 있으므로 경로 자체를 키로 쓴다.
+    형식이 올바르지 않으면 ValueError, 디코더가 없으면 RuntimeError.
+    """
+    if is_package_uri(path):
+        key = path
+    else:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+    return sfnt_cache.get_or_create(key, lambda: to_sfnt(read_source(path))[0])
+
+
+def load_truetype(
+    path: str,
+    size: int,
+    index: int = 0,
+    layout_engine: Optional[int] = None
+) -> ImageFont.FreeTypeFont:
+    """캐시를 거쳐 TrueType/OpenType 폰트 로드
+
+    같은 (경로, 크기, 인덱스, 레이아웃 엔진) 조합은 프로세스 안에서 한 번만 파싱된다.
+    파일이 같은 경로에 다시 기록되면(mtime/크기 변경) 새로 로드한다 (font_resolver.stamp 참고).
+    경로가 절대경로가 아니면 현재 작업 디렉토리 기준으로 정규화해 키로 사용한다.
+    .thl 패키지 안 폰트(가상 경로)는 메모리의 내용을 BytesIO로 넘겨 로드한다.
+    WOFF/WOFF2는 load_sfnt로 메모리에서 디코딩한 바이트를 넘긴다.
+    로드 실패 시 ImageFont.truetype과 동일하게 OSError를 던지며, 실패는 캐시하지 않는다.
+    """
+    in_package = is_package_uri(path)
+    if not in_package and (os.path.isabs(path) or os.sep in path or (os.altsep and os.altsep in path)):
+        path = os.path.abspath(path)
+    # 같은 경로에 다시 기록된 폰트를 구분하도록 (mtime_ns, 크기)를 키에 넣는다 (패키지 경로에는 이미 들어 있음)
+    stamp = None if in_package else font_resolver.stamp(path)
+
+    def load() -> ImageFont.FreeTypeFont:
+        source = path
+        try:
+            if in_package:
+                data = read_source(path)
+                source = io.BytesIO(load_sfnt(path) if font_format(data) in WEB_FONT_EXTS else data)
+            elif os.path.splitext(path)[1].lower() in WEB_FONT_EXTS:
+                source = io.BytesIO(load_sfnt(path))
+        except (ValueError, RuntimeError) as e:
+            raise OSError(f"폰트 디코딩 실패: {path}, {e}") from e
+        return ImageFont.truetype(source, int(size), index=int(index), layout_engine=layout_engine)
+
+    return font_cache.get_or_create((path, stamp, int(size), int(index), layout_engine), load)
+
+
+class FontResolver:
+    """폰트 디렉토리 파일 인덱스
+
+    디렉토리별로 파일 목록을 한 번 읽어 두고 이후 조회는 메모리에서만 처리한다.
+    찾는 파일이 없을 때만(최대 MISS_RECHECK초에 한 번) 디렉토리 mtime을 확인해
+    외부에서 추가된 파일을 반영하므로, 정상 상태의 렌더링에서는 파일시스템 조회가 없다.
+    폰트를 직접 기록한 쪽은 invalidate()로 즉시 갱신을 요청한다.
+    """
+
+    MISS_RECHECK = 2.0
+    # 폰트 파일 (mtime_ns, 크기)를 다시 확인하는 최소 간격
+    STAMP_RECHECK = 2.0
+
+    def __init__(self):
+        # 디렉토리 -> (mtime_ns 또는 None, 파일명 집합, 마지막 확인 시각)
+        self._index: Dict[str, Tuple[Optional[int], FrozenSet[str], float]] = {}
+        # 파일 경로 -> ((mtime_ns, 크기) 또는 None, 마지막 확인 시각)
+        self._stamps: Dict[str, Tuple[Optional[Tuple[int, int]], float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scan(directory: str) -> Tuple[Optional[int], FrozenSet[str]]:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            names = frozenset(
+                entry.name for entry in os.scandir(directory) if entry.is_file()
+            )
+        except OSError:
+            return None, frozenset()
+        return mtime, names
+
+    def _names(self, directory: str, recheck: bool) -> FrozenSet[str]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._index.get(directory)
+        if entry is not None:
+            mtime, names, checked = entry
+            if not recheck or now - checked < self.MISS_RECHECK:
+                return names
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                current = None
+            if current == mtime:
+                with self._lock:
+                    self._index[directory] = (mtime, names, now)
+                return names
+        mtime, names = self._scan(directory)
+        with self._lock:
+            self._index[directory] = (mtime, names, now)
+        return names
+
+    def lookup(self, directory: str, filenames: Sequence[str]) -> Optional[str]:
+        """directory 안에서 filenames 중 처음으로 존재하는 파일의 경로 반환"""
+        directory = os.path.abspath(directory)
+        for recheck in (False, True):
+            names = self._names(directory, recheck)
+            for filename in filenames:
+                if filename in names:
+                    return os.path.join(directory, filename)
+        return None
+
+    def lookup_prefix(self, directory: str, prefix: str) -> Optional[str]:
+        """directory 안에서 이름이 prefix로 시작하는 첫 파일의 경로 (이름순)"""
+        directory = os.path.abspath(directory)
+        for recheck in (False, True):
+            names = sorted(name for name in self._names(directory, recheck) if name.startswith(prefix))
+            if names:
+                return os.path.join(directory, names[0])
+        return None
+
+    def stamp(self, path: str) -> Optional[Tuple[int, int]]:
+        """폰트 파일의 (mtime_ns, 크기) (최대 STAMP_RECHECK초에 한 번만 stat, 없으면 None)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._stamps.get(path)
+        if entry is not None and now - entry[1] < self.STAMP_RECHECK:
+            return entry[0]
+        try:
+            st = os.stat(path)
+            value = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            value = None
+        with self._lock:
+            self._stamps[path] = (value, now)
+        return value
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """인덱스와 파일 stamp 무효화 (directory 생략 시 전체)
+
+        폰트 파일을 기록한 쪽이 호출하므로, 같은 경로에 다시 쓴 폰트도 다음 로드부터 반영된다.
+        """
+        with self._lock:
+            if directory is None:
+                self._index.clear()
+                self._stamps.clear()
+            else:
+                directory = os.path.abspath(directory)
+                self._index.pop(directory, None)
+                for path in [p for p in self._stamps if os.path.dirname(p) == directory]:
+                    del self._stamps[path]
+
+
+font_resolver = FontResolver()
+
+
+def install_package_fonts(package: ThlPackage, fonts_dir: str) -> List[str]:
+    """패키지 fonts/의 폰트를 공용 fonts 디렉토리에 기록, 기록한 파일명 반환
+
+    없거나 내용이 다른 폰트만 기록한다. 서브셋 폰트는 이름이 달라('.subset-<해시>')
+    같은 이름의 전체 폰트를 덮어쓰지 않는다.
+    """
+    written = []
+    for name, data in package.members.items():
+        if not name.startswith('fonts/') or '/' in name[len('fonts/'):]:
+            continue
+        dst_path = os.path.join(fonts_dir, name[len('fonts/'):])
+        if file_digest(dst_path) == package.digest(name):
+            continue
+        os.makedirs(fonts_dir, exist_ok=True)
+        with open(dst_path, 'wb') as f:
+            f.write(data)
+        written.append(os.path.basename(dst_path))
+    if written:
+        font_resolver.invalidate(fonts_dir)
+    return written
@@ -10,9 +10,13 @@ import base64
 import tempfile
 import zipfile
 import shutil
-from typing import Dict
+from typing import Dict, Optional
 
+from ..fonts import install_package_fonts
+from ..package import open_package, read_source
 from ..renderer import ThumbnailRenderer, sanitize
+from ..subset import charset_text, dsl_text, subset_font, subset_font_name
+from .widgets import WORD_WRAP_MODES, word_wrap_index
 
 
 class DSLManager:
@@ -94,7 +98,7 @@ class DSLManager:
                 'fontWeight': gui.title_font_weight.currentText() or 'bold',
                 'fontStyle': gui.title_font_style.currentText() or 'normal',
                 'lineHeight': 1.1,
-                'wordWrap': gui.title_word_wrap.isChecked(),
+                'wordWrap': WORD_WRAP_MODES[gui.title_word_wrap.currentIndex()][1],
                 'outline': {
                     'thickness': gui.title_outline_thickness.value(),
                     'color': '#000000'
@@ -122,7 +126,7 @@ class DSLManager:
             'fontWeight': gui.subtitle_font_weight.currentText() or 'normal',
             'fontStyle': gui.subtitle_font_style.currentText() or 'normal',
             'lineHeight': 1.1,
-            'wordWrap': gui.subtitle_word_wrap.isChecked(),
+            'wordWrap': WORD_WRAP_MODES[gui.subtitle_word_wrap.currentIndex()][1],
             'outline': None,
             'enabled': gui.subtitle_visible.isChecked()
         })
@@ -224,7 +228,7 @@ class DSLManager:
                 else:
                     gui.title_outline_check.setChecked(False)
                 
-                gui.title_word_wrap.setChecked(txt.get('wordWrap', False))
+                gui.title_word_wrap.setCurrentIndex(word_wrap_index(txt.get('wordWrap', False)))
                 
             elif txt_type == 'subtitle':
                 subtitle_found = True
@@ -256,7 +260,7 @@ class DSLManager:
                     gui.subtitle_font_weight.setCurrentText(face.get('weight', 'normal'))
                     gui.subtitle_font_style.setCurrentText(face.get('style', 'normal'))
                 
-                gui.subtitle_word_wrap.setChecked(txt.get('wordWrap', False))
+                gui.subtitle_word_wrap.setCurrentIndex(word_wrap_index(txt.get('wordWrap', False)))
         
         # 부제목이 DSL에 없으면 체크 해제
         if not subtitle_found:
@@ -266,11 +270,18 @@ class DSLManager:
         gui.update_preview()
     
     @staticmethod
-    def save_thl_package(gui, file_path: str):
-        """현재 DSL과 사용 폰트를 묶어 .thl 패키지로 저장"""
+    def save_thl_package(gui, file_path: str, subset_charset: Optional[str] = None):
+        """현재 DSL과 사용 폰트를 묶어 .thl 패키지로 저장
+
+        subset_charset이 주어지면 폰트를 템플릿 텍스트 + 해당 문자 집합('ascii,hangul' 등,
+        빈 문자열이면 템플릿 텍스트만)의 글리프만 남기도록 서브셋해서 넣는다.
+        """
         if not hasattr(gui, 'current_dsl'):
             gui.update_preview()
         dsl = getattr(gui, 'current_dsl', DSLManager.generate_dsl(gui))
+        keep_text = None
+        if subset_charset is not None:
+            keep_text = dsl_text(dsl) + charset_text(subset_charset)
         
         staging = None
         try:
@@ -287,13 +298,27 @@ class DSLManager:
             except Exception as e:
                 print(f"폰트 확보 경고: {e}")
 
-            # faces를 순회하여 예상 파일명으로 복사
+            # faces를 순회하여 예상 파일명으로 복사 (WOFF/WOFF2는 형식 그대로 넣는다)
             faces = ThumbnailRenderer.parse_font_faces(texts)
             for face in faces:
-                ttf_name = f"{sanitize(face.get('name','Font'))}-{sanitize(str(face.get('weight','normal')))}-{sanitize(str(face.get('style','normal')))}.ttf"
-                src_path = os.path.join(ThumbnailRenderer._fonts_dir(), ttf_name)
-                if os.path.exists(src_path):
-                    shutil.copy2(src_path, os.path.join(fonts_dir, ttf_name))
+                base_name = f"{sanitize(face.get('name','Font'))}-{sanitize(str(face.get('weight','normal')))}-{sanitize(str(face.get('style','normal')))}"
+                # 폰트 저장소(--font-store)를 쓰는 경우에도 찾도록 face URL로 조회
+                src_path = ThumbnailRenderer.find_font_path(
+                    face.get('name', 'Font'), str(face.get('weight', 'normal')), str(face.get('style', 'normal')),
+                    url=face.get('url'),
+                )
+                if not src_path or not os.path.exists(src_path):
+                    continue
+                if keep_text is not None:
+                    try:
+                        data, ext = subset_font(read_source(src_path), keep_text)
+                        # 전체 폰트와 다른 이름으로 넣어 패키지를 연 쪽의 전체 폰트를 덮어쓰지 않게 한다
+                        with open(os.path.join(fonts_dir, subset_font_name(base_name, data, ext)), 'wb') as f:
+                            f.write(data)
+                        continue
+                    except Exception as e:
+                        print(f"폰트 서브셋 실패, 전체 폰트를 넣습니다: {src_path}, {e}")
+                shutil.copy2(src_path, os.path.join(fonts_dir, base_name + os.path.splitext(src_path)[1].lower()))
 
             # thumbnail.json 저장 (원본 DSL 그대로)
             with open(os.path.join(staging, 'thumbnail.json'), 'w', encoding='utf-8') as f:
@@ -313,39 +338,14 @@ class DSLManager:
     
     @staticmethod
     def load_thl_package(gui, file_path: str) -> Dict:
-        """.thl 패키지를 로드하여 DSL 반환"""
-        staging = None
-        cwd_backup = os.getcwd()
-        try:
-            # .thl 파일을 임시 디렉토리에 압축 해제
-            staging = tempfile.mkdtemp(prefix='thl_load_')
-            with zipfile.ZipFile(file_path, 'r') as zf:
-                zf.extractall(staging)
-            
-            # thumbnail.json 읽기
-            dsl_path = os.path.join(staging, 'thumbnail.json')
-            if not os.path.exists(dsl_path):
-                raise FileNotFoundError('패키지에 thumbnail.json이 없습니다.')
-            
-            with open(dsl_path, 'r', encoding='utf-8') as f:
-                dsl = json.load(f)
-            
-            # 폰트 파일을 프로젝트 fonts 디렉토리로 복사
-            fonts_src_dir = os.path.join(staging, 'fonts')
-            if os.path.isdir(fonts_src_dir):
-                fonts_dst_dir = ThumbnailRenderer._fonts_dir()
-                os.makedirs(fonts_dst_dir, exist_ok=True)
-                for font_file in os.listdir(fonts_src_dir):
-                    src_path = os.path.join(fonts_src_dir, font_file)
-                    dst_path = os.path.join(fonts_dst_dir, font_file)
-                    shutil.copy2(src_path, dst_path)
-            
-            return dsl
-        finally:
-            try:
-                os.chdir(cwd_backup)
-            except Exception:
-                pass
-            if staging:
-                shutil.rmtree(staging, ignore_errors=True)
+        """.thl 패키지를 로드하여 DSL 반환
+
+        압축을 풀지 않고 메모리로 읽으며, 미리보기에서 쓰도록 공용 fonts 디렉토리에
+        없는(또는 내용이 다른) 폰트만 기록한다 (서브셋 폰트는 다른 이름으로 기록).
+        """
+        package = open_package(file_path)
+        dsl = package.dsl()
+        install_package_fonts(package, ThumbnailRenderer._fonts_dir())
+
+        return dsl
 
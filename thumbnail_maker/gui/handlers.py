@@ -183,14 +183,14 @@ class EventHandlers:
         # 스레드에서 생성
         from .preview_thread import PreviewThread
         gui.preview_thread = PreviewThread(gui.current_dsl)
-        gui.preview_thread.preview_ready.connect(lambda path: EventHandlers.on_preview_ready(gui, path))
+        gui.preview_thread.preview_ready.connect(lambda data: EventHandlers.on_preview_ready(gui, data))
         gui.preview_thread.start()
     
     @staticmethod
-    def on_preview_ready(gui, file_path):
+    def on_preview_ready(gui, image_data):
         """미리보기 준비됨"""
-        if file_path and os.path.exists(file_path):
-            pixmap = QPixmap(file_path)
+        pixmap = QPixmap()
+        if image_data and pixmap.loadFromData(image_data):
             gui.preview_label.setPixmap(pixmap.scaled(
                 480, 270, Qt.KeepAspectRatio, Qt.SmoothTransformation
             ))
@@ -292,7 +292,10 @@ class EventHandlers:
             return
         try:
             from .dsl_manager import DSLManager
-            DSLManager.save_thl_package(gui, file_path)
+            subset_charset = None
+            if gui.thl_subset_check.isChecked():
+                subset_charset = gui.thl_subset_charset.currentText().strip()
+            DSLManager.save_thl_package(gui, file_path, subset_charset)
             QMessageBox.information(gui, '완료', f'패키지 저장 완료: {file_path}')
         except Exception as e:
             QMessageBox.critical(gui, '에러', f'패키지 저장 실패: {e}')
@@ -10,7 +10,7 @@ from ..renderer import ThumbnailRenderer
 
 class PreviewThread(QThread):
     """미리보기 생성 스레드"""
-    preview_ready = Signal(str)  # preview file path
+    preview_ready = Signal(bytes)  # encoded preview image (빈 바이트면 실패)
     
     def __init__(self, dsl):
         super().__init__()
@@ -18,11 +18,10 @@ class PreviewThread(QThread):
         self.error_message = None
     
     def run(self):
-        preview_path = 'preview_temp.png'
         try:
-            ThumbnailRenderer.render_thumbnail(self.dsl, preview_path)
-            self.preview_ready.emit(preview_path)
+            # 디스크를 거치지 않고 무압축 BMP로 인코딩해 Qt에 바로 전달
+            data = ThumbnailRenderer.render_bytes(self.dsl, 'BMP')
+            self.preview_ready.emit(data)
         except Exception as e:
             self.error_message = str(e)
-            self.preview_ready.emit('')
-
+            self.preview_ready.emit(b'')
@@ -10,6 +10,20 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PySide6.QtCore import Qt
 
 
+# 줄바꿈 콤보박스 항목 (표시 이름, DSL wordWrap 값)
+WORD_WRAP_MODES = [
+    ('줄바꿈 안 함', False),
+    ('단어 단위 줄바꿈', True),
+    ('유니코드 줄바꿈 (한글/CJK)', 'unicode'),
+]
+
+
+def word_wrap_index(value) -> int:
+    """DSL wordWrap 값에 해당하는 WORD_WRAP_MODES 인덱스"""
+    mode = 'unicode' if value == 'unicode' else bool(value)
+    return [m for _, m in WORD_WRAP_MODES].index(mode)
+
+
 class WidgetFactory:
     """위젯 생성 팩토리 클래스"""
     
@@ -43,6 +57,13 @@ class WidgetFactory:
         
         parent.load_thl_btn = QPushButton('패키지 로드(.thl)')
         parent.load_thl_btn.clicked.connect(parent.load_thl_package)
+
+        # 패키지 저장 시 폰트 서브셋 (템플릿 텍스트 + 추가 문자 집합만 남김)
+        parent.thl_subset_check = QCheckBox('폰트 서브셋')
+        parent.thl_subset_charset = QComboBox()
+        parent.thl_subset_charset.setEditable(True)
+        parent.thl_subset_charset.addItems(['ascii', 'ascii,hangul', 'ascii,latin1', ''])
+        parent.thl_subset_charset.setToolTip('템플릿 텍스트 외에 남길 문자 집합 (ascii, latin1, hangul, jamo를 쉼표로 조합)')
         
         btn_layout.addWidget(parent.preview_btn)
         btn_layout.addWidget(parent.save_btn)
@@ -50,6 +71,8 @@ class WidgetFactory:
         btn_layout.addWidget(parent.save_dsl_btn)
         btn_layout.addWidget(parent.load_thl_btn)
         btn_layout.addWidget(parent.save_thl_btn)
+        btn_layout.addWidget(parent.thl_subset_check)
+        btn_layout.addWidget(parent.thl_subset_charset)
         
         layout.addWidget(parent.preview_label)
         layout.addLayout(btn_layout)
@@ -258,8 +281,10 @@ class WidgetFactory:
         layout.addWidget(parent.title_outline_thickness)
 
         # 워드 랩
-        parent.title_word_wrap = QCheckBox('단어 단위 줄바꿈')
-        parent.title_word_wrap.stateChanged.connect(parent.update_preview)
+        parent.title_word_wrap = QComboBox()
+        parent.title_word_wrap.addItems([label for label, _ in WORD_WRAP_MODES])
+        parent.title_word_wrap.currentIndexChanged.connect(parent.update_preview)
+        layout.addWidget(QLabel('줄바꿈:'))
         layout.addWidget(parent.title_word_wrap)
         
         # 위치 (9 그리드)
@@ -373,11 +398,13 @@ class WidgetFactory:
         parent.subtitle_position.currentTextChanged.connect(parent.update_preview)
 
         # 워드 랩
-        parent.subtitle_word_wrap = QCheckBox('단어 단위 줄바꿈')
-        parent.subtitle_word_wrap.stateChanged.connect(parent.update_preview)
+        parent.subtitle_word_wrap = QComboBox()
+        parent.subtitle_word_wrap.addItems([label for label, _ in WORD_WRAP_MODES])
+        parent.subtitle_word_wrap.currentIndexChanged.connect(parent.update_preview)
         
         layout.addWidget(QLabel('위치:'))
         layout.addWidget(parent.subtitle_position)
+        layout.addWidget(QLabel('줄바꿈:'))
         layout.addWidget(parent.subtitle_word_wrap)
         
         layout.addStretch()
@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 렌더링 서비스 (asyncio) - 다른 서비스나 브라우저 미리보기에서 셸 실행 없이 렌더링
+
+    POST /render    {"dsl": {...}} 또는 {"template": "<id>"}
+                    + 선택: "overrides": {"title": "...", "subtitle": {"content": "...", "color": "#fff"}},
+                            "background": "<data URL 또는 --image-root 기준 경로>", "format": "png|jpeg|webp", "quality": 90,
+                            "timings": true (Server-Timing 헤더)
+                    -> 이미지 바이트 (X-Cache: hit/miss)
+    GET  /templates -> 템플릿 폴더의 id 목록
+    GET  /metrics   -> 요청 지연 시간, 대기열 깊이, 캐시 적중률 (JSON)
+
+렌더링은 CPU 수만큼의 워커 프로세스에서 하며, 워커마다 컴파일된 템플릿을 유지한다.
+기본적으로 127.0.0.1에만 바인딩한다.
+
+브라우저의 다른 페이지가 로컬 파일을 읽어 가지 못하도록
+- CORS는 allow_origins(--allow-origin)에 지정한 Origin에만 허용하고, 그 외 Origin의 요청은 403으로 거절한다.
+- 요청으로 받은 배경 이미지(background, DSL의 imagePath)는 data URL 또는 image_root(--image-root) 안의 파일만 허용한다.
+- 요청 DSL의 폰트 URL은 http(s)만 허용한다 (file://, 로컬 경로 거부).
+- 요청 DSL의 폰트는 font_hosts(--allow-font-host)에 지정한 호스트에서만 받는다.
+  오프라인 모드(--offline)에서는 받지 않으므로 이미 있는 폰트만 쓰도록 모두 허용한다.
+"""
+
+import asyncio
+import json
+import os
+import re
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import AbstractSet, Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .cache import LRUCache
+from .render_cache import RenderCache, dsl_key, open_render_cache, variant_key
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_TEMPLATE_ID = re.compile(r'^[\w.-]+$')
+_FORMATS = {'png': ('PNG', 'image/png'), 'jpeg': ('JPEG', 'image/jpeg'), 'jpg': ('JPEG', 'image/jpeg'),
+            'webp': ('WEBP', 'image/webp')}
+_TEMPLATE_EXTENSIONS = ('.thl', '.json')
+
+
+class RenderReply(NamedTuple):
+    """워커 처리 결과 (프로세스 간 전달)"""
+    status: int
+    content_type: str
+    body: bytes
+    cached: bool = False
+    template_cached: bool = False
+    timings: Optional[Dict[str, float]] = None
+
+
+def _error(status: HTTPStatus, message: str) -> RenderReply:
+    body = json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
+    return RenderReply(int(status), 'application/json; charset=utf-8', body)
+
+
+# ---------- 워커 ----------
+
+class _WorkerState(NamedTuple):
+    template_dir: Optional[str]
+    cache: Optional[RenderCache]
+    templates: LRUCache
+    image_root: Optional[str] = None
+    font_hosts: FrozenSet[str] = frozenset()
+
+
+_state: Optional[_WorkerState] = None
+
+
+def _init_worker(
+    template_dir: Optional[str],
+    cache_spec: Optional[Tuple[str, int]],
+    image_root: Optional[str] = None,
+    font_hosts: Sequence[str] = ()
+) -> None:
+    global _state
+    cache = open_render_cache(*cache_spec) if cache_spec else None
+    _state = _WorkerState(template_dir, cache, LRUCache(maxsize=64), image_root, frozenset(font_hosts))
+
+
+def check_image_source(path: Optional[str], image_root: Optional[str]) -> Optional[str]:
+    """요청으로 받은 이미지 경로 검사 후 실제로 읽을 경로 반환
+
+    data URL은 그대로, 파일 경로는 image_root 기준으로 해석해 그 안에 있을 때만 허용한다
+    (image_root가 없으면 파일 경로는 모두 거부). 허용하지 않으면 PermissionError.
+    """
+    if not path or path.startswith('data:image'):
+        return path
+    if not image_root:
+        raise PermissionError("이미지 파일 경로는 허용되지 않습니다 (data URL을 쓰거나 서버를 --image-root로 실행)")
+    resolved = os.path.realpath(os.path.join(image_root, path))
+    if os.path.commonpath([resolved, image_root]) != image_root:
+        raise PermissionError(f"이미지 폴더 밖의 경로입니다: {path}")
+    return resolved
+
+
+def check_request_dsl(
+    dsl: Dict[str, Any],
+    image_root: Optional[str],
+    font_hosts: AbstractSet[str] = frozenset()
+) -> Dict[str, Any]:
+    """요청 DSL의 자원 참조 검사 (배경 imagePath 제한, 폰트 URL은 font_hosts의 http(s)만)
+
+    font_hosts에 '*'가 있거나 오프라인 모드이면 모든 http(s) 폰트 호스트를 허용한다.
+    imagePath를 실제로 읽을 경로로 바꾼 복사본을 반환한다. 허용하지 않으면 PermissionError.
+    """
+    from .font_fetch import is_offline
+
+    any_host = '*' in font_hosts or is_offline()
+    thumbnail = dsl.get('Thumbnail')
+    if not isinstance(thumbnail, dict):
+        return dsl
+    for txt in thumbnail.get('Texts') or ():
+        font = txt.get('font') if isinstance(txt, dict) else None
+        for face in (font.get('faces') or ()) if isinstance(font, dict) else ():
+            url = face.get('url') if isinstance(face, dict) else None
+            if not url:
+                continue
+            parts = urlsplit(str(url))
+            if parts.scheme.lower() not in ('http', 'https'):
+                raise PermissionError(f"허용되지 않는 폰트 URL입니다 (http/https만 가능): {url}")
+            if not any_host and (parts.hostname or '').lower() not in font_hosts:
+                raise PermissionError(f"허용되지 않는 폰트 호스트입니다 (--allow-font-host로 지정): {url}")
+    background = thumbnail.get('Background')
+    if isinstance(background, dict) and background.get('imagePath'):
+        image_path = check_image_source(str(background['imagePath']), image_root)
+        thumbnail = dict(thumbnail, Background=dict(background, imagePath=image_path))
+        dsl = dict(dsl, Thumbnail=thumbnail)
+    return dsl
+
+
+def find_template(template_dir: Optional[str], template_id: str) -> Optional[str]:
+    """템플릿 id(파일 이름에서 확장자를 뺀 것)의 .thl/.json 경로 (폴더 밖 경로는 허용하지 않음)"""
+    if not template_dir or not _TEMPLATE_ID.match(template_id) or template_id.startswith('.'):
+        return None
+    for ext in _TEMPLATE_EXTENSIONS:
+        path = os.path.join(template_dir, template_id + ext)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def list_templates(template_dir: Optional[str]) -> List[str]:
+    if not template_dir or not os.path.isdir(template_dir):
+        return []
+    ids = {os.path.splitext(name)[0] for name in os.listdir(template_dir)
+           if name.lower().endswith(_TEMPLATE_EXTENSIONS)}
+    return sorted(ids)
+
+
+def _compile(
+    state: _WorkerState,
+    payload: Dict[str, Any],
+    timings,
+    with_key: bool
+) -> Tuple[Any, Optional[str], bool, Dict]:
+    """(Template, 렌더링 캐시용 템플릿 키, 워커 템플릿 캐시 적중 여부, DSL의 텍스트 내용 overrides)
+
+    인라인 DSL은 텍스트 내용을 뺀 키(template_key)로 컴파일된 템플릿을 공유하고 내용은 overrides로 넣는다.
+    렌더링 캐시 키(dsl_key, 폰트 확보/해시 포함)는 with_key일 때만 계산한다.
+    """
+    from .cli import staged_dsl
+    from .daemon import template_key
+    from .search_path import CWD
+    from .template import compile_template
+
+    if 'dsl' in payload:
+        dsl = payload['dsl']
+        if not isinstance(dsl, dict):
+            raise ValueError("'dsl'은 객체여야 합니다")
+        dsl = check_request_dsl(dsl, state.image_root, state.font_hosts)
+        layout_key, contents = template_key(dsl, CWD)
+        hit = ('dsl', layout_key) in state.templates
+        template = state.templates.get_or_create(('dsl', layout_key), lambda: compile_template(dsl, timings))
+        return template, dsl_key(dsl) if with_key else None, hit, contents
+
+    template_id = str(payload.get('template', ''))
+    path = find_template(state.template_dir, template_id)
+    if path is None:
+        raise LookupError(f"템플릿을 찾을 수 없습니다: {template_id}")
+    st = os.stat(path)
+    cache_key = ('template', path, st.st_mtime_ns, st.st_size)
+
+    def compile_file():
+        with staged_dsl(path) as (dsl, search_path):
+            return compile_template(dsl, timings, search_path)
+
+    def file_key():
+        with staged_dsl(path) as (dsl, search_path):
+            return dsl_key(dsl, search_path)
+
+    hit = cache_key in state.templates
+    template = state.templates.get_or_create(cache_key, compile_file)
+    key = state.templates.get_or_create(('key',) + cache_key, file_key) if with_key else None
+    return template, key, hit, {}
+
+
+def render_request(payload: Dict[str, Any]) -> RenderReply:
+    """POST /render 본문 처리 (워커 프로세스에서 실행)"""
+    from .timing import Timings
+
+    if _state is None:
+        _init_worker(None, None)
+    state = _state
+
+    fmt = str(payload.get('format', 'png')).lower()
+    if fmt not in _FORMATS:
+        return _error(HTTPStatus.BAD_REQUEST, f"지원하지 않는 형식: {fmt}")
+    pil_format, content_type = _FORMATS[fmt]
+    encoder_opts = {}
+    if payload.get('quality') is not None and pil_format != 'PNG':
+        encoder_opts['quality'] = int(payload['quality'])
+
+    overrides = payload.get('overrides') or None
+    background = payload.get('background') or None
+    timings = Timings() if payload.get('timings') else None
+
+    try:
+        if overrides is not None and not isinstance(overrides, dict):
+            raise ValueError("'overrides'는 객체여야 합니다")
+        background = check_image_source(background, state.image_root)
+        # 렌더링 캐시는 기본 인코딩(PNG)만 사용
+        cache = state.cache if pil_format == 'PNG' else None
+        template, base_key, template_hit, contents = _compile(state, payload, timings, cache is not None)
+
+        if cache is not None:
+            key = variant_key(base_key, overrides, background) if (overrides or background) else base_key
+            data = cache.load(key)
+            if data is not None:
+                return RenderReply(200, content_type, data, True, template_hit,
+                                   timings.as_dict() if timings else None)
+
+        # DSL의 텍스트 내용을 먼저, 요청 overrides를 나중에 적용한다
+        data = template.render_bytes({**contents, **(overrides or {})} or None, pil_format,
+                                     background=background, timings=timings, **encoder_opts)
+        if cache is not None:
+            cache.store(key, data)
+        return RenderReply(200, content_type, data, False, template_hit, timings.as_dict() if timings else None)
+    except LookupError as e:
+        # 없는 템플릿 id(LookupError)는 404, 템플릿에 없는 텍스트 키(KeyError)는 400
+        if isinstance(e, KeyError):
+            return _error(HTTPStatus.BAD_REQUEST, f"템플릿에 없는 텍스트: {e.args[0] if e.args else e}")
+        return _error(HTTPStatus.NOT_FOUND, str(e))
+    except PermissionError as e:
+        return _error(HTTPStatus.FORBIDDEN, str(e))
+    except (ValueError, TypeError, FileNotFoundError) as e:
+        return _error(HTTPStatus.BAD_REQUEST, str(e))
+    except Exception as e:
+        return _error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+
+
+# ---------- 지표 ----------
+
+class Metrics:
+    """요청 지연 시간(최근 window개), 대기열, 캐시 적중 집계 (이벤트 루프 스레드에서만 갱신)"""
+
+    def __init__(self, workers: int, window: int = 1024):
+        self.workers = workers
+        self.started = time.monotonic()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.pending = 0
+        self.render_hits = 0
+        self.render_lookups = 0
+        self.template_hits = 0
+        self.template_lookups = 0
+
+    def record(self, reply: RenderReply, elapsed: float, cache_enabled: bool) -> None:
+        self.requests += 1
+        self.latencies.append(elapsed)
+        if reply.status != 200:
+            self.errors += 1
+            return
+        self.template_lookups += 1
+        self.template_hits += reply.template_cached
+        if cache_enabled and reply.content_type == 'image/png':
+            self.render_lookups += 1
+            self.render_hits += reply.cached
+
+    @staticmethod
+    def _rate(hits: int, lookups: int) -> Dict[str, Any]:
+        return {'hits': hits, 'lookups': lookups, 'hit_rate': hits / lookups if lookups else 0.0}
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+        return {
+            'uptime_s': round(time.monotonic() - self.started, 1),
+            'workers': self.workers,
+            'requests': {'total': self.requests, 'errors': self.errors, 'rejected': self.rejected,
+                         'in_flight': self.pending},
+            'queue_depth': max(0, self.pending - self.workers),
+            'latency_ms': {
+                'count': len(latencies),
+                'mean': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+                'p50': percentile(0.5),
+                'p90': percentile(0.9),
+                'p99': percentile(0.99),
+                'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+            'render_cache': self._rate(self.render_hits, self.render_lookups),
+            'template_cache': self._rate(self.template_hits, self.template_lookups),
+        }
+
+
+# ---------- HTTP 서버 ----------
+
+class RenderHTTPServer:
+    """POST /render, GET /templates, GET /metrics를 처리하는 asyncio HTTP/1.1 서버"""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        jobs: Optional[int] = None,
+        template_dir: Optional[str] = None,
+        cache: Optional[RenderCache] = None,
+        max_pending: Optional[int] = None,
+        allow_origins: Sequence[str] = (),
+        image_root: Optional[str] = None,
+        font_hosts: Sequence[str] = ()
+    ):
+        self.host = host
+        self.port = port
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        self.template_dir = os.path.abspath(template_dir) if template_dir else None
+        self.cache = cache
+        # CORS를 허용할 Origin ('*'를 넣으면 모두 허용), 비어 있으면 브라우저 교차 출처 요청은 모두 거절
+        self.allow_origins = frozenset(allow_origins)
+        self.image_root = os.path.realpath(image_root) if image_root else None
+        # 요청 DSL의 웹 폰트를 받을 호스트 ('*'를 넣으면 모두 허용)
+        self.font_hosts = tuple(host.lower() for host in font_hosts)
+        # 대기열이 이보다 길면 503으로 거절 (과부하 시 지연 시간이 끝없이 늘어나지 않도록)
+        self.max_pending = max_pending or self.jobs * 8
+        self.metrics = Metrics(self.jobs)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+
+    async def start(self) -> int:
+        """리스닝 시작, 실제 포트 반환 (port=0이면 임의 포트)"""
+        cache_spec = (self.cache.directory, self.cache.max_bytes) if self.cache is not None else None
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=_init_worker,
+            initargs=(self.template_dir, cache_spec, self.image_root, self.font_hosts),
+        )
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # keep-alive로 열려 있는 연결 정리
+        for task in list(self._connections):
+            task.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._write(writer, _error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, '요청 본문이 너무 큽니다'),
+                                      keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                origin = headers.get('origin')
+                if origin is not None and not self._origin_allowed(origin):
+                    reply = _error(HTTPStatus.FORBIDDEN, f"허용되지 않은 Origin입니다: {origin}")
+                    origin = None
+                else:
+                    reply = await self._dispatch(method.upper(), urlsplit(target).path, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self._write(writer, reply, keep_alive, origin)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    def _origin_allowed(self, origin: str) -> bool:
+        return '*' in self.allow_origins or origin in self.allow_origins
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> RenderReply:
+        if method == 'OPTIONS':
+            return RenderReply(int(HTTPStatus.NO_CONTENT), 'text/plain', b'')
+        if path == '/metrics' and method == 'GET':
+            return self._json(self.metrics.snapshot())
+        if path == '/templates' and method == 'GET':
+            return self._json({'templates': list_templates(self.template_dir)})
+        if path == '/render':
+            if method != 'POST':
+                return _error(HTTPStatus.METHOD_NOT_ALLOWED, 'POST만 지원합니다')
+            return await self._render(body)
+        return _error(HTTPStatus.NOT_FOUND, f"없는 경로: {path}")
+
+    async def _render(self, body: bytes) -> RenderReply:
+        try:
+            payload = json.loads(body.decode('utf-8'))
+        except ValueError as e:
+            return _error(HTTPStatus.BAD_REQUEST, f"JSON 파싱 실패: {e}")
+        if not isinstance(payload, dict) or not ('dsl' in payload or 'template' in payload):
+            return _error(HTTPStatus.BAD_REQUEST, "'dsl' 또는 'template'이 필요합니다")
+        if self.metrics.pending >= self.max_pending:
+            self.metrics.rejected += 1
+            return _error(HTTPStatus.SERVICE_UNAVAILABLE, '대기열이 가득 찼습니다')
+
+        start = time.perf_counter()
+        self.metrics.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            reply = await loop.run_in_executor(self._executor, render_request, payload)
+        except Exception as e:
+            reply = _error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}")
+        finally:
+            self.metrics.pending -= 1
+        self.metrics.record(reply, time.perf_counter() - start, self.cache is not None)
+        return reply
+
+    @staticmethod
+    def _json(obj: Any) -> RenderReply:
+        return RenderReply(200, 'application/json; charset=utf-8', json.dumps(obj, ensure_ascii=False).encode('utf-8'))
+
+    @staticmethod
+    async def _write(
+        writer: asyncio.StreamWriter,
+        reply: RenderReply,
+        keep_alive: bool,
+        origin: Optional[str] = None
+    ) -> None:
+        status = HTTPStatus(reply.status)
+        headers = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {reply.content_type}",
+            f"Content-Length: {len(reply.body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if origin is not None:
+            # --allow-origin으로 허용한 Origin에만 (요청한 Origin을 그대로 돌려준다)
+            headers += [
+                f"Access-Control-Allow-Origin: {origin}",
+                "Access-Control-Allow-Methods: GET, POST, OPTIONS",
+                "Access-Control-Allow-Headers: Content-Type",
+                "Vary: Origin",
+            ]
+        if reply.status == 200 and reply.content_type.startswith('image/'):
+            headers.append(f"X-Cache: {'hit' if reply.cached else 'miss'}")
+        if reply.timings:
+            headers.append('Server-Timing: ' + ', '.join(f"{name};dur={ms}" for name, ms in reply.timings.items()))
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + reply.body)
+        await writer.drain()
+
+
+def serve_http(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    jobs: Optional[int] = None,
+    template_dir: Optional[str] = None,
+    cache: Optional[RenderCache] = None,
+    allow_origins: Sequence[str] = (),
+    image_root: Optional[str] = None,
+    font_hosts: Sequence[str] = ()
+) -> None:
+    """HTTP 렌더링 서비스 실행 (Ctrl+C 또는 SIGTERM으로 종료)"""
+    async def run() -> None:
+        server = RenderHTTPServer(host, port, jobs=jobs, template_dir=template_dir, cache=cache,
+                                  allow_origins=allow_origins, image_root=image_root, font_hosts=font_hosts)
+        await server.start()
+        print(f"HTTP 렌더링 서비스 시작: http://{host}:{server.port} (워커 {server.jobs}개)", flush=True)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        try:
+            await stop.wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    print("HTTP 렌더링 서비스 종료")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.thl 패키지 리더 - 압축을 풀지 않고 thumbnail.json과 폰트/이미지를 메모리에서 읽는다
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import threading
+import zipfile
+from typing import Dict, Optional, Tuple
+
+from .cache import LRUCache, file_digest
+
+
+DSL_MEMBER = 'thumbnail.json'
+
+# 패키지 안 파일을 가리키는 가상 경로: 'thl:<mtime_ns>-<크기>:<패키지 절대 경로>!/<멤버>'
+PACKAGE_PREFIX = 'thl:'
+_MEMBER_SEP = '!/'
+
+
+def _member_name(name: str) -> str:
+    """zip 멤버 이름 정규화 ('./a\\b' -> 'a/b')"""
+    name = posixpath.normpath(name.replace('\\', '/'))
+    return name.lstrip('/') if name != '.' else ''
+
+
+class ThlPackage:
+    """한 번 읽어 둔 .thl 패키지 (모든 멤버를 메모리에 보관)
+
+    패키지 안 파일은 uri()가 돌려주는 가상 경로로 가리키며, fonts.load_truetype과
+    배경 이미지 로더가 이를 BytesIO로 연다. 가상 경로에 패키지의 mtime/크기가 들어가므로
+    패키지 파일이 바뀌면 폰트/배경 캐시 키도 함께 바뀐다.
+    프로세스 풀로 넘길 때는 경로만 전달되고 워커에서 open_package로 다시 연다.
+    """
+
+    def __init__(self, path: str, stamp: str, members: Dict[str, bytes]):
+        self.path = path
+        self.stamp = stamp
+        self.members = members
+        self.nbytes = sum(len(data) for data in members.values())
+        self._digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return open_package, (self.path,)
+
+    def __repr__(self) -> str:
+        return f"ThlPackage({self.path!r}, {len(self.members)} files)"
+
+    def dsl(self) -> Dict:
+        """thumbnail.json (호출마다 새 dict라 수정해도 된다)"""
+        return json.loads(self.members[DSL_MEMBER].decode('utf-8'))
+
+    def has(self, name: str) -> bool:
+        return _member_name(name) in self.members
+
+    def read(self, name: str) -> bytes:
+        try:
+            return self.members[_member_name(name)]
+        except KeyError:
+            raise FileNotFoundError(f"패키지에 파일이 없습니다: {self.path}!/{name}") from None
+
+    def uri(self, name: str) -> str:
+        return f"{PACKAGE_PREFIX}{self.stamp}:{self.path}{_MEMBER_SEP}{_member_name(name)}"
+
+    def digest(self, name: str) -> Optional[str]:
+        """멤버 내용의 SHA-256 (없으면 None)"""
+        name = _member_name(name)
+        with self._lock:
+            cached = self._digests.get(name)
+        if cached is None and name in self.members:
+            cached = hashlib.sha256(self.members[name]).hexdigest()
+            with self._lock:
+                self._digests[name] = cached
+        return cached
+
+
+def _read_package(path: str, stamp: str) -> ThlPackage:
+    with zipfile.ZipFile(path, 'r') as zf:
+        members = {
+            _member_name(info.filename): zf.read(info)
+            for info in zf.infolist() if not info.is_dir()
+        }
+    if DSL_MEMBER not in members:
+        raise FileNotFoundError(f"패키지에 thumbnail.json이 없습니다: {path}")
+    return ThlPackage(path, stamp, members)
+
+
+# (절대 경로, mtime_ns, 크기) -> ThlPackage
+package_cache = LRUCache(maxsize=16, max_bytes=512 * 1024 * 1024, sizeof=lambda package: package.nbytes)
+
+
+def open_package(path: str) -> ThlPackage:
+    """.thl 패키지 열기 (같은 파일이 바뀌지 않았으면 다시 읽지 않고 캐시된 것을 반환)
+
+    파일이 없으면 FileNotFoundError, zip이 아니면 zipfile.BadZipFile.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    stamp = f"{st.st_mtime_ns}-{st.st_size}"
+    return package_cache.get_or_create((path, stamp), lambda: _read_package(path, stamp))
+
+
+def is_package_uri(path: str) -> bool:
+    return isinstance(path, str) and path.startswith(PACKAGE_PREFIX)
+
+
+def _split_uri(uri: str) -> Tuple[str, str, str]:
+    stamp, _, rest = uri[len(PACKAGE_PREFIX):].partition(':')
+    path, _, member = rest.rpartition(_MEMBER_SEP)
+    return path, stamp, member
+
+
+def _package_for(uri: str) -> Tuple[ThlPackage, str]:
+    path, stamp, member = _split_uri(uri)
+    package = open_package(path)
+    if package.stamp != stamp:
+        raise FileNotFoundError(f"패키지가 변경되었습니다: {path}")
+    return package, member
+
+
+def read_source(path: str) -> bytes:
+    """파일 경로 또는 패키지 가상 경로의 내용"""
+    if is_package_uri(path):
+        package, member = _package_for(path)
+        return package.read(member)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def source_digest(path: str) -> Optional[str]:
+    """파일 경로 또는 패키지 가상 경로의 내용 해시 (없으면 None)"""
+    if is_package_uri(path):
+        try:
+            package, member = _package_for(path)
+        except (OSError, zipfile.BadZipFile):
+            return None
+        return package.digest(member)
+    return file_digest(path)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더링 결과 캐시 - 입력(정규화된 DSL + 폰트/이미지 내용 해시)이 같으면 다시 그리지 않는다
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from .background import image_source_digest
+from .cache import detach_hardlink
+from .package import source_digest
+from .renderer import ThumbnailRenderer
+from .search_path import CWD, SearchPath
+
+
+# 렌더링 결과가 달라지는 변경을 하면 올려서 기존 캐시를 무효화한다
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# --cache-dir를 지정하지 않았을 때 사용할 캐시 폴더 (설정 시에만 캐시 사용)
+CACHE_DIR_ENV = 'THUMBNAIL_MAKER_CACHE_DIR'
+
+
+def _canonical(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def normalize_dsl(dsl: Dict, search_path: Optional[SearchPath] = None) -> Dict:
+    """렌더링 결과를 결정하는 값만 남긴 DSL (캐시 키 계산용)
+
+    - 해상도는 실제 픽셀 크기로, 배경 이미지는 내용 해시로 바꾼다 (경로가 달라도 같은 이미지면 같은 키)
+    - 비활성 텍스트는 빼고, 폰트는 실제로 쓰일 폰트 파일의 내용 해시로 바꾼다
+    폰트 파일 조회 전에 ensure_fonts로 faces를 확보한다. 상대 경로는 search_path 기준이다.
+    """
+    thumbnail_config = dsl.get('Thumbnail', {})
+    width, height = ThumbnailRenderer.get_resolution(thumbnail_config.get('Resolution', {}))
+
+    background = dict(thumbnail_config.get('Background') or {})
+    if background.get('type') == 'image':
+        background['imagePath'] = image_source_digest((search_path or CWD).resolve(background.get('imagePath', '')))
+    else:
+        background.pop('imagePath', None)
+
+    texts: List[Dict] = []
+    if 'Texts' in thumbnail_config:
+        try:
+            ThumbnailRenderer.ensure_fonts(thumbnail_config.get('Texts', []))
+        except Exception as e:
+            print(f"폰트 확보 과정 경고: {e}")
+        for txt in thumbnail_config['Texts']:
+            if not txt.get('enabled', True):
+                continue
+            font_spec = (
+                txt.get('font', {}).get('name', 'Arial'),
+                txt.get('fontWeight', 'normal'),
+                txt.get('fontStyle', 'normal'),
+            )
+            font_path = ThumbnailRenderer.find_font_path(
+                *font_spec, search_path, ThumbnailRenderer.face_url(thumbnail_config['Texts'], *font_spec)
+            )
+            normalized = {k: v for k, v in txt.items() if k != 'font'}
+            normalized['font'] = source_digest(font_path) if font_path else None
+            texts.append(normalized)
+
+    return {'format': CACHE_FORMAT, 'size': [width, height], 'background': background, 'texts': texts}
+
+
+def dsl_key(dsl: Dict, search_path: Optional[SearchPath] = None) -> str:
+    """DSL의 렌더링 캐시 키 (SHA-256)"""
+    return hashlib.sha256(_canonical(normalize_dsl(dsl, search_path))).hexdigest()
+
+
+def variant_key(base_key: str, overrides: Optional[Mapping] = None, background: Optional[str] = None) -> str:
+    """템플릿 키(dsl_key)에 Template.render 인자를 더한 캐시 키"""
+    extra = {
+        'overrides': [[str(k), v] for k, v in sorted((overrides or {}).items(), key=lambda kv: str(kv[0]))],
+        'background': image_source_digest(background) if background else None,
+    }
+    return hashlib.sha256(base_key.encode('ascii') + _canonical(extra)).hexdigest()
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """src를 dst에 하드 링크 (다른 파일 시스템 등 링크가 안 되면 복사)"""
+    if os.path.exists(dst):
+        if os.path.samefile(src, dst):
+            return
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+class RenderCache:
+    """내용 주소 기반(키 = 입력 해시) 렌더링 결과 디렉토리
+
+    결과는 '<dir>/<키 앞 2자리>/<키>.png'에 저장되며, 적중 시 출력 경로에 하드 링크(또는 복사)한다.
+    총 크기가 max_bytes를 넘으면 마지막 사용 시각(mtime)이 오래된 것부터 max_bytes의 90%까지 지운다.
+    여러 프로세스가 같은 디렉토리를 함께 써도 되도록 쓰기는 임시 파일 + rename으로 한다.
+    """
+
+    # 정리 시 max_bytes의 이 비율까지 비운다
+    EVICT_RATIO = 0.9
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + '.png')
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """캐시에 있으면 output_path로 내보내고 True"""
+        path = self.path_for(key)
+        try:
+            # 사용 시각 갱신 (LRU 기준)
+            os.utime(path)
+            _link_or_copy(path, output_path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def load(self, key: str) -> Optional[bytes]:
+        """캐시된 결과 바이트 (없으면 None)"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def store(self, key: str, data: bytes) -> Optional[str]:
+        """인코딩된 결과를 캐시에 원자적으로 저장하고 경로를 반환 (max_bytes보다 크면 저장하지 않고 None)"""
+        if len(data) > self.max_bytes:
+            return None
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            # 방금 저장한 결과는 남긴다 (mtime이 같거나 더 오래된 항목이 없어도 지워지지 않도록)
+            self.evict(keep=(path,))
+        return path
+
+    def save(self, key: str, output_path: str, data: bytes) -> None:
+        """결과를 캐시에 저장하고 output_path로 내보낸다 (캐시에 넣지 못하면 output_path에 바로 쓴다)"""
+        path = self.store(key, data)
+        if path is not None:
+            _link_or_copy(path, output_path)
+            return
+        detach_hardlink(output_path)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+
+    def _entries(self) -> List[os.DirEntry]:
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for shard in os.scandir(self.directory):
+            if shard.is_dir():
+                entries.extend(e for e in os.scandir(shard.path) if e.name.endswith('.png'))
+        return entries
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def evict(self, keep: Iterable[str] = ()) -> int:
+        """max_bytes의 EVICT_RATIO 이하가 될 때까지 오래 사용하지 않은 결과부터 삭제, 삭제한 개수 반환
+
+        한도보다 조금 더 비워 두어 한도 근처에서 저장할 때마다 디렉토리 전체를 훑지 않게 한다.
+        keep의 경로는 지우지 않는다.
+        """
+        keep = set(keep)
+        with self._lock:
+            items = []
+            for entry in self._entries():
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                items.append((st.st_mtime, st.st_size, entry.path))
+            items.sort()
+            total = sum(size for _, size, _ in items)
+            target = int(self.max_bytes * self.EVICT_RATIO)
+            removed = 0
+            for _, size, path in items:
+                if total <= target:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            self._size = total
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+@lru_cache(maxsize=None)
+def open_render_cache(directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> RenderCache:
+    """프로세스당 하나의 RenderCache 인스턴스 (워커 프로세스에서 재사용)"""
+    return RenderCache(directory, max_bytes)
+
+
+def render_cache_from_args(args) -> Optional[RenderCache]:
+    """CLI 인자(--cache-dir, --cache-max-mb) 또는 환경 변수로 지정된 렌더링 캐시 (미지정 시 None)"""
+    directory = getattr(args, 'cache_dir', None)
+    if not isinstance(directory, str) or not directory:
+        directory = os.environ.get(CACHE_DIR_ENV) or None
+    if not directory:
+        return None
+    max_mb = getattr(args, 'cache_max_mb', None)
+    max_bytes = int(max_mb * 1024 * 1024) if isinstance(max_mb, (int, float)) and max_mb > 0 else DEFAULT_MAX_BYTES
+    return open_render_cache(os.path.abspath(directory), max_bytes)
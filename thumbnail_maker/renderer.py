@@ -4,25 +4,33 @@
 썸네일 렌더러 - DSL 기반 이미지 생성
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageChops, ImageDraw, ImageFont
 import json
 import re
 import io
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
 import os
 import pathlib
+from functools import lru_cache
 
-import requests
-from fontTools.ttLib import TTFont
-try:
-    import woff2  # from pywoff2
-except Exception:
-    woff2 = None
-try:
-    # Optional: WOFF -> OTF 변환기
-    from woff2otf import woff2otf
-except Exception:
-    woff2otf = None
+# httpx, fontTools, woff2 등은 폰트를 내려받거나 변환할 때만 필요하므로
+# 해당 함수 안에서 import한다 (CLI 시작 시간 단축)
+
+from .background import render_gradient, render_image_layer
+from .cache import detach_hardlink
+from .fonts import font_cache, font_resolver, load_truetype
+from .package import read_source
+from .search_path import CWD, SearchPath
+from .subset import SUBSET_INFIX
+from .text_layout import wrap_words
+from .timing import NULL_TIMINGS
+from .woff import FONT_EXTS, font_format
+
+if TYPE_CHECKING:
+    from .font_store import FontStore
+    from .render_cache import RenderCache
+    from .template import Template
+    from .timing import Timings
 
 
 def sanitize(name: str) -> str:
@@ -30,6 +38,24 @@ def sanitize(name: str) -> str:
     return re.sub(r'[^a-zA-Z0-9\-_]', '_', name)
 
 
+@lru_cache(maxsize=32)
+def _fallback_font(size: int) -> ImageFont.FreeTypeFont:
+    """한글 폴백 폰트 (크기별로 한 번만 탐색)"""
+    # Windows 한글 폴백 (맑은 고딕)
+    for fallback in [
+        os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts', 'malgun.ttf'),
+        os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts', 'malgunsl.ttf'),
+    ]:
+        try:
+            return load_truetype(fallback, size)
+        except Exception:
+            pass
+    try:
+        return load_truetype("arial.ttf", size)
+    except Exception:
+        return ImageFont.load_default()
+
+
 class ThumbnailRenderer:
     """썸네일 렌더러 클래스"""
     
@@ -131,118 +157,187 @@ class ThumbnailRenderer:
         return f"{name}-{weight}-{style}{ext}"
 
     @staticmethod
-    def _font_ttf_filename(face: Dict) -> str:
-        name = sanitize(face.get('name', 'Font'))
-        weight = sanitize(str(face.get('weight', 'normal')))
-        style = sanitize(str(face.get('style', 'normal')))
-        return f"{name}-{weight}-{style}.ttf"
+    def _local_font_path(url: str) -> Optional[str]:
+        """face url이 로컬 파일(file:// 또는 존재하는 절대 경로)이면 그 경로"""
+        from urllib.parse import urlparse
+
+        parsed = urlparse(url)
+        if parsed.scheme == 'file':
+            return os.path.abspath(parsed.path)
+        if os.path.isabs(url) and os.path.exists(url):
+            return os.path.abspath(url)
+        return None
 
     @staticmethod
-    def _download(url: str, dest_path: str) -> None:
-        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-        r = requests.get(url, timeout=30)
-        r.raise_for_status()
-        with open(dest_path, 'wb') as f:
-            f.write(r.content)
+    def _font_file_bytes(source_path: str, ext: str) -> Tuple[bytes, str]:
+        """원본 폰트 파일의 (바이트, 형식 확장자)
+
+        WOFF/WOFF2도 변환하지 않고 그대로 둔다 (로드할 때 fonts.load_sfnt가 메모리에서 디코딩).
+        확장자는 내용의 시그니처로 정하고, 판별할 수 없으면 ValueError.
+        """
+        data = read_source(source_path)
+        fmt = font_format(data)
+        if fmt is None:
+            raise ValueError(f"지원하지 않는 폰트 형식입니다 ({ext or '확장자 없음'})")
+        return data, fmt
 
     @staticmethod
-    def _convert_woff_to_ttf(woff_path: str, ttf_path: str) -> None:
-        # 우선 woff -> otf 변환이 가능하면 사용
-        if woff2otf is not None:
-            otf_path = os.path.splitext(ttf_path)[0] + '.otf'
-            with open(woff_path, 'rb') as rf:
-                woff_bytes = rf.read()
-            otf_bytes = woff2otf(woff_bytes)
-            with open(otf_path, 'wb') as wf:
-                wf.write(otf_bytes)
+    def _ensure_fonts_in_store(store: 'FontStore', faces: List[Dict], refresh: bool) -> None:
+        """faces를 내용 주소 기반 폰트 저장소(--font-store)에 확보 (URL별로 저장, 이름 충돌 없음)"""
+        from urllib.parse import urlparse
+        from .font_fetch import download, map_concurrently
+
+        # (url, 저장소 키, 로컬 원본 경로 또는 None, 확장자, 이미 있는지)
+        pending = []
+        for face in faces:
+            url = face.get('url')
+            if not url:
+                continue
+            local_path = ThumbnailRenderer._local_font_path(url)
+            key = store.key_for(url)
+            present = store.lookup(key) is not None
+            if present and not (refresh and local_path is None):
+                continue
+            ext = pathlib.Path(local_path or urlparse(url).path).suffix.lower() or '.ttf'
+            pending.append((url, key, local_path, ext, present))
+        if not pending:
             return
-        # 폴백: fontTools를 사용한 시도 (환경에 따라 실패할 수 있음)
-        font = TTFont(woff_path)
-        font.flavor = None
-        font.save(ttf_path)
 
-    @staticmethod
-    def _convert_woff2_to_ttf(woff2_path: str, ttf_path: str) -> None:
-        if woff2 is None:
-            raise RuntimeError("pywoff2 모듈이 필요합니다 (requirements.txt 참고)")
-        # pywoff2는 파일 경로 기반 변환 지원
-        # 파일 내용을 직접 디코딩해서 저장하는 방식으로 처리
-        with open(woff2_path, 'rb') as f:
-            data = f.read()
-        decompressed = woff2.decompress(data)
-        with open(ttf_path, 'wb') as f:
-            f.write(decompressed)
+        def fetch_one(item):
+            url, key, local_path, ext, present = item
+            if local_path is not None:
+                return None
+            entry = store.entry(key) if present else None
+            return download(url, store.incoming_path(ext), entry, refresh, failures=store.failures)
+
+        # 원격 원본을 한 번에 동시 다운로드 (재검증은 manifest의 ETag/Last-Modified 사용)
+        results = map_concurrently(fetch_one, pending)
+
+        changed = False
+        for (url, key, local_path, ext, present), result in zip(pending, results):
+            source_path = local_path
+            try:
+                if result is not None:
+                    if not result.ok:
+                        action = '건너뜀' if result.status == 'skipped' else '실패'
+                        print(f"폰트 다운로드 {action}: {url} -> {result.error}")
+                        continue
+                    if result.status == 'not_modified':
+                        store.touch(key)
+                        continue
+                    source_path = result.path
+                try:
+                    data, out_ext = ThumbnailRenderer._font_file_bytes(source_path, ext)
+                except Exception as e:
+                    print(f"폰트 확보 실패: {url}, {e}")
+                    continue
+                store.put(key, data, out_ext, result.validators if result is not None else None)
+                changed = changed or present
+            finally:
+                if result is not None:
+                    try:
+                        os.remove(result.path)
+                    except OSError:
+                        pass
+
+        if changed:
+            font_cache.clear()
 
     @staticmethod
-    def ensure_fonts(texts: List[Dict]) -> None:
-        """DSL 내 faces를 다운로드/변환하여 Pillow가 읽을 수 있는 TTF로 보장"""
+    def ensure_fonts(texts: List[Dict], refresh: bool = False) -> None:
+        """DSL 내 faces의 폰트 파일을 fonts 디렉토리에 확보
+
+        TTF/OTF/WOFF/WOFF2를 받은 형식 그대로 두고, WOFF/WOFF2는 로드할 때 메모리에서 디코딩한다.
+
+        원격 폰트는 font_fetch의 공용 연결 풀로 동시에 내려받는다.
+        실패한 URL은 fonts 디렉토리의 실패 기록에 남겨 백오프 동안 다시 요청하지 않고,
+        오프라인 모드에서는 요청하지 않는다 (없는 폰트는 폴백 폰트로 렌더링).
+        refresh=True이면 이미 받은 원격 폰트도 ETag/Last-Modified 조건부 요청으로 재검증해
+        바뀐 것만 다시 받는다.
+        폰트 저장소(--font-store)가 설정되어 있으면 fonts 디렉토리 대신 저장소에 URL별로 받는다.
+        """
         faces = ThumbnailRenderer.parse_font_faces(texts)
         if not faces:
             return
+        from .font_store import configured_font_store
+
+        store = configured_font_store()
+        if store is not None:
+            ThumbnailRenderer._ensure_fonts_in_store(store, faces, refresh)
+            return
         fonts_dir = ThumbnailRenderer._fonts_dir()
-        os.makedirs(fonts_dir, exist_ok=True)
 
+        # (url, 로컬 원본 경로 또는 None, 원격 원본 저장 경로, 이미 있는지)
+        pending = []
         for face in faces:
             url = face.get('url')
             if not url:
                 continue
-            original_name = ThumbnailRenderer._font_safe_filename(face)
-            original_path = os.path.join(fonts_dir, original_name)
-            ttf_name = ThumbnailRenderer._font_ttf_filename(face)
-            ttf_path = os.path.join(fonts_dir, ttf_name)
-            otf_path = os.path.splitext(ttf_path)[0] + '.otf'
-
-            # 이미 TTF가 있으면 스킵
-            if os.path.exists(ttf_path) or os.path.exists(otf_path):
-                continue
+            original_path = os.path.join(fonts_dir, ThumbnailRenderer._font_safe_filename(face))
+            base_name = os.path.splitext(os.path.basename(original_path))[0]
 
             # 로컬 파일 또는 원격 URL 구분
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            is_local = False
-            local_path = ''
-            if parsed.scheme == 'file':
-                is_local = True
-                local_path = os.path.abspath(parsed.path)
-            elif os.path.isabs(url) and os.path.exists(url):
-                is_local = True
-                local_path = os.path.abspath(url)
-
-            if is_local:
+            local_path = ThumbnailRenderer._local_font_path(url)
+
+            # 이미 폰트가 있으면 스킵 (인덱스 조회라 파일시스템 접근 없음)
+            present = font_resolver.lookup(fonts_dir, [base_name + ext for ext in FONT_EXTS]) is not None
+            if present and not (refresh and local_path is None):
+                continue
+            os.makedirs(fonts_dir, exist_ok=True)
+            pending.append((url, local_path, original_path, present))
+        if not pending:
+            return
+
+        # 원격 원본을 한 번에 동시 다운로드 (refresh가 아니면 원본이 없는 것만)
+        downloads = [(url, original_path) for url, local_path, original_path, _ in pending
+                     if local_path is None and (refresh or not os.path.exists(original_path))]
+        results = {}
+        if downloads:
+            from .font_fetch import FAILURES_FILE, fetch_all, negative_cache
+            failures = negative_cache(os.path.join(fonts_dir, FAILURES_FILE))
+            results = {r.path: r for r in fetch_all(downloads, revalidate=refresh, failures=failures)}
+
+        changed = False
+        for url, local_path, original_path, present in pending:
+            if local_path is not None:
                 source_path = local_path
-                ext = pathlib.Path(source_path).suffix.lower()
             else:
-                # 원격: 원본 없으면 다운로드
-                ext = pathlib.Path(original_name).suffix.lower()
-                if not os.path.exists(original_path):
-                    try:
-                        ThumbnailRenderer._download(url, original_path)
-                    except Exception as e:
-                        print(f"폰트 다운로드 실패: {url} -> {e}")
-                        continue
+                result = results.get(original_path)
+                if result is not None and not result.ok:
+                    action = '건너뜀' if result.status == 'skipped' else '실패'
+                    print(f"폰트 다운로드 {action}: {url} -> {result.error}")
+                    continue
+                if present and (result is None or result.status != 'downloaded'):
+                    # 재검증 결과 바뀌지 않음
+                    continue
                 source_path = original_path
+            ext = pathlib.Path(source_path).suffix.lower()
+            base_path = os.path.splitext(original_path)[0]
 
-            # 확장자별 변환/복사
+            # 받은 원본은 형식을 아는 확장자면 그대로 사용 (WOFF/WOFF2도 TTF로 변환해 두지 않음)
             try:
-                if ext == '.ttf' or ext == '.otf':
-                    if source_path != ttf_path:
-                        # 확장자 유지 복사
-                        target = ttf_path if ext == '.ttf' else otf_path
-                        with open(source_path, 'rb') as rf, open(target, 'wb') as wf:
-                            wf.write(rf.read())
-                elif ext == '.woff2':
-                    ThumbnailRenderer._convert_woff2_to_ttf(source_path, ttf_path)
-                elif ext == '.woff':
-                    ThumbnailRenderer._convert_woff_to_ttf(source_path, ttf_path)
+                if local_path is None and ext in FONT_EXTS:
+                    target = original_path
                 else:
-                    # 미지원 확장자는 시도만 해보고 실패시 스킵
-                    try:
-                        ThumbnailRenderer._convert_woff_to_ttf(source_path, ttf_path)
-                    except Exception:
-                        pass
+                    data, fmt = ThumbnailRenderer._font_file_bytes(source_path, ext)
+                    target = base_path + fmt
+                    if source_path != target:
+                        with open(target, 'wb') as wf:
+                            wf.write(data)
+                # 같은 폰트의 다른 형식 파일(이전에 변환해 둔 TTF 등)이 우선 선택되지 않도록 지운다
+                for other in FONT_EXTS:
+                    if base_path + other != target and os.path.exists(base_path + other):
+                        os.remove(base_path + other)
+                changed = changed or present
             except Exception as e:
-                print(f"폰트 변환 실패: {source_path} -> {ttf_path}, {e}")
-    
+                print(f"폰트 확보 실패: {source_path}, {e}")
+            finally:
+                font_resolver.invalidate(fonts_dir)
+
+        if changed:
+            # 재검증으로 바뀐 폰트 파일은 같은 경로로 캐시돼 있으므로 핸들 캐시를 비운다
+            font_cache.clear()
+
     @staticmethod
     def split_lines(text: str) -> List[str]:
         """텍스트를 줄 단위로 분리"""
@@ -260,35 +355,24 @@ class ThumbnailRenderer:
         - 공백으로 단어를 나눈 뒤, 누적 폭이 넘어가면 이전까지를 한 줄로 확정한다.
         - 단어 하나가 max_width보다 커도 단어 단위 래핑 원칙상 강제 분할은 하지 않는다.
         - 입력이 빈 문자열이면 ['']을 반환한다.
-        """
-        if text is None or text == '':
-            return ['']
-
-        words = text.split(' ')
-        lines: List[str] = []
-        current = ''
-
-        for word in words:
-            candidate = word if current == '' else current + ' ' + word
-            bbox = draw.textbbox((0, 0), candidate, font=font)
-            candidate_width = bbox[2] - bbox[0]
-            if candidate_width > max_width and current != '':
-                lines.append(current)
-                current = word
-            else:
-                current = candidate
-
-        if current != '':
-            lines.append(current)
 
-        return lines if lines else ['']
+        폭 측정은 text_layout.wrap_words가 단어별 캐시로 처리하므로 draw는 사용하지 않는다
+        (기존 호출 호환을 위해 인자만 유지).
+        """
+        return wrap_words(text, font, max_width)
     
     @staticmethod
-    def load_font(font_path: str, size: int, weight: str = 'normal', style: str = 'normal') -> ImageFont.FreeTypeFont:
-        """폰트 로드"""
+    def load_font(
+        font_path: str,
+        size: int,
+        weight: str = 'normal',
+        style: str = 'normal',
+        index: int = 0,
+        layout_engine: Optional[int] = None
+    ) -> ImageFont.FreeTypeFont:
+        """폰트 로드 (프로세스 전역 폰트 캐시 사용)"""
         try:
-            font = ImageFont.truetype(font_path, size)
-            return font
+            return load_truetype(font_path, size, index=index, layout_engine=layout_engine)
         except Exception as e:
             print(f"폰트 로드 실패: {font_path}, {e}")
             try:
@@ -296,12 +380,110 @@ class ThumbnailRenderer:
             except:
                 return ImageFont.load_default()
     
+    @staticmethod
+    def face_url(texts: List[Dict], font_family: str, font_weight: str = 'normal', font_style: str = 'normal') -> Optional[str]:
+        """texts의 faces 중 (family, weight, style)에 해당하는 face의 url"""
+        spec = (sanitize(font_family), sanitize(str(font_weight)), sanitize(str(font_style)))
+        for face in ThumbnailRenderer.parse_font_faces(texts):
+            face_spec = (
+                sanitize(face.get('name', 'Font')),
+                sanitize(str(face.get('weight', 'normal'))),
+                sanitize(str(face.get('style', 'normal'))),
+            )
+            if face_spec == spec and face.get('url'):
+                return face['url']
+        return None
+
+    @staticmethod
+    def find_font_path(
+        font_family: str,
+        font_weight: str = 'normal',
+        font_style: str = 'normal',
+        search_path: Optional[SearchPath] = None,
+        url: Optional[str] = None
+    ) -> Optional[str]:
+        """(family, weight, style)에 해당하는 폰트 파일 경로 조회
+
+        url(face_url)이 있고 폰트 저장소(--font-store)가 설정되어 있으면 저장소에서 URL로 먼저 찾는다.
+        그 다음 확보된 폰트(패키지 fonts 디렉토리), search_path(기본: 작업 디렉토리)의
+        fonts 폴더 순으로 찾는다. 디렉토리 조회는 font_resolver 인덱스를 통해 이루어진다.
+        WOFF/WOFF2 경로도 그대로 반환한다 (load_truetype이 메모리에서 디코딩).
+        서브셋 폰트('.subset-<해시>')는 전체 폰트를 찾지 못했을 때만 반환한다.
+        """
+        if url:
+            from .font_store import configured_font_store
+
+            store = configured_font_store()
+            if store is not None:
+                font_path = store.lookup(store.key_for(url))
+                if font_path:
+                    return font_path
+
+        fonts_dir = ThumbnailRenderer._fonts_dir()
+        base_name = f"{sanitize(font_family)}-{sanitize(str(font_weight))}-{sanitize(str(font_style))}"
+        font_path = font_resolver.lookup(fonts_dir, [base_name + ext for ext in FONT_EXTS])
+        if font_path:
+            return font_path
+
+        # .thl 패키지의 fonts/, 로컬 정적 폰트 폴더(프로젝트 루트/fonts) 순으로 탐색
+        search_path = search_path or CWD
+        legacy_base = f"{sanitize(font_family)}-{font_weight}-{font_style}"
+        legacy_dirs = search_path.font_dirs()
+        legacy_names = [legacy_base + ext for ext in FONT_EXTS]
+        font_path = search_path.find_font(legacy_names)
+        if font_path:
+            return font_path
+        for legacy_dir in legacy_dirs:
+            font_path = font_resolver.lookup(legacy_dir, legacy_names)
+            if font_path:
+                return font_path
+
+        # .thl 저장 시 글리프를 줄인 서브셋 폰트는 전체 폰트가 어디에도 없을 때만 사용
+        return (search_path.find_font_prefix(legacy_base + SUBSET_INFIX)
+                or font_resolver.lookup_prefix(fonts_dir, base_name + SUBSET_INFIX))
+
+    @staticmethod
+    def resolve_font(
+        font_family: str,
+        font_weight: str,
+        font_style: str,
+        font_size: int,
+        search_path: Optional[SearchPath] = None,
+        url: Optional[str] = None
+    ) -> ImageFont.FreeTypeFont:
+        """폰트 경로 조회 + 로드, 실패 시 한글 폴백 폰트 사용"""
+        font = None
+        font_path = ThumbnailRenderer.find_font_path(font_family, font_weight, font_style, search_path, url)
+        if font_path:
+            font = ThumbnailRenderer.load_font(font_path, font_size)
+        if font is None:
+            font = _fallback_font(font_size)
+        return font
+    
     @staticmethod
     def get_text_dimensions(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont) -> Tuple[int, int]:
         """텍스트 크기 측정"""
         bbox = draw.textbbox((0, 0), text, font=font)
         return (bbox[2] - bbox[0], bbox[3] - bbox[1])
     
+    @staticmethod
+    def _dilate_square(mask: Image.Image, radius: int) -> Image.Image:
+        """마스크를 (2r+1) 정사각형 커널로 팽창 (축별 doubling으로 O(log r) 연산)
+
+        mask 가장자리에 2r 이상의 빈 여백이 있어야 offset()의 순환이 결과를 침범하지 않는다.
+        """
+        window = 2 * radius + 1
+        for axis in (0, 1):
+            acc = mask
+            covered = 1
+            while covered < window:
+                step = min(covered, window - covered)
+                shift = (step, 0) if axis == 0 else (0, step)
+                acc = ImageChops.lighter(acc, ImageChops.offset(acc, *shift))
+                covered += step
+            mask = ImageChops.offset(acc, -radius, 0) if axis == 0 else ImageChops.offset(acc, 0, -radius)
+        return mask
+
     @staticmethod
     def draw_text_with_outline(
         draw: ImageDraw.ImageDraw,
@@ -311,18 +493,33 @@ class ThumbnailRenderer:
         fill: str,
         outline: Optional[Dict] = None
     ):
-        """외곽선과 함께 텍스트 그리기"""
+        """외곽선과 함께 텍스트 그리기
+
+        외곽선 두께와 관계없이 글리프는 한 번만 래스터화한다.
+        - join='round': Pillow stroke_width (FreeType 스트로커, 둥근 모서리)
+        - join='square' (기본값): 글리프 마스크를 정사각형 커널로 팽창 (기존 오프셋 방식과 동일한 모양)
+        """
         x, y = position
         
-        # 외곽선 그리기
-        if outline and outline.get('color') and outline.get('thickness', 0) > 0:
-            thickness = outline['thickness']
-            outline_color = outline['color']
-            
-            # text-shadow 효과를 위/아래/좌/우로 여러 번 그리기
-            for dx in range(-thickness, thickness + 1):
-                for dy in range(-thickness, thickness + 1):
-                    draw.text((x + dx, y + dy), text, font=font, fill=outline_color)
+        if not (outline and outline.get('color') and outline.get('thickness', 0) > 0):
+            draw.text((x, y), text, font=font, fill=fill)
+            return
+        
+        thickness = int(outline['thickness'])
+        outline_color = outline['color']
+        join = outline.get('join', 'square')
+        
+        if join == 'round':
+            draw.text((x, y), text, font=font, fill=fill, stroke_width=thickness, stroke_fill=outline_color)
+            return
+        
+        # 글리프 마스크를 한 번 그린 뒤 팽창시켜 외곽선으로 사용
+        left, top, right, bottom = draw.textbbox((x, y), text, font=font)
+        pad = 2 * thickness
+        mask = Image.new('L', (right - left + 2 * pad, bottom - top + 2 * pad), 0)
+        ImageDraw.Draw(mask).text((x - left + pad, y - top + pad), text, font=font, fill=255)
+        mask = ThumbnailRenderer._dilate_square(mask, thickness)
+        draw.bitmap((left - pad, top - pad), mask, fill=outline_color)
         
         # 메인 텍스트 그리기
         draw.text((x, y), text, font=font, fill=fill)
@@ -332,9 +529,10 @@ class ThumbnailRenderer:
         img: Image.Image,
         bg_config: Dict,
         width: int,
-        height: int
+        height: int,
+        search_path: Optional[SearchPath] = None
     ):
-        """배경 렌더링"""
+        """배경 렌더링 (상대 이미지 경로는 search_path 기준, 기본: 작업 디렉토리)"""
         bg_type = bg_config.get('type', 'solid')
         
         if bg_type == 'solid':
@@ -343,76 +541,27 @@ class ThumbnailRenderer:
             img.paste(fill)
         
         elif bg_type == 'gradient':
-            colors = bg_config.get('colors', ['#ffffff', '#000000'])
-            gradient = Image.new('RGB', (width, height), colors[0])
-            
-            # 간단한 수평 그라디언트
-            for i in range(width):
-                ratio = i / width
-                r1, g1, b1 = [int(c) for c in (colors[0][1:3], colors[0][3:5], colors[0][5:7])]
-                r2, g2, b2 = [int(c) for c in (colors[-1][1:3], colors[-1][3:5], colors[-1][5:7])]
-                
-                r = int(r1 + (r2 - r1) * ratio)
-                g = int(g1 + (g2 - g1) * ratio)
-                b = int(b1 + (b2 - b1) * ratio)
-                
-                for j in range(height):
-                    gradient.putpixel((i, j), (r, g, b))
-            
+            gradient = render_gradient(
+                width,
+                height,
+                bg_config.get('colors', ['#ffffff', '#000000']),
+                angle=bg_config.get('angle', 90),
+                kind=bg_config.get('gradientType', 'linear'),
+            )
             img.paste(gradient)
         
         elif bg_type == 'image':
-            img_path = bg_config.get('imagePath', '')
-            
-            # base64 데이터 URL 처리
-            if img_path.startswith('data:image'):
-                # base64 디코딩 처리
-                import base64
-                header, encoded = img_path.split(',', 1)
-                image_data = base64.b64decode(encoded)
-                bg_img = Image.open(io.BytesIO(image_data))
-            else:
-                if not os.path.exists(img_path):
-                    print(f"배경 이미지를 찾을 수 없음: {img_path}")
-                    return
-                
-                bg_img = Image.open(img_path)
-            
-            # cover 알고리즘으로 리사이즈
-            img_ratio = bg_img.width / bg_img.height
-            canvas_ratio = width / height
-            
-            if img_ratio > canvas_ratio:
-                # 이미지가 더 넓음: 높이 기준으로 맞춤
-                new_height = height
-                new_width = int(height * img_ratio)
-                bg_img = bg_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                left = (new_width - width) // 2
-                bg_img = bg_img.crop((left, 0, left + width, height))
-            else:
-                # 이미지가 더 높음: 너비 기준으로 맞춤
-                new_width = width
-                new_height = int(width / img_ratio)
-                bg_img = bg_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                top = (new_height - height) // 2
-                bg_img = bg_img.crop((0, top, width, top + height))
-            
-            # 블러 효과 적용
-            image_blur = bg_config.get('imageBlur', 0)
-            if image_blur > 0:
-                bg_img = bg_img.filter(ImageFilter.GaussianBlur(radius=image_blur))
-            
-            # 투명도 적용
-            image_opacity = bg_config.get('imageOpacity', 1.0)
-            if image_opacity < 1.0 and bg_img.mode in ('RGBA', 'LA'):
-                alpha = bg_img.split()[-1]
-                alpha = alpha.point(lambda p: int(p * image_opacity))
-                bg_img.putalpha(alpha)
-            elif image_opacity < 1.0:
-                bg_img = bg_img.convert('RGBA')
-                alpha = bg_img.split()[-1]
-                alpha = alpha.point(lambda p: int(p * image_opacity))
-                bg_img.putalpha(alpha)
+            img_path = (search_path or CWD).resolve(bg_config.get('imagePath', ''))
+            bg_img = render_image_layer(
+                img_path,
+                width,
+                height,
+                blur=bg_config.get('imageBlur', 0),
+                opacity=bg_config.get('imageOpacity', 1.0),
+            )
+            if bg_img is None:
+                print(f"배경 이미지를 찾을 수 없음: {img_path}")
+                return
             
             # 배경 위에 붙이기
             if bg_img.mode == 'RGBA':
@@ -421,177 +570,90 @@ class ThumbnailRenderer:
                 img.paste(bg_img, (0, 0))
     
     @staticmethod
-    def render_thumbnail(dsl: Dict, output_path: str):
-        """DSL을 읽어서 썸네일 생성"""
-        thumbnail_config = dsl.get('Thumbnail', {})
-        
-        # 해상도 결정
-        resolution = ThumbnailRenderer.get_resolution(thumbnail_config.get('Resolution', {}))
-        width, height = resolution
-        
-        # 이미지 생성
-        img = Image.new('RGB', (width, height), '#ffffff')
-        
-        # 배경 렌더링
-        if 'Background' in thumbnail_config:
-            ThumbnailRenderer.render_background(img, thumbnail_config['Background'], width, height)
-        
-        # 텍스트 렌더링
-        if 'Texts' in thumbnail_config:
-            draw = ImageDraw.Draw(img)
-            
-            for txt_config in thumbnail_config['Texts']:
-                if not txt_config.get('enabled', True):
-                    continue
-                
-                # 기본값 설정
-                content = txt_config.get('content', '')
-                fontSize = txt_config.get('fontSize', 48)
-                fontFamily = txt_config.get('font', {}).get('name', 'Arial')
-                color = txt_config.get('color', '#000000')
-                gridPosition = txt_config.get('gridPosition', 'tl')
-                fontWeight = txt_config.get('fontWeight', 'normal')
-                fontStyle = txt_config.get('fontStyle', 'normal')
-                lineHeight = txt_config.get('lineHeight', ThumbnailRenderer.LINE_HEIGHT)
-                wordWrap = txt_config.get('wordWrap', False)
-                outline = txt_config.get('outline')
-                
-                # 외곽선 기본값
-                if outline and (not outline.get('thickness') or outline.get('thickness') < 0):
-                    outline['thickness'] = ThumbnailRenderer.DEFAULT_OUTLINE_THICKNESS
-                
-                # faces 기반 폰트 확보 (필요 시 다운로드/변환)
-                try:
-                    ThumbnailRenderer.ensure_fonts(thumbnail_config.get('Texts', []))
-                except Exception as e:
-                    print(f"폰트 확보 과정 경고: {e}")
-
-                # 확보된 TTF 경로 우선 시도
-                fonts_dir = ThumbnailRenderer._fonts_dir()
-                base_name = f"{sanitize(fontFamily)}-{sanitize(str(fontWeight))}-{sanitize(str(fontStyle))}"
-                ttf_candidate = os.path.join(fonts_dir, base_name + '.ttf')
-                otf_candidate = os.path.join(fonts_dir, base_name + '.otf')
-
-                # 로컬 정적 폰트 폴더(프로젝트 루트/fonts)도 탐색
-                legacy_ttf = os.path.join('fonts', f"{sanitize(fontFamily)}-{fontWeight}-{fontStyle}.ttf")
-                legacy_woff = os.path.join('fonts', f"{sanitize(fontFamily)}-{fontWeight}-{fontStyle}.woff")
-                font_path = None
-                if os.path.exists(ttf_candidate):
-                    font_path = ttf_candidate
-                elif os.path.exists(otf_candidate):
-                    font_path = otf_candidate
-                elif os.path.exists(legacy_ttf):
-                    font_path = legacy_ttf
-                elif os.path.exists(legacy_woff):
-                    # 가능한 경우 변환 시도 후 사용
-                    try:
-                        os.makedirs(fonts_dir, exist_ok=True)
-                        conv_target_ttf = os.path.join(fonts_dir, base_name + '.ttf')
-                        conv_target_otf = os.path.join(fonts_dir, base_name + '.otf')
-                        if os.path.splitext(legacy_woff)[1].lower() == '.woff':
-                            ThumbnailRenderer._convert_woff_to_ttf(legacy_woff, conv_target_ttf)
-                        font_path = (
-                            conv_target_ttf if os.path.exists(conv_target_ttf)
-                            else (conv_target_otf if os.path.exists(conv_target_otf) else None)
-                        )
-                    except Exception:
-                        font_path = None
-                
-                # 폰트 로드 + 한글 폴백
-                font = None
-                if font_path and os.path.exists(font_path):
-                    font = ThumbnailRenderer.load_font(font_path, fontSize)
-                if font is None:
-                    # Windows 한글 폴백 (맑은 고딕)
-                    for fallback in [
-                        os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts', 'malgun.ttf'),
-                        os.path.join(os.environ.get('WINDIR', 'C:\\Windows'), 'Fonts', 'malgunsl.ttf'),
-                    ]:
-                        try:
-                            if os.path.exists(fallback):
-                                font = ImageFont.truetype(fallback, fontSize)
-                                break
-                        except Exception:
-                            pass
-                if font is None:
-                    try:
-                        font = ImageFont.truetype("arial.ttf", fontSize)
-                    except Exception:
-                        font = ImageFont.load_default()
-                
-                # 줄 분리 및 단어 단위 줄바꿈 처리
-                initial_lines = ThumbnailRenderer.split_lines(content)
-                effective_max_width = width - 2 * ThumbnailRenderer.MARGIN
-
-                if wordWrap:
-                    processed_lines: List[str] = []
-                    for init_line in initial_lines:
-                        if init_line == '':
-                            processed_lines.append('')
-                        else:
-                            wrapped = ThumbnailRenderer.wrap_line_by_words(
-                                draw=draw,
-                                text=init_line,
-                                font=font,
-                                max_width=effective_max_width,
-                            )
-                            processed_lines.extend(wrapped)
-                    lines = processed_lines
-                else:
-                    lines = initial_lines
-                
-                # 라인 높이 계산
-                lh = int(fontSize * lineHeight)
-                totalTextHeight = len(lines) * lh
-                
-                # 그리드 위치 결정
-                row = gridPosition[0] if len(gridPosition) > 0 else 't'  # t, m, b
-                col = gridPosition[1] if len(gridPosition) > 1 else 'l'  # l, c, r
-                
-                # X 위치 결정
-                if col == 'l':
-                    targetX = ThumbnailRenderer.MARGIN
-                    textAlign = 'left'
-                elif col == 'c':
-                    targetX = width // 2
-                    textAlign = 'center'
-                else:  # 'r'
-                    targetX = width - ThumbnailRenderer.MARGIN
-                    textAlign = 'right'
-                
-                # Y 위치 결정
-                if row == 't':
-                    baseY = ThumbnailRenderer.MARGIN
-                elif row == 'm':
-                    baseY = (height // 2) - (totalTextHeight // 2)
-                else:  # 'b'
-                    baseY = height - ThumbnailRenderer.MARGIN - totalTextHeight
-                
-                # 텍스트 그리기
-                for line_idx, line in enumerate(lines):
-                    currentY = baseY + (line_idx * lh)
-                    
-                    # 텍스트 크기 측정
-                    bbox = draw.textbbox((0, 0), line, font=font)
-                    textWidth = bbox[2] - bbox[0]
-                    
-                    # 정렬에 따른 X 위치 조정
-                    x = targetX
-                    if textAlign == 'center':
-                        x = targetX - textWidth // 2
-                    elif textAlign == 'right':
-                        x = targetX - textWidth
-                    
-                    # 텍스트 그리기
-                    if outline and outline.get('color') and outline.get('thickness', 0) > 0:
-                        ThumbnailRenderer.draw_text_with_outline(
-                            draw, line, (x, currentY), font, color, outline
-                        )
-                    else:
-                        draw.text((x, currentY), line, font=font, fill=color)
-        
-        # 저장
-        img.save(output_path, 'PNG')
-        print(f"[OK] 썸네일 생성 완료: {output_path}")
+    def compile(
+        dsl: Dict,
+        timings: Optional['Timings'] = None,
+        search_path: Optional[SearchPath] = None
+    ) -> 'Template':
+        """DSL을 불변 Template으로 컴파일
 
+        해상도, 배경 레이어, 폰트, 색상, 외곽선을 미리 확정해 두므로
+        같은 템플릿에 텍스트만 바꿔 여러 장을 그릴 때는 template.render(overrides)를 사용한다.
+        search_path(SearchPath)는 상대 경로(배경 이미지, fonts/)의 기준이다 (기본: 작업 디렉토리).
+        """
+        from .template import compile_template
+        return compile_template(dsl, timings, search_path)
+    
+    @staticmethod
+    def render_image(
+        dsl: Dict,
+        timings: Optional['Timings'] = None,
+        search_path: Optional[SearchPath] = None
+    ) -> Image.Image:
+        """DSL을 읽어서 썸네일 이미지(RGB)를 메모리에 생성
+
+        timings(Timings)를 주면 단계별 소요 시간을 누적한다.
+        """
+        return ThumbnailRenderer.compile(dsl, timings, search_path).render(timings=timings)
+    
+    @staticmethod
+    def render_bytes(
+        dsl: Dict,
+        format: str = 'PNG',
+        timings: Optional['Timings'] = None,
+        search_path: Optional[SearchPath] = None,
+        **encoder_opts
+    ) -> bytes:
+        """DSL을 렌더링해 인코딩된 이미지 바이트 반환 (파일 I/O 없음)
+
+        encoder_opts는 Pillow Image.save의 인코더 옵션으로 그대로 전달된다
+        (예: format='JPEG', quality=90 / format='PNG', compress_level=1).
+        """
+        img = ThumbnailRenderer.render_image(dsl, timings, search_path)
+        buf = io.BytesIO()
+        with (timings or NULL_TIMINGS).stage('encode'):
+            img.save(buf, format, **encoder_opts)
+        return buf.getvalue()
+    
+    @staticmethod
+    def render_to_file(
+        dsl: Dict,
+        output_path: str,
+        cache: Optional['RenderCache'] = None,
+        timings: Optional['Timings'] = None,
+        search_path: Optional[SearchPath] = None
+    ) -> bool:
+        """DSL을 렌더링해 PNG 파일로 저장 (출력 없음), 렌더링 캐시 적중 여부 반환
+
+        cache(RenderCache)를 주면 입력이 같은 이전 결과를 다시 그리지 않고 링크/복사한다.
+        """
+        timings = timings or NULL_TIMINGS
+        if cache is not None:
+            from .render_cache import dsl_key
+            with timings.stage('cache'):
+                key = dsl_key(dsl, search_path)
+                if cache.fetch(key, output_path):
+                    return True
+            data = ThumbnailRenderer.render_bytes(dsl, timings=timings, search_path=search_path)
+            with timings.stage('cache'):
+                cache.save(key, output_path, data)
+            return False
 
+        img = ThumbnailRenderer.render_image(dsl, timings, search_path)
+        with timings.stage('encode'):
+            # 이전 실행에서 캐시와 하드 링크된 파일이면 캐시까지 덮어쓰지 않도록 먼저 끊는다
+            detach_hardlink(output_path)
+            img.save(output_path, 'PNG')
+        return False
+    
+    @staticmethod
+    def render_thumbnail(
+        dsl: Dict,
+        output_path: str,
+        cache: Optional['RenderCache'] = None,
+        timings: Optional['Timings'] = None,
+        search_path: Optional[SearchPath] = None
+    ):
+        """DSL을 읽어서 썸네일 생성"""
+        hit = ThumbnailRenderer.render_to_file(dsl, output_path, cache=cache, timings=timings, search_path=search_path)
+        print(f"[OK] 썸네일 생성 완료{' (캐시)' if hit else ''}: {output_path}")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상대 경로 해석 기준 (배경 이미지 imagePath, 'fonts/' 폴더)
+"""
+
+import os
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+from .package import ThlPackage
+
+
+class SearchPath(NamedTuple):
+    """상대 경로를 찾을 기준 디렉토리 목록 (앞쪽 우선)
+
+    roots와 packages가 모두 비어 있으면(CWD) 기존처럼 프로세스 작업 디렉토리 기준으로 해석한다.
+    .thl 패키지는 압축을 풀지 않고 메모리에 읽은 ThlPackage를 packages로 넘기며,
+    패키지 안 파일은 가상 경로(package.uri)로 해석된다. os.chdir을 하지 않으므로
+    여러 패키지를 한 프로세스의 여러 스레드에서 동시에 렌더링할 수 있다.
+    """
+
+    roots: Tuple[str, ...] = ()
+    packages: Tuple[ThlPackage, ...] = ()
+
+    @classmethod
+    def of(cls, *roots: str) -> 'SearchPath':
+        return cls(tuple(os.path.abspath(root) for root in roots))
+
+    @classmethod
+    def of_package(cls, package: ThlPackage) -> 'SearchPath':
+        return cls(packages=(package,))
+
+    def resolve(self, path: str) -> str:
+        """상대 경로를 패키지, 기준 디렉토리 순으로 찾은 경로 (절대 경로, data URL, 빈 값은 그대로)"""
+        if not (self.roots or self.packages) or not path or path.startswith('data:') or os.path.isabs(path):
+            return path
+        for package in self.packages:
+            if package.has(path):
+                return package.uri(path)
+        for root in self.roots:
+            candidate = os.path.join(root, path)
+            if os.path.exists(candidate):
+                return candidate
+        if self.roots:
+            return os.path.join(self.roots[0], path)
+        return self.packages[0].uri(path)
+
+    def find_font(self, filenames: Sequence[str]) -> Optional[str]:
+        """패키지의 fonts/ 폴더에서 filenames 중 처음 있는 폰트의 가상 경로"""
+        for package in self.packages:
+            for filename in filenames:
+                if package.has('fonts/' + filename):
+                    return package.uri('fonts/' + filename)
+        return None
+
+    def find_font_prefix(self, prefix: str) -> Optional[str]:
+        """패키지의 fonts/ 폴더에서 이름이 prefix로 시작하는 첫 폰트의 가상 경로 (서브셋 폰트 조회용)"""
+        for package in self.packages:
+            names = sorted(name for name in package.members if name.startswith('fonts/' + prefix))
+            if names:
+                return package.uri(names[0])
+        return None
+
+    def font_dirs(self) -> Tuple[str, ...]:
+        """로컬 정적 폰트 폴더('fonts') 후보 (패키지만 있으면 없음)"""
+        if not self.roots:
+            return () if self.packages else ('fonts',)
+        return tuple(os.path.join(root, 'fonts') for root in self.roots)
+
+
+# 작업 디렉토리 기준 (search_path를 주지 않았을 때의 기본값)
+CWD = SearchPath()
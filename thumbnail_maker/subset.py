@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+.thl 패키지용 폰트 서브셋 - 템플릿 텍스트와 추가 문자 집합의 글리프만 남긴다
+"""
+
+import hashlib
+import io
+from typing import Dict, Tuple
+
+from .woff import to_sfnt
+
+
+# 추가로 남길 수 있는 문자 집합 ('ascii,hangul'처럼 쉼표로 조합)
+CHARSETS = {
+    'ascii': ''.join(chr(c) for c in range(0x20, 0x7f)),
+    'latin1': ''.join(chr(c) for c in range(0xa0, 0x100)),
+    'hangul': ''.join(chr(c) for c in range(0xac00, 0xd7a4)),  # 완성형 한글 11,172자
+    'jamo': ''.join(chr(c) for c in range(0x3131, 0x318f)),  # 호환용 한글 자모
+}
+DEFAULT_CHARSET = 'ascii'
+
+# 서브셋 폰트 파일명 표시 ('<이름>-<굵기>-<스타일>.subset-<해시><확장자>')
+# 전체 폰트와 이름이 달라 공용 fonts 디렉토리에 함께 있어도 전체 폰트를 덮어쓰지 않는다
+SUBSET_INFIX = '.subset-'
+
+
+def charset_text(spec: str) -> str:
+    """문자 집합 이름 목록('ascii,hangul')을 문자열로 (모르는 이름이면 ValueError)"""
+    chars = []
+    for name in spec.split(','):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in CHARSETS:
+            raise ValueError(f"알 수 없는 문자 집합: {name} (사용 가능: {', '.join(CHARSETS)})")
+        chars.append(CHARSETS[name])
+    return ''.join(chars)
+
+
+def dsl_text(dsl: Dict) -> str:
+    """DSL의 모든 텍스트 내용 (서브셋에 남길 문자)"""
+    texts = dsl.get('Thumbnail', {}).get('Texts', [])
+    return ''.join(str(txt.get('content', '')) for txt in texts)
+
+
+def subset_font(data: bytes, text: str) -> Tuple[bytes, str]:
+    """폰트 바이트에서 text에 쓰인 글리프만 남긴 (sfnt 바이트, 확장자 .ttf/.otf)
+
+    WOFF/WOFF2도 받으며 결과는 항상 압축하지 않은 sfnt다 (패키지 zip이 압축).
+    OpenType 기능(GSUB/GPOS)과 이름 테이블은 모두 유지해 렌더링 결과가 원본과 같다.
+    """
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    sfnt, ext = to_sfnt(data)
+    options = subset.Options()
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.name_languages = ['*']
+    options.notdef_outline = True
+    font = TTFont(io.BytesIO(sfnt), recalcTimestamp=False)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    out = io.BytesIO()
+    font.save(out)
+    return out.getvalue(), ext
+
+
+def subset_font_name(base_name: str, data: bytes, ext: str) -> str:
+    """서브셋 폰트 파일명 (내용 해시를 붙여 서로 다른 서브셋도 구분)"""
+    return f"{base_name}{SUBSET_INFIX}{hashlib.sha256(data).hexdigest()[:8]}{ext}"
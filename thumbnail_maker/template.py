@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컴파일된 템플릿 - DSL을 한 번 해석해 두고 텍스트 내용만 바꿔 반복 렌더링
+"""
+
+import io
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from .background import render_image_layer
+from .renderer import ThumbnailRenderer
+from .search_path import SearchPath
+from .text_layout import wrap_unicode, wrap_words
+from .timing import NULL_TIMINGS, Timings
+
+
+OverrideKey = Union[str, int]
+# 내용 문자열, 또는 {'content', 'color', 'fontSize'} 중 일부를 담은 dict
+OverrideValue = Union[str, Mapping[str, Any]]
+
+
+class _Frozen:
+    """생성 후 속성 변경을 막는 __slots__ 기반 베이스"""
+
+    __slots__ = ()
+
+    def _init(self, **fields) -> None:
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__}은(는) 변경할 수 없습니다: {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__}은(는) 변경할 수 없습니다: {name}")
+
+
+class TextPlan(_Frozen):
+    """텍스트 하나의 렌더링 계획 (폰트, 색상, 위치, 외곽선이 확정된 상태)"""
+
+    __slots__ = (
+        'index', 'type', 'content', 'font', 'font_spec', 'font_size', 'fill',
+        'line_height_ratio', 'line_height', 'row', 'col', 'word_wrap', 'max_width', 'outline', 'search_path',
+        'font_url',
+    )
+
+    def __init__(
+        self,
+        index: int,
+        type: Optional[str],
+        content: str,
+        font: ImageFont.FreeTypeFont,
+        font_spec: Tuple[str, str, str],
+        font_size: int,
+        fill: Tuple[int, ...],
+        line_height_ratio: float,
+        row: str,
+        col: str,
+        word_wrap: Union[bool, str],
+        max_width: int,
+        outline: Optional[Mapping] = None,
+        search_path: Optional[SearchPath] = None,
+        font_url: Optional[str] = None
+    ):
+        self._init(
+            index=index, type=type, content=content, font=font, font_spec=font_spec,
+            font_size=font_size, fill=fill, line_height_ratio=line_height_ratio,
+            line_height=int(font_size * line_height_ratio), row=row, col=col,
+            word_wrap=word_wrap, max_width=max_width, outline=outline, search_path=search_path,
+            font_url=font_url,
+        )
+
+    def variant(
+        self,
+        content: Optional[str] = None,
+        color: Optional[str] = None,
+        font_size: Optional[int] = None
+    ) -> 'TextPlan':
+        """내용/색상/크기만 바꾼 계획 (바뀐 것이 없으면 self)"""
+        if content is None and color is None and font_size in (None, self.font_size):
+            return self
+        font = self.font
+        if font_size not in (None, self.font_size):
+            # 폰트 경로는 인덱스 조회, 핸들은 프로세스 캐시에서 가져오므로 비용이 작다
+            font = ThumbnailRenderer.resolve_font(*self.font_spec, font_size, self.search_path, self.font_url)
+        else:
+            font_size = self.font_size
+        return TextPlan(
+            index=self.index,
+            type=self.type,
+            content=self.content if content is None else content,
+            font=font,
+            font_spec=self.font_spec,
+            font_size=font_size,
+            fill=self.fill if color is None else ImageColor.getcolor(color, 'RGB'),
+            line_height_ratio=self.line_height_ratio,
+            row=self.row,
+            col=self.col,
+            word_wrap=self.word_wrap,
+            max_width=self.max_width,
+            outline=self.outline,
+            search_path=self.search_path,
+            font_url=self.font_url,
+        )
+
+    def layout(self, content: str) -> List[str]:
+        """줄 분리 및 줄바꿈"""
+        initial_lines = ThumbnailRenderer.split_lines(content)
+        if not self.word_wrap:
+            return initial_lines
+
+        lines: List[str] = []
+        for init_line in initial_lines:
+            if init_line == '':
+                lines.append('')
+            elif self.word_wrap == 'unicode':
+                lines.extend(wrap_unicode(init_line, self.font, self.max_width))
+            else:
+                lines.extend(wrap_words(init_line, self.font, self.max_width))
+        return lines
+
+    def draw(self, draw: ImageDraw.ImageDraw, width: int, height: int, timings=NULL_TIMINGS) -> None:
+        """이 계획의 내용을 위치/스타일대로 그리기"""
+        margin = ThumbnailRenderer.MARGIN
+        with timings.stage('layout'):
+            lines = self.layout(self.content)
+        total_height = len(lines) * self.line_height
+
+        # X 위치 결정
+        if self.col == 'l':
+            target_x = margin
+        elif self.col == 'c':
+            target_x = width // 2
+        else:  # 'r'
+            target_x = width - margin
+
+        # Y 위치 결정
+        if self.row == 't':
+            base_y = margin
+        elif self.row == 'm':
+            base_y = (height // 2) - (total_height // 2)
+        else:  # 'b'
+            base_y = height - margin - total_height
+
+        for line_idx, line in enumerate(lines):
+            y = base_y + line_idx * self.line_height
+
+            # 정렬에 따른 X 위치 조정
+            x = target_x
+            if self.col in ('c', 'r'):
+                with timings.stage('layout'):
+                    bbox = draw.textbbox((0, 0), line, font=self.font)
+                text_width = bbox[2] - bbox[0]
+                x = target_x - (text_width // 2 if self.col == 'c' else text_width)
+
+            if self.outline is not None:
+                with timings.stage('outline'):
+                    ThumbnailRenderer.draw_text_with_outline(
+                        draw, line, (x, y), self.font, self.fill, self.outline
+                    )
+            else:
+                with timings.stage('text'):
+                    draw.text((x, y), line, font=self.font, fill=self.fill)
+
+
+class Template(_Frozen):
+    """컴파일된 썸네일 템플릿
+
+    해상도, 배경 레이어, 폰트, 색상, 외곽선이 모두 확정된 불변 객체.
+    render(overrides)는 텍스트 내용만 바꿔 그리므로 DSL 해석 비용이 들지 않는다.
+    """
+
+    __slots__ = ('width', 'height', 'texts', 'background_config', '_background', '_keys')
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        background: Image.Image,
+        texts: Tuple[TextPlan, ...],
+        background_config: Optional[Mapping] = None
+    ):
+        keys: Dict[OverrideKey, Tuple[int, ...]] = {}
+        for pos, plan in enumerate(texts):
+            keys[plan.index] = (pos,)
+            if plan.type:
+                keys[plan.type] = keys.get(plan.type, ()) + (pos,)
+        self._init(
+            width=width, height=height, texts=texts,
+            background_config=MappingProxyType(dict(background_config or {})),
+            _background=background, _keys=MappingProxyType(keys),
+        )
+
+    def __repr__(self) -> str:
+        return f"<Template {self.width}x{self.height} texts={len(self.texts)}>"
+
+    def has_text(self, key: OverrideKey) -> bool:
+        """overrides 키로 쓸 수 있는지 (텍스트 type 또는 Texts 인덱스)"""
+        return key in self._keys
+
+    def _plans(self, overrides: Optional[Mapping[OverrideKey, OverrideValue]]) -> List[TextPlan]:
+        plans = list(self.texts)
+        for key, value in (overrides or {}).items():
+            if key not in self._keys:
+                raise KeyError(f"템플릿에 없는 텍스트: {key!r}")
+            if isinstance(value, Mapping):
+                changes = dict(
+                    content=value.get('content'),
+                    color=value.get('color'),
+                    font_size=value.get('fontSize'),
+                )
+            else:
+                changes = dict(content=value)
+            for pos in self._keys[key]:
+                plans[pos] = plans[pos].variant(**changes)
+        return plans
+
+    def _canvas(self, background: Optional[str]) -> Image.Image:
+        if background is None:
+            return self._background.copy()
+
+        # 배경 이미지 교체: 템플릿의 블러/투명도 설정을 그대로 사용
+        config = self.background_config if self.background_config.get('type') == 'image' else {}
+        layer = render_image_layer(
+            background,
+            self.width,
+            self.height,
+            blur=config.get('imageBlur', 0),
+            opacity=config.get('imageOpacity', 1.0),
+        )
+        if layer is None:
+            raise FileNotFoundError(f"배경 이미지를 찾을 수 없습니다: {background}")
+        img = Image.new('RGB', (self.width, self.height), '#ffffff')
+        img.paste(layer, (0, 0), layer if layer.mode == 'RGBA' else None)
+        return img
+
+    def render(
+        self,
+        overrides: Optional[Mapping[OverrideKey, OverrideValue]] = None,
+        background: Optional[str] = None,
+        timings: Optional[Timings] = None
+    ) -> Image.Image:
+        """썸네일 이미지(RGB) 생성
+
+        overrides: {텍스트 type 또는 Texts 인덱스: 내용 문자열 또는 {'content', 'color', 'fontSize'}}.
+        지정하지 않은 텍스트/속성은 DSL 값을 쓴다.
+        background: 배경 이미지 경로 또는 data URL (지정 시 템플릿 배경 대신 사용)
+        timings: 주면 단계별 소요 시간을 누적한다
+        """
+        timings = timings or NULL_TIMINGS
+        with timings.stage('font_load'):
+            plans = self._plans(overrides)
+        with timings.stage('canvas' if background is None else 'background'):
+            img = self._canvas(background)
+        draw = ImageDraw.Draw(img)
+        for plan in plans:
+            plan.draw(draw, self.width, self.height, timings)
+        return img
+
+    def render_bytes(
+        self,
+        overrides: Optional[Mapping[OverrideKey, OverrideValue]] = None,
+        format: str = 'PNG',
+        background: Optional[str] = None,
+        timings: Optional[Timings] = None,
+        **encoder_opts
+    ) -> bytes:
+        """render() 결과를 인코딩한 바이트"""
+        img = self.render(overrides, background=background, timings=timings)
+        buf = io.BytesIO()
+        with (timings or NULL_TIMINGS).stage('encode'):
+            img.save(buf, format, **encoder_opts)
+        return buf.getvalue()
+
+
+def _compile_text(
+    index: int,
+    txt_config: Dict,
+    width: int,
+    timings=NULL_TIMINGS,
+    search_path: Optional[SearchPath] = None,
+    faces_texts: Sequence[Dict] = ()
+) -> TextPlan:
+    # 기본값 설정
+    font_size = txt_config.get('fontSize', 48)
+    font_family = txt_config.get('font', {}).get('name', 'Arial')
+    grid_position = txt_config.get('gridPosition', 'tl')
+    font_weight = txt_config.get('fontWeight', 'normal')
+    font_style = txt_config.get('fontStyle', 'normal')
+    line_height = txt_config.get('lineHeight', ThumbnailRenderer.LINE_HEIGHT)
+
+    # 외곽선 정규화 (입력 dict는 수정하지 않는다)
+    outline = None
+    outline_config = txt_config.get('outline')
+    if outline_config and outline_config.get('color'):
+        thickness = outline_config.get('thickness')
+        if not thickness or thickness < 0:
+            thickness = ThumbnailRenderer.DEFAULT_OUTLINE_THICKNESS
+        outline = MappingProxyType({
+            'thickness': thickness,
+            'color': ImageColor.getcolor(outline_config['color'], 'RGB'),
+            'join': outline_config.get('join', 'square'),
+        })
+
+    with timings.stage('font_load'):
+        # faces_texts(DSL의 전체 텍스트)에서 이 폰트를 선언한 face의 URL (폰트 저장소 조회용)
+        font_url = ThumbnailRenderer.face_url(list(faces_texts), font_family, font_weight, font_style)
+        font = ThumbnailRenderer.resolve_font(font_family, font_weight, font_style, font_size, search_path, font_url)
+
+    return TextPlan(
+        index=index,
+        type=txt_config.get('type'),
+        content=txt_config.get('content', ''),
+        font=font,
+        font_spec=(font_family, font_weight, font_style),
+        font_size=font_size,
+        fill=ImageColor.getcolor(txt_config.get('color', '#000000'), 'RGB'),
+        line_height_ratio=line_height,
+        row=grid_position[0] if len(grid_position) > 0 else 't',  # t, m, b
+        col=grid_position[1] if len(grid_position) > 1 else 'l',  # l, c, r
+        word_wrap=txt_config.get('wordWrap', False),
+        max_width=width - 2 * ThumbnailRenderer.MARGIN,
+        outline=outline,
+        search_path=search_path,
+        font_url=font_url,
+    )
+
+
+def compile_template(dsl: Dict, timings: Optional[Timings] = None, search_path: Optional[SearchPath] = None) -> Template:
+    """DSL을 해석해 Template으로 컴파일 (폰트 확보/로드, 배경 레이어 생성은 여기서 한 번만)
+
+    상대 경로(배경 이미지, fonts/)는 search_path 기준으로 찾는다 (기본: 작업 디렉토리).
+    """
+    timings = timings or NULL_TIMINGS
+    thumbnail_config = dsl.get('Thumbnail', {})
+    with timings.stage('resolution'):
+        width, height = ThumbnailRenderer.get_resolution(thumbnail_config.get('Resolution', {}))
+
+    with timings.stage('background'):
+        background = Image.new('RGB', (width, height), '#ffffff')
+        if 'Background' in thumbnail_config:
+            ThumbnailRenderer.render_background(background, thumbnail_config['Background'], width, height, search_path)
+
+    texts: List[TextPlan] = []
+    if 'Texts' in thumbnail_config:
+        # faces 기반 폰트 확보 (필요 시 다운로드/변환)
+        with timings.stage('ensure_fonts'):
+            try:
+                ThumbnailRenderer.ensure_fonts(thumbnail_config.get('Texts', []))
+            except Exception as e:
+                print(f"폰트 확보 과정 경고: {e}")
+
+        for index, txt_config in enumerate(thumbnail_config['Texts']):
+            if not txt_config.get('enabled', True):
+                continue
+            texts.append(_compile_text(index, txt_config, width, timings, search_path, thumbnail_config['Texts']))
+
+    return Template(width, height, background, tuple(texts), thumbnail_config.get('Background'))
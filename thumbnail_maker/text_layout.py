@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+텍스트 레이아웃 - 폭 측정 캐시와 줄바꿈 엔진
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List
+
+from PIL import ImageFont
+
+
+@lru_cache(maxsize=8192)
+def text_length(font: ImageFont.FreeTypeFont, text: str) -> float:
+    """(폰트, 문자열)별 전진 폭(advance) 측정 결과를 캐시"""
+    return font.getlength(text)
+
+
+def wrap_words(text: str, font: ImageFont.FreeTypeFont, max_width: float) -> List[str]:
+    """공백 단위 줄바꿈 (선형 시간)
+
+    단어와 공백의 폭을 한 번씩만 측정해 누적하고, 누적 폭이 max_width를 넘는
+    줄바꿈 후보 지점에서만 후보 줄 전체를 실제로 측정해 커닝 오차를 보정한다.
+    - 단어 하나가 max_width보다 커도 강제 분할하지 않는다.
+    - 줄 맨 앞의 공백(연속 공백으로 생기는 빈 단어)은 버린다.
+    - 입력이 빈 문자열이면 ['']을 반환한다.
+    """
+    if text is None or text == '':
+        return ['']
+
+    space_width = text_length(font, ' ')
+    lines: List[str] = []
+    current: List[str] = []
+    current_width = 0.0
+
+    for word in text.split(' '):
+        word_width = text_length(font, word)
+        if not current:
+            # 빈 단어로 줄을 시작하지 않는다 (공백으로 시작하는 줄, 빈 줄 방지)
+            if word:
+                current = [word]
+                current_width = word_width
+            continue
+
+        candidate_width = current_width + space_width + word_width
+        if candidate_width > max_width:
+            # 줄바꿈 후보 지점: 커닝이 반영된 실제 폭으로 다시 확인
+            candidate_width = font.getlength(' '.join(current) + ' ' + word)
+            if candidate_width > max_width:
+                lines.append(' '.join(current))
+                current = [word] if word else []
+                current_width = word_width
+                continue
+
+        current.append(word)
+        current_width = candidate_width
+
+    if current:
+        lines.append(' '.join(current))
+
+    return lines if lines else ['']
+
+
+# ---------- 유니코드 줄바꿈 (UAX #14 간이 구현) ----------
+
+# 줄 맨 앞에 올 수 없는 문자 (닫는 괄호/구두점, CL·CP·EX·IS·NS 계열)
+_NO_LINE_START = frozenset(
+    ')]}>,.!?:;%'
+    '’”»…‥'
+    '、。〉》」』】〕〗〙〛〞〟'
+    '々〻ゝゞ・ーヽヾ'
+    'ぁぃぅぇぉっゃゅょゎ'
+    'ァィゥェォッャュョヮヵヶ'
+    '！），．：；？］｝｠｡｣､'
+)
+
+# 줄 맨 끝에 올 수 없는 문자 (여는 괄호/따옴표, OP·QU 계열)
+_NO_LINE_END = frozenset(
+    '([{<'
+    '‘“«'
+    '〈《「『【〔〖〘〚〝'
+    '（［｛｟｢'
+)
+
+_HYPHENS = frozenset('-‐–—')
+
+# 글자 단위로 줄을 나눌 수 있는 문자 범위 (한글, 한자, 가나, 전각 기호)
+_BREAK_ANYWHERE_RANGES = (
+    (0x1100, 0x11FF),   # 한글 자모
+    (0x2E80, 0x2FDF),   # CJK 부수
+    (0x3000, 0x303F),   # CJK 기호 및 구두점
+    (0x3040, 0x30FF),   # 히라가나, 가타카나
+    (0x3130, 0x318F),   # 한글 호환 자모
+    (0x3190, 0x33FF),   # CJK 기타 기호
+    (0x3400, 0x4DBF),   # CJK 확장 A
+    (0x4E00, 0x9FFF),   # CJK 통합 한자
+    (0xA960, 0xA97F),   # 한글 자모 확장 A
+    (0xAC00, 0xD7AF),   # 한글 음절
+    (0xD7B0, 0xD7FF),   # 한글 자모 확장 B
+    (0xF900, 0xFAFF),   # CJK 호환 한자
+    (0xFF00, 0xFFEF),   # 전각/반각 문자
+    (0x20000, 0x3FFFF), # CJK 확장 B 이후
+)
+
+_SPACES = frozenset(' 　')
+
+
+def _break_anywhere(ch: str) -> bool:
+    code = ord(ch)
+    for lo, hi in _BREAK_ANYWHERE_RANGES:
+        if lo <= code <= hi:
+            return True
+    return False
+
+
+def _can_break(before: str, after: str) -> bool:
+    """before와 after 사이에서 줄을 나눌 수 있는지"""
+    if after in _SPACES:
+        return False
+    if before in _SPACES:
+        return True
+    if after in _NO_LINE_START or before in _NO_LINE_END:
+        return False
+    if _break_anywhere(before) or _break_anywhere(after):
+        return True
+    if before in _HYPHENS and after.isalpha():
+        return True
+    return False
+
+
+def line_break_opportunities(text: str) -> List[int]:
+    """줄을 나눌 수 있는 위치(다음 줄이 시작되는 인덱스) 목록, 오름차순"""
+    return [i for i in range(1, len(text)) if _can_break(text[i - 1], text[i])]
+
+
+def wrap_unicode(text: str, font: ImageFont.FreeTypeFont, max_width: float) -> List[str]:
+    """유니코드 줄바꿈 규칙에 따른 줄바꿈
+
+    공백뿐 아니라 한글/한자/가나 글자 사이에서도 줄을 나누며, 닫는 구두점으로
+    줄이 시작되거나 여는 괄호로 줄이 끝나지 않게 한다. 글자별 전진 폭의 누적합(prefix sum)
+    위에서 이분 탐색으로 줄 끝을 찾으므로 O(n log n)이며, 선택된 지점에서만 실제 폭을
+    측정해 커닝 오차를 보정한다. 나눌 지점이 없을 만큼 긴 단어는 글자 단위로 강제 분할한다.
+    """
+    if text is None or text == '':
+        return ['']
+
+    n = len(text)
+    prefix = [0.0] * (n + 1)
+    for i, ch in enumerate(text):
+        prefix[i + 1] = prefix[i] + text_length(font, ch)
+    breaks = line_break_opportunities(text)
+
+    lines: List[str] = []
+    start = 0
+    while start < n:
+        # start부터 max_width 안에 들어가는 마지막 위치
+        end = bisect_right(prefix, prefix[start] + max_width) - 1
+        if end >= n:
+            lines.append(text[start:].rstrip(' 　'))
+            break
+
+        # 줄 끝의 공백은 폭을 넘어가도 허용 (hanging)
+        limit = end
+        while limit < n and text[limit] in _SPACES:
+            limit += 1
+        if limit >= n:
+            lines.append(text[start:].rstrip(' 　'))
+            break
+
+        k = bisect_right(breaks, limit) - 1
+        brk = None
+        while k >= 0 and breaks[k] > start:
+            candidate = breaks[k]
+            line = text[start:candidate].rstrip(' 　')
+            # 커닝 보정: 선택된 지점에서만 실제 폭 확인
+            if font.getlength(line) <= max_width or k == 0 or breaks[k - 1] <= start:
+                brk = candidate
+                break
+            k -= 1
+
+        if brk is None:
+            # 나눌 지점이 없으면 글자 단위로 강제 분할 (최소 한 글자)
+            brk = max(end, start + 1)
+
+        lines.append(text[start:brk].rstrip(' 　'))
+        start = brk
+        while start < n and text[start] in _SPACES:
+            start += 1
+
+    return lines if lines else ['']
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+렌더링 단계별 시간 측정
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator
+
+
+# 단계 이름 (출력 순서)
+STAGES = (
+    'cache', 'resolution', 'background', 'ensure_fonts', 'font_load',
+    'canvas', 'layout', 'outline', 'text', 'encode',
+)
+
+
+class Timings:
+    """단계별 소요 시간(초) 누적
+
+    같은 단계를 여러 번 측정하면 합산한다 (예: 텍스트마다 font_load).
+
+        timings = Timings()
+        ThumbnailRenderer.render_thumbnail(dsl, 'out.png', timings=timings)
+        print(timings.format())
+    """
+
+    __slots__ = ('stages',)
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    def as_dict(self) -> Dict[str, float]:
+        """{단계: 밀리초} (STAGES 순서, 측정된 단계만)"""
+        order = {name: i for i, name in enumerate(STAGES)}
+        names = sorted(self.stages, key=lambda name: order.get(name, len(order)))
+        return {name: round(self.stages[name] * 1000, 3) for name in names}
+
+    def format(self) -> str:
+        """단계별 시간과 비율 표"""
+        total = self.total() or 1.0
+        lines = []
+        for name, ms in self.as_dict().items():
+            lines.append(f"  {name:<13}{ms:>10.2f} ms {self.stages[name] / total:>6.1%}")
+        lines.append(f"  {'total':<13}{self.total() * 1000:>10.2f} ms")
+        return '\n'.join(lines)
+
+
+class _NullTimings:
+    """측정하지 않을 때 쓰는 빈 구현 (오버헤드 최소화)"""
+
+    __slots__ = ()
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+
+NULL_TIMINGS = _NullTimings()
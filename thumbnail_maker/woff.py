@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WOFF/WOFF2 → sfnt(TTF/OTF) 메모리 디코딩 - 변환 파일을 디스크에 쓰지 않는다
+"""
+
+import io
+import struct
+import zlib
+from typing import Optional, Tuple
+
+
+WOFF_SIGNATURE = b'wOFF'
+WOFF2_SIGNATURE = b'wOF2'
+SFNT_SIGNATURES = (b'\x00\x01\x00\x00', b'true', b'OTTO', b'ttcf')
+
+# 이 확장자의 폰트는 로드할 때 메모리에서 디코딩한다
+WEB_FONT_EXTS = ('.woff2', '.woff')
+# fonts 디렉토리에서 찾는 순서
+FONT_EXTS = ('.ttf', '.otf') + WEB_FONT_EXTS
+
+_WOFF_HEADER = struct.Struct('>4s4sLHHLHHLLLLL')
+_WOFF_ENTRY = struct.Struct('>4sLLLL')
+_SFNT_HEADER = struct.Struct('>4sHHHH')
+_SFNT_ENTRY = struct.Struct('>4sLLL')
+
+
+def font_format(data: bytes) -> Optional[str]:
+    """시그니처로 판별한 폰트 형식의 확장자 (.ttf/.otf/.woff/.woff2, 모르면 None)"""
+    signature = data[:4]
+    if signature == WOFF2_SIGNATURE:
+        return '.woff2'
+    if signature == WOFF_SIGNATURE:
+        return '.woff'
+    if signature == b'OTTO':
+        return '.otf'
+    if signature in SFNT_SIGNATURES:
+        return '.ttf'
+    return None
+
+
+def _sfnt(flavor: bytes, tables) -> bytes:
+    """(tag, checksum, data) 목록으로 sfnt 바이트 구성 (테이블 디렉토리는 tag 순)"""
+    tables = sorted(tables)
+    num_tables = len(tables)
+    entry_selector = max(num_tables.bit_length() - 1, 0)
+    search_range = (1 << entry_selector) * 16
+    out = bytearray(_SFNT_HEADER.pack(flavor, num_tables, search_range, entry_selector,
+                                      num_tables * 16 - search_range))
+    offset = len(out) + _SFNT_ENTRY.size * num_tables
+    for tag, checksum, data in tables:
+        out += _SFNT_ENTRY.pack(tag, checksum, offset, len(data))
+        offset += (len(data) + 3) & ~3
+    for _, _, data in tables:
+        out += data
+        out += b'\0' * (-len(data) % 4)
+    return bytes(out)
+
+
+def decode_woff(data: bytes) -> bytes:
+    """WOFF 1.0을 sfnt 바이트로 디코딩 (테이블별 zlib 해제만 하고 폰트 자체는 파싱하지 않음)"""
+    try:
+        (signature, flavor, length, num_tables, _, _, _, _,
+         _, _, _, _, _) = _WOFF_HEADER.unpack_from(data)
+        if signature != WOFF_SIGNATURE or length != len(data):
+            raise ValueError("WOFF 헤더가 올바르지 않습니다")
+        tables = []
+        for i in range(num_tables):
+            tag, offset, comp_length, orig_length, checksum = _WOFF_ENTRY.unpack_from(
+                data, _WOFF_HEADER.size + i * _WOFF_ENTRY.size)
+            chunk = data[offset:offset + comp_length]
+            if comp_length < orig_length:
+                chunk = zlib.decompress(chunk)
+            if len(chunk) != orig_length:
+                raise ValueError(f"WOFF 테이블 길이가 맞지 않습니다: {tag!r}")
+            tables.append((tag, checksum, chunk))
+    except (struct.error, zlib.error) as e:
+        raise ValueError(f"WOFF 디코딩 실패: {e}") from e
+    return _sfnt(flavor, tables)
+
+
+def decode_woff2(data: bytes) -> bytes:
+    """WOFF 2.0을 sfnt 바이트로 디코딩
+
+    pywoff2가 있으면 사용하고, 없으면 fontTools의 WOFF2Reader로 테이블만 복원해
+    SFNTWriter로 바로 쓴다 (TTFont로 전체 테이블을 파싱/재컴파일하지 않음, brotli 필요).
+    """
+    try:
+        import woff2  # from pywoff2
+    except ImportError:
+        woff2 = None
+    if woff2 is not None:
+        return woff2.decompress(data)
+
+    from fontTools.ttLib import TTLibError
+    from fontTools.ttLib.sfnt import SFNTWriter
+    from fontTools.ttLib.woff2 import WOFF2Reader
+
+    out = io.BytesIO()
+    try:
+        reader = WOFF2Reader(io.BytesIO(data))
+        writer = SFNTWriter(out, len(reader.tables), reader.sfntVersion)
+        for tag in reader.keys():
+            writer[tag] = reader[tag]
+        writer.close()
+    except ImportError as e:
+        raise RuntimeError("WOFF2 디코딩에는 pywoff2 또는 brotli 모듈이 필요합니다 (requirements.txt 참고)") from e
+    except (TTLibError, struct.error) as e:
+        raise ValueError(f"WOFF2 디코딩 실패: {e}") from e
+    return out.getvalue()
+
+
+def to_sfnt(data: bytes) -> Tuple[bytes, str]:
+    """폰트 바이트를 Pillow(FreeType)가 읽을 sfnt 바이트와 확장자(.ttf/.otf)로 변환"""
+    fmt = font_format(data)
+    if fmt == '.woff2':
+        data = decode_woff2(data)
+    elif fmt == '.woff':
+        data = decode_woff(data)
+    elif fmt is None:
+        raise ValueError("지원하지 않는 폰트 형식입니다")
+    return data, '.otf' if data[:4] == b'OTTO' else '.ttf'